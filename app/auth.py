@@ -1,9 +1,18 @@
 import os
+import re
+import hmac
+import json
+import base64
+import hashlib
+import time
+import asyncio
+import threading
 import bcrypt
 import jwt
-from datetime import datetime, timedelta, timezone
-from typing import Dict, Any, Tuple
-from fastapi import HTTPException, status, Depends
+from cachetools import TTLCache
+from concurrent.futures import ThreadPoolExecutor
+from typing import Annotated, Dict, Any, Optional, Tuple
+from fastapi import HTTPException, Request, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 import logging
 
@@ -12,6 +21,21 @@ logger = logging.getLogger(__name__)
 # Security configuration
 security = HTTPBearer()
 
+# Reusable JWS signer for access tokens
+_SIGNER = jwt.PyJWS()
+
+# Worker pool for bcrypt - the C core releases the GIL, so verifications
+# run in parallel across cores instead of blocking the event loop
+_BCRYPT_POOL = ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix="bcrypt")
+
+# Verified token payloads keyed by token string, so repeat requests with the
+# same bearer token skip the HMAC check and JSON decode
+_TOKEN_CACHE = TTLCache(maxsize=10_000, ttl=60)
+_TOKEN_CACHE_LOCK = threading.Lock()
+
+# Single-scan check for the common case: 8-128 chars with an ASCII letter and a digit
+_STRENGTH_RE = re.compile(r'(?=.*[A-Za-z])(?=.*\d).{8,128}\Z', re.DOTALL)
+
 class AuthConfig:
     """Authentication configuration from environment variables"""
     
@@ -25,11 +49,26 @@ class AuthConfig:
             )
         
         # JWT Configuration
+        # HS256 signing goes through the stdlib hmac/hashlib, which are
+        # OpenSSL-backed, so no extra crypto backend is needed for it
         self.jwt_algorithm = 'HS256'
         self.jwt_expire_hours = int(os.getenv('JWT_EXPIRE_HOURS', 24))  # 24 hours default
+        self.jwt_expire_seconds = self.jwt_expire_hours * 3600
+        
+        # HMAC key prepared once so signing/verifying skip per-call key setup
+        self.jwt_signing_key = jwt.algorithms.HMACAlgorithm(
+            jwt.algorithms.HMACAlgorithm.SHA256
+        ).prepare_key(self.jwt_secret)
         
         # Password hashing configuration
+        # bcrypt>=4 ships a native (Rust) Eksblowfish core, so hashing cost is
+        # governed by the work factor alone - tune it with BCRYPT_ROUNDS
         self.bcrypt_rounds = int(os.getenv('BCRYPT_ROUNDS', 12))  # 12 rounds for good security
+        
+        # Optional server-side pepper: passwords are HMAC-SHA256'd with it before
+        # bcrypt, so a leaked hash table alone cannot be brute-forced
+        pepper = os.getenv('BCRYPT_PEPPER')
+        self.bcrypt_pepper = pepper.encode('utf-8') if pepper else None
 
 # Global auth configuration
 auth_config = AuthConfig()
@@ -38,9 +77,33 @@ class AuthError(Exception):
     """Custom exception for authentication operations"""
     pass
 
+# Marks hashes whose input was peppered; unmarked hashes are plain bcrypt
+# from before BCRYPT_PEPPER was set and are rehashed on the next login
+_PEPPERED_HASH_PREFIX = '$hmac$'
+
 class PasswordManager:
     """Password hashing and verification utilities"""
     
+    @staticmethod
+    def _prehash(password_bytes: bytes, pepper: Optional[bytes]) -> bytes:
+        """
+        Apply the configured pepper to a password before bcrypt.
+        
+        The HMAC digest is base64-encoded (44 bytes), which stays under
+        bcrypt's 72-byte input limit and contains no NUL bytes.
+        
+        Args:
+            password_bytes (bytes): UTF-8 encoded password
+            pepper (bytes, optional): Pepper key; None returns the input unchanged
+            
+        Returns:
+            bytes: Bytes to feed into bcrypt
+        """
+        if not pepper:
+            return password_bytes
+        digest = hmac.new(pepper, password_bytes, hashlib.sha256).digest()
+        return base64.b64encode(digest)
+    
     @staticmethod
     def hash_password(plain_password: str) -> str:
         """
@@ -57,15 +120,16 @@ class PasswordManager:
         """
         try:
             # Convert string to bytes and hash
-            password_bytes = plain_password.encode('utf-8')
+            pepper = auth_config.bcrypt_pepper
+            password_bytes = PasswordManager._prehash(plain_password.encode('utf-8'), pepper)
             salt = bcrypt.gensalt(rounds=auth_config.bcrypt_rounds)
-            hashed = bcrypt.hashpw(password_bytes, salt)
+            hashed = bcrypt.hashpw(password_bytes, salt).decode('utf-8')
             
             # Return as string for database storage
-            return hashed.decode('utf-8')
+            return _PEPPERED_HASH_PREFIX + hashed if pepper else hashed
             
         except Exception as e:
-            logger.error(f"Password hashing failed: {e}")
+            logger.error("Password hashing failed: %s", e)
             raise AuthError("Failed to hash password") from e
     
     @staticmethod
@@ -82,13 +146,76 @@ class PasswordManager:
         """
         try:
             password_bytes = plain_password.encode('utf-8')
-            hashed_bytes = hashed_password.encode('utf-8')
             
-            return bcrypt.checkpw(password_bytes, hashed_bytes)
+            # One bcrypt check either way: the prefix says which input was hashed
+            if hashed_password.startswith(_PEPPERED_HASH_PREFIX):
+                pepper = auth_config.bcrypt_pepper
+                if not pepper:
+                    logger.error("Peppered password hash found but BCRYPT_PEPPER is not set")
+                    return False
+                hashed_bytes = hashed_password[len(_PEPPERED_HASH_PREFIX):].encode('utf-8')
+                return bcrypt.checkpw(PasswordManager._prehash(password_bytes, pepper), hashed_bytes)
+            
+            # Hashes stored before BCRYPT_PEPPER was set are plain bcrypt
+            return bcrypt.checkpw(password_bytes, hashed_password.encode('utf-8'))
             
         except Exception as e:
-            logger.error(f"Password verification failed: {e}")
+            logger.error("Password verification failed: %s", e)
             return False
+    
+    @staticmethod
+    def needs_rehash(hashed_password: str) -> bool:
+        """
+        Check whether a stored hash predates the configured pepper.
+        
+        Args:
+            hashed_password (str): Stored hashed password
+            
+        Returns:
+            bool: True if a pepper is set but the hash is plain bcrypt
+        """
+        return bool(auth_config.bcrypt_pepper) and not hashed_password.startswith(_PEPPERED_HASH_PREFIX)
+    
+    @staticmethod
+    async def hash_password_async(plain_password: str) -> str:
+        """
+        Hash a password on the bcrypt worker pool without blocking the event loop.
+        
+        Args:
+            plain_password (str): Plain text password
+            
+        Returns:
+            str: Hashed password as string
+            
+        Raises:
+            AuthError: If password hashing fails
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _BCRYPT_POOL,
+            PasswordManager.hash_password,
+            plain_password
+        )
+    
+    @staticmethod
+    async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+        """
+        Verify a password on the bcrypt worker pool without blocking the event loop.
+        
+        Args:
+            plain_password (str): Plain text password to verify
+            hashed_password (str): Stored hashed password
+            
+        Returns:
+            bool: True if password matches, False otherwise
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _BCRYPT_POOL,
+            PasswordManager.verify_password,
+            plain_password,
+            hashed_password
+        )
 
 class TokenManager:
     """JWT token creation and verification utilities"""
@@ -109,32 +236,32 @@ class TokenManager:
             AuthError: If token creation fails
         """
         try:
-            # Calculate expiration time using timezone-aware datetime
-            now = datetime.now(timezone.utc)
-            expire = now + timedelta(hours=auth_config.jwt_expire_hours)
+            # Issue/expiry times as integer POSIX timestamps (what PyJWT encodes anyway)
+            now = int(time.time())
             
             # Create token payload
             payload = {
                 'user_id': user_data['user_id'],
                 'username': user_data['username'],
                 'email': user_data['email'],
-                'exp': expire,
+                'exp': now + auth_config.jwt_expire_seconds,
                 'iat': now,
                 'type': 'access_token'
             }
             
-            # Create and return token
-            token = jwt.encode(
-                payload, 
-                auth_config.jwt_secret, 
+            # Create and return token (claims are already JSON-native, so sign
+            # the compact JSON directly instead of going through jwt.encode)
+            token = _SIGNER.encode(
+                json.dumps(payload, separators=(',', ':')).encode('utf-8'),
+                auth_config.jwt_signing_key,
                 algorithm=auth_config.jwt_algorithm
             )
             
-            logger.info(f"Access token created for user {user_data['username']}")
+            logger.info("Access token created for user %s", user_data['username'])
             return token
             
         except Exception as e:
-            logger.error(f"Token creation failed: {e}")
+            logger.error("Token creation failed: %s", e)
             raise AuthError("Failed to create access token") from e
     
     @staticmethod
@@ -151,29 +278,45 @@ class TokenManager:
         Raises:
             AuthError: If token is invalid or expired
         """
+        # Serve previously verified tokens from cache until they expire
+        with _TOKEN_CACHE_LOCK:
+            payload = _TOKEN_CACHE.get(token)
+        if payload is not None:
+            if payload['exp'] > time.time():
+                return payload
+            with _TOKEN_CACHE_LOCK:
+                _TOKEN_CACHE.pop(token, None)
+        
         try:
-            # Decode and verify token
+            # Decode and verify token; exp is required because cached
+            # payloads are expired by it
             payload = jwt.decode(
                 token, 
-                auth_config.jwt_secret, 
-                algorithms=[auth_config.jwt_algorithm]
+                auth_config.jwt_signing_key, 
+                algorithms=[auth_config.jwt_algorithm],
+                options={"require": ["exp"]}
             )
             
             # Validate token type
             if payload.get('type') != 'access_token':
                 raise AuthError("Invalid token type")
             
-            logger.debug(f"Token verified for user {payload.get('username')}")
+            with _TOKEN_CACHE_LOCK:
+                _TOKEN_CACHE[token] = payload
+            
+            logger.debug("Token verified for user %s", payload.get('username'))
             return payload
             
         except jwt.ExpiredSignatureError:
+            with _TOKEN_CACHE_LOCK:
+                _TOKEN_CACHE.pop(token, None)
             logger.warning("Token has expired")
             raise AuthError("Token has expired")
         except jwt.InvalidTokenError as e:
-            logger.warning(f"Invalid token: {e}")
+            logger.warning("Invalid token: %s", e)
             raise AuthError("Invalid token")
         except Exception as e:
-            logger.error(f"Token verification failed: {e}")
+            logger.error("Token verification failed: %s", e)
             raise AuthError("Token verification failed") from e
     
     @staticmethod
@@ -198,9 +341,12 @@ class TokenManager:
             'email': payload.get('email')
         }
 
-def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> Dict[str, Any]:
+def get_current_user(request: Request, credentials: HTTPAuthorizationCredentials = Depends(security)) -> Dict[str, Any]:
     """
     FastAPI dependency to get current authenticated user from JWT token.
+    
+    The verified user is stored on request.state.user, so any further lookups
+    within the same request reuse it instead of re-verifying the token.
 
     Usage:
         @app.get("/protected")
@@ -208,6 +354,7 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
             return {"message": f"Hello {current_user['username']}"}
 
     Args:
+        request: Incoming request (used to memoize the verified user)
         credentials: HTTP Authorization header with Bearer token
 
     Returns:
@@ -216,6 +363,10 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
     Raises:
         HTTPException: 401 if authentication fails
     """
+    cached_user = getattr(request.state, 'user', None)
+    if cached_user is not None:
+        return cached_user
+    
     try:
         # Extract token from Authorization header
         token = credentials.credentials
@@ -226,23 +377,28 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
         if not user_info or not user_info.get('user_id'):
             raise AuthError("Invalid user information in token")
         
+        request.state.user = user_info
         return user_info
 
     except AuthError as e:
-        logger.warning(f"Authentication failed: {e}")
+        logger.warning("Authentication failed: %s", e)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
     except Exception as e:
-        logger.error(f"Authentication error: {e}")
+        logger.error("Authentication error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Authentication failed",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+# Handler parameter type for the authenticated user, e.g.
+#     def handler(current_user: CurrentUser): ...
+CurrentUser = Annotated[Dict[str, Any], Depends(get_current_user)]
+
 def create_login_response(user_data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Create a standardized login response with access token.
@@ -266,7 +422,7 @@ def create_login_response(user_data: Dict[str, Any]) -> Dict[str, Any]:
         return {
             'access_token': access_token,
             'token_type': 'bearer',
-            'expires_in': auth_config.jwt_expire_hours * 3600,  # Convert to seconds
+            'expires_in': auth_config.jwt_expire_seconds,
             'user': {
                 'user_id': user_data['user_id'],
                 'username': user_data['username'],
@@ -275,7 +431,7 @@ def create_login_response(user_data: Dict[str, Any]) -> Dict[str, Any]:
         }
 
     except Exception as e:
-        logger.error(f"Login response creation failed: {e}")
+        logger.error("Login response creation failed: %s", e)
         raise AuthError("Failed to create login response") from e
 
 def validate_password_strength(password: str) -> Tuple[bool, str]:
@@ -288,6 +444,11 @@ def validate_password_strength(password: str) -> Tuple[bool, str]:
     Returns:
         Tuple: (is_valid: bool, error_message: str)
     """
+    # Fast path - most passwords pass in one regex scan
+    if _STRENGTH_RE.match(password):
+        return True, ""
+    
+    # Slow path only runs for failures (or non-ASCII letters) to explain why
     if len(password) < 8:
         return False, "Password must be at least 8 characters long"
     
@@ -358,11 +519,11 @@ def initialize_auth_on_startup():
             raise RuntimeError("JWT token verification failed")
 
         logger.info("Authentication system initialized successfully")
-        logger.info(f"JWT expiration: {auth_config.jwt_expire_hours} hours")
-        logger.info(f"Bcrypt rounds: {auth_config.bcrypt_rounds}")
+        logger.info("JWT expiration: %s hours", auth_config.jwt_expire_hours)
+        logger.info("Bcrypt rounds: %s", auth_config.bcrypt_rounds)
 
     except Exception as e:
-        logger.error(f"Authentication initialization failed: {e}")
+        logger.error("Authentication initialization failed: %s", e)
         raise RuntimeError(f"Authentication setup failed: {e}")
 
 # Export commonly used functions and classes
@@ -370,6 +531,7 @@ __all__ = [
     'PasswordManager',
     'TokenManager',
     'get_current_user',
+    'CurrentUser',
     'create_login_response',
     'validate_password_strength',
     'get_token_info',
@@ -1,7 +1,13 @@
+import functools
 import os
+import threading
 import pymysql
-from pymysql.cursors import DictCursor
-from typing import Optional
+from pymysql.constants import FIELD_TYPE
+from pymysql.converters import conversions, convert_time
+from pymysql.cursors import DictCursor, SSDictCursor
+from cachetools import TTLCache
+from dbutils.pooled_db import PooledDB
+from typing import List, Optional
 import logging
 from contextlib import contextmanager
 
@@ -11,6 +17,19 @@ logger = logging.getLogger(__name__)
 
 class DatabaseError(Exception):
     """Custom exception for database operations"""
+    
+    def __init__(self, message: str = "", code: Optional[int] = None):
+        super().__init__(message)
+        # MYSQL_ERRNO raised by the stored procedure, when there is one
+        self.code = code
+
+class DatabaseBusyError(DatabaseError):
+    """
+    Raised when no pooled connection becomes free within the acquire timeout.
+    
+    Callers must let it propagate (catch it ahead of DatabaseError); main.py
+    turns it into a 503 with Retry-After.
+    """
     pass
 
 class DatabaseConfig:
@@ -24,6 +43,13 @@ class DatabaseConfig:
         self.password = os.getenv('DB_PASSWORD')
         self.database = os.getenv('DB_NAME', 'nba_db')
         
+        # Connection pool sizing
+        self.pool_min_cached = int(os.getenv('DB_POOL_MIN_CACHED', 2))
+        self.pool_max_cached = int(os.getenv('DB_POOL_MAX_CACHED', 10))
+        self.pool_max_connections = int(os.getenv('DB_POOL_MAX_CONNECTIONS', 20))
+        self.pool_acquire_timeout = float(os.getenv('DB_POOL_ACQUIRE_TIMEOUT', 5))  # seconds
+        self.pool_warm = int(os.getenv('DB_POOL_WARM', 5))  # connections opened at startup
+        
         # Validate required environment variables
         if not self.user or not self.password:
             raise ValueError(
@@ -40,46 +66,95 @@ class DatabaseConfig:
             'database': self.database,
             'charset': 'utf8mb4',
             'cursorclass': DictCursor,
+            'conv': _CONVERSIONS,
             'autocommit': False,
             'connect_timeout': 10,  # 10 seconds connection timeout
             'read_timeout': 30,     # 30 seconds read timeout
             'write_timeout': 30     # 30 seconds write timeout
         }
 
+# Decode TIME columns as datetime.time instead of PyMySQL's default
+# timedelta. Our TIME values are always TIME(start_time) (< 24h), and the
+# response models expect a time of day, so no per-row conversion is needed.
+_CONVERSIONS = {**conversions, FIELD_TYPE.TIME: convert_time}
+
 # Global database configuration
 db_config = DatabaseConfig()
 
+# Shared connection pool, created on first use so an unreachable database is
+# reported by initialize_database_on_startup rather than at import time
+_POOL: Optional[PooledDB] = None
+_POOL_LOCK = threading.Lock()
+
+# One slot per pooled connection, so callers wait a bounded time for a free
+# connection instead of blocking indefinitely inside the pool
+_POOL_SLOTS = threading.BoundedSemaphore(db_config.pool_max_connections)
+
+# Cached result of check_required_tables (None until the first successful check)
+_TABLES_OK: Optional[bool] = None
+
+# Health probes and /info can be polled far more often than their answers
+# change, so results are reused for a few seconds. The lock is held across
+# the refresh so concurrent probes wait for one query instead of each
+# running their own.
+_DB_PING_CACHE = TTLCache(maxsize=1, ttl=5)
+_DB_STATS_CACHE = TTLCache(maxsize=1, ttl=10)
+_HEALTH_CACHE_LOCK = threading.Lock()
+
+def _get_pool() -> PooledDB:
+    """Return the process-wide connection pool, creating it if needed"""
+    global _POOL
+    if _POOL is None:
+        with _POOL_LOCK:
+            if _POOL is None:
+                _POOL = PooledDB(
+                    creator=pymysql,
+                    mincached=db_config.pool_min_cached,
+                    maxcached=db_config.pool_max_cached,
+                    maxconnections=db_config.pool_max_connections,
+                    blocking=True,
+                    ping=1,  # check the connection whenever it is taken from the pool
+                    **db_config.get_connection_params()
+                )
+    return _POOL
+
 def get_database_connection():
     """
-    Create a new database connection.
+    Get a database connection from the shared pool.
     
-    Railway best practice: Create new connection per request
-    rather than using connection pooling in serverless environments.
+    Connections are reused across requests to avoid a TCP + MySQL handshake
+    per call. Calling close() on the returned connection hands it back to
+    the pool instead of closing the socket.
     
     Returns:
-        pymysql.Connection: Database connection with DictCursor
+        pymysql.Connection: Pooled database connection with DictCursor
         
     Raises:
         ConnectionError: If unable to connect to database
     """
     try:
-        connection = pymysql.connect(**db_config.get_connection_params())
-        logger.info("Database connection established successfully")
+        connection = _get_pool().connection()
+        logger.debug("Database connection acquired from pool")
         return connection
         
     except pymysql.Error as e:
-        logger.error(f"Database connection failed: {e}")
+        logger.error("Database connection failed: %s", e)
         raise ConnectionError(f"Could not connect to database: {e}")
     except Exception as e:
-        logger.error(f"Unexpected error during database connection: {e}")
+        logger.error("Unexpected error during database connection: %s", e)
         raise ConnectionError(f"Database connection error: {e}")
 
 @contextmanager
-def get_db_cursor():
+def get_db_cursor(cursor_class=None):
     """
     Context manager for database operations.
     Automatically handles connection creation and cleanup.
     
+    Args:
+        cursor_class (optional): Cursor type to use instead of the connection
+                                 default (DictCursor), e.g. SSDictCursor to
+                                 stream large result sets
+    
     Usage:
         with get_db_cursor() as cursor:
             cursor.execute("SELECT * FROM User")
@@ -89,14 +164,19 @@ def get_db_cursor():
         pymysql.cursors.DictCursor: Database cursor
         
     Raises:
+        DatabaseBusyError: If no connection frees up within DB_POOL_ACQUIRE_TIMEOUT
         ConnectionError: If unable to establish database connection
     """
     connection = None
     cursor = None
     
+    if not _POOL_SLOTS.acquire(timeout=db_config.pool_acquire_timeout):
+        logger.warning("No database connection available after %ss", db_config.pool_acquire_timeout)
+        raise DatabaseBusyError("Database is busy, please retry")
+    
     try:
         connection = get_database_connection()
-        cursor = connection.cursor()
+        cursor = connection.cursor(cursor_class) if cursor_class else connection.cursor()
         
         yield cursor
         
@@ -106,7 +186,7 @@ def get_db_cursor():
     except Exception as e:
         if connection:
             connection.rollback()
-            logger.error(f"Database operation failed, rolled back transaction: {e}")
+            logger.error("Database operation failed, rolled back transaction: %s", e)
         raise
         
     finally:
@@ -114,7 +194,8 @@ def get_db_cursor():
             cursor.close()
         if connection:
             connection.close()
-            logger.debug("Database connection closed")
+            logger.debug("Database connection returned to pool")
+        _POOL_SLOTS.release()
 
 def execute_stored_procedure(procedure_name: str, params: list = None) -> tuple:
     """
@@ -135,7 +216,7 @@ def execute_stored_procedure(procedure_name: str, params: list = None) -> tuple:
                 cursor.callproc(procedure_name)
                 
             result = cursor.fetchall()
-            logger.info(f"Stored procedure '{procedure_name}' executed successfully")
+            logger.info("Stored procedure '%s' executed successfully", procedure_name)
             
             return True, result, None
             
@@ -144,19 +225,26 @@ def execute_stored_procedure(procedure_name: str, params: list = None) -> tuple:
         logger.error(error_msg)
         return False, None, error_msg
 
-def call_procedure(procedure_name: str, params: list = None):
+def call_procedure(procedure_name: str, params: list = None, *, multi_result: bool = False):
     """
     Simplified stored procedure call with automatic error handling.
     
+    Rows are read with the default buffered DictCursor; use iter_procedure
+    to stream a large result set instead.
+    
     Args:
         procedure_name (str): Name of the stored procedure
         params (list, optional): List of parameters for the procedure
+        multi_result (bool): Set for procedures that emit several result sets;
+                             the last non-empty one is returned. Leave False
+                             for single-SELECT procedures to skip nextset()
         
     Returns:
         List[dict]: Results from the stored procedure
         
     Raises:
         DatabaseError: If procedure execution fails
+        DatabaseBusyError: If no pooled connection frees up in time
         
     Usage:
         # Simple call
@@ -170,7 +258,7 @@ def call_procedure(procedure_name: str, params: list = None):
     """
     try:
         with get_db_cursor() as cursor:
-            logger.debug(f"Calling procedure '{procedure_name}' with params: {params}")
+            logger.debug("Calling procedure '%s' with params: %s", procedure_name, params)
             
             if params:
                 cursor.callproc(procedure_name, params)
@@ -179,36 +267,245 @@ def call_procedure(procedure_name: str, params: list = None):
                 
             result = cursor.fetchall()
             # Advance to the last result set if there are multiple
-            while cursor.nextset():
-                temp = cursor.fetchall()
-                if temp:
-                    result = temp
-            logger.info(f"Procedure '{procedure_name}' executed successfully, returned {len(result)} rows")
+            # (any leftover status packets are drained when the cursor closes)
+            if multi_result:
+                while cursor.nextset():
+                    temp = cursor.fetchall()
+                    if temp:
+                        result = temp
+            logger.info("Procedure '%s' executed successfully, returned %d rows", procedure_name, len(result))
             return result
             
+    except DatabaseBusyError:
+        raise
+    
     except pymysql.Error as e:
-        # Handle SIGNAL SQLSTATE '45000' errors from stored procedures
-        if len(e.args) >= 2:
-            error_code = e.args[0]
-            error_message = e.args[1]
+        raise _procedure_error(procedure_name, e) from e
             
-            # Custom error codes from our stored procedures
-            if 1000 <= error_code <= 5999:
-                logger.error(f"Business logic error in '{procedure_name}': [{error_code}] {error_message}")
-                raise DatabaseError(f"[{error_code}] {error_message}")
+    except Exception as e:
+        error_msg = f"Procedure '{procedure_name}' failed with params {params}: {e}"
+        logger.error(error_msg)
+        raise DatabaseError(error_msg) from e
+
+def call_procedure_one(procedure_name: str, params: list = None, *, multi_result: bool = False) -> Optional[dict]:
+    """
+    Call a stored procedure that returns a single row.
+    
+    Same error handling as call_procedure, but returns the first row (or None)
+    instead of a list, for procedures that create, fetch or report on one thing.
+    
+    Args:
+        procedure_name (str): Name of the stored procedure
+        params (list, optional): List of parameters for the procedure
+        multi_result (bool): Set for procedures that emit several result sets;
+                             the first row of the last non-empty one is returned
+        
+    Returns:
+        Optional[dict]: The row, or None if the procedure returned no rows
+        
+    Raises:
+        DatabaseError: If procedure execution fails
+        DatabaseBusyError: If no pooled connection frees up in time
+        
+    Usage:
+        group = call_procedure_one('get_group_by_id', [group_id])
+    """
+    try:
+        with get_db_cursor() as cursor:
+            logger.debug("Calling procedure '%s' with params: %s", procedure_name, params)
+            
+            if params:
+                cursor.callproc(procedure_name, params)
             else:
-                logger.error(f"Database error in '{procedure_name}': [{error_code}] {error_message}")
-                raise DatabaseError(f"Database error [{error_code}]: {error_message}")
-        else:
-            error_msg = f"Procedure '{procedure_name}' failed: {e}"
-            logger.error(error_msg)
-            raise DatabaseError(error_msg) from e
+                cursor.callproc(procedure_name)
+            
+            row = cursor.fetchone()
+            if multi_result:
+                while cursor.nextset():
+                    temp = cursor.fetchone()
+                    if temp:
+                        row = temp
+            logger.info("Procedure '%s' executed successfully, returned %d rows", procedure_name, row is not None)
+            return row
+            
+    except DatabaseBusyError:
+        raise
+    
+    except pymysql.Error as e:
+        raise _procedure_error(procedure_name, e) from e
+            
+    except Exception as e:
+        error_msg = f"Procedure '{procedure_name}' failed with params {params}: {e}"
+        logger.error(error_msg)
+        raise DatabaseError(error_msg) from e
+
+def call_procedure_sets(procedure_name: str, params: list = None) -> List[List[dict]]:
+    """
+    Call a stored procedure that returns several result sets, and return them all.
+    
+    Lets one round trip serve a screen that needs data from more than one
+    SELECT. Result sets keep their position even when empty.
+    
+    Args:
+        procedure_name (str): Name of the stored procedure
+        params (list, optional): List of parameters for the procedure
+        
+    Returns:
+        List[List[dict]]: One list of rows per SELECT, in procedure order
+        
+    Raises:
+        DatabaseError: If procedure execution fails
+        DatabaseBusyError: If no pooled connection frees up in time
+        
+    Usage:
+        rank_rows, prediction_rows = call_procedure_sets('get_user_group_snapshot', [user_id, group_id])
+    """
+    try:
+        with get_db_cursor() as cursor:
+            logger.debug("Calling procedure '%s' with params: %s", procedure_name, params)
+            
+            if params:
+                cursor.callproc(procedure_name, params)
+            else:
+                cursor.callproc(procedure_name)
+            
+            result_sets = []
+            while True:
+                # The trailing CALL status packet has no columns; skip it
+                if cursor.description is not None:
+                    result_sets.append(list(cursor.fetchall()))
+                if not cursor.nextset():
+                    break
+            logger.info("Procedure '%s' executed successfully, returned %d result sets", procedure_name, len(result_sets))
+            return result_sets
+            
+    except DatabaseBusyError:
+        raise
+    
+    except pymysql.Error as e:
+        raise _procedure_error(procedure_name, e) from e
             
     except Exception as e:
         error_msg = f"Procedure '{procedure_name}' failed with params {params}: {e}"
         logger.error(error_msg)
         raise DatabaseError(error_msg) from e
 
+def iter_procedure(procedure_name: str, params: list = None, batch_size: int = 200):
+    """
+    Stream the rows of a single-SELECT stored procedure without buffering them.
+    
+    This is the only unbuffered read path: it uses an SSDictCursor and
+    fetches in batches, so memory stays flat regardless of result size.
+    Every other helper reads with the buffered DictCursor. The pooled
+    connection is held until the generator is exhausted or closed.
+    
+    Args:
+        procedure_name (str): Name of the stored procedure
+        params (list, optional): List of parameters for the procedure
+        batch_size (int): Rows fetched from the server per round trip
+        
+    Yields:
+        dict: One result row at a time
+        
+    Raises:
+        DatabaseError: If procedure execution fails
+        DatabaseBusyError: If no pooled connection frees up in time
+        
+    Usage:
+        for row in iter_procedure('get_group_leaderboard', [group_id]):
+            ...
+    """
+    try:
+        with get_db_cursor(SSDictCursor) as cursor:
+            logger.debug("Streaming procedure '%s' with params: %s", procedure_name, params)
+            
+            if params:
+                cursor.callproc(procedure_name, params)
+            else:
+                cursor.callproc(procedure_name)
+            
+            row_count = 0
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                row_count += len(rows)
+                yield from rows
+            logger.info("Procedure '%s' streamed %d rows", procedure_name, row_count)
+            
+    except DatabaseBusyError:
+        raise
+    
+    except pymysql.Error as e:
+        raise _procedure_error(procedure_name, e) from e
+    
+    except Exception as e:
+        error_msg = f"Procedure '{procedure_name}' failed with params {params}: {e}"
+        logger.error(error_msg)
+        raise DatabaseError(error_msg) from e
+
+def db_operation(description: str):
+    """
+    Decorator giving a service method the standard database error handling.
+    
+    DatabaseError is logged and re-raised unchanged (keeping its code); any
+    other exception is logged and wrapped in a DatabaseError, so callers
+    only ever have to handle DatabaseError.
+    
+    Args:
+        description (str): What the method does, used in messages, e.g. "create group"
+        
+    Usage:
+        @staticmethod
+        @db_operation("create group")
+        def create_group(group_name: str, creator_id: int) -> Dict[str, Any]:
+            ...
+    """
+    def decorator(func):
+        # Log under the service module's logger, as the inline handlers did
+        log = logging.getLogger(func.__module__)
+        
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            except DatabaseError as e:
+                log.error("Failed to %s: %s", description, e)
+                raise
+            except Exception as e:
+                log.error("Unexpected error trying to %s: %s", description, e)
+                raise DatabaseError(f"Failed to {description}: {e}") from e
+        return wrapper
+    return decorator
+
+def _procedure_error(procedure_name: str, e: pymysql.Error) -> DatabaseError:
+    """
+    Translate a PyMySQL error from a procedure call into a DatabaseError.
+    
+    Args:
+        procedure_name (str): Name of the stored procedure
+        e (pymysql.Error): Error raised by the driver
+        
+    Returns:
+        DatabaseError: Error carrying the MySQL error code when there is one
+    """
+    # Handle SIGNAL SQLSTATE '45000' errors from stored procedures
+    if len(e.args) >= 2:
+        error_code = e.args[0]
+        error_message = e.args[1]
+        
+        # Custom error codes from our stored procedures
+        if 1000 <= error_code <= 5999:
+            logger.error("Business logic error in '%s': [%s] %s", procedure_name, error_code, error_message)
+            return DatabaseError(f"[{error_code}] {error_message}", code=error_code)
+        else:
+            logger.error("Database error in '%s': [%s] %s", procedure_name, error_code, error_message)
+            return DatabaseError(f"Database error [{error_code}]: {error_message}", code=error_code)
+    else:
+        error_msg = f"Procedure '{procedure_name}' failed: {e}"
+        logger.error(error_msg)
+        return DatabaseError(error_msg)
+
 def test_database_connection() -> dict:
     """
     Test database connection and return status information.
@@ -218,18 +515,18 @@ def test_database_connection() -> dict:
         dict: Connection status and database information
     """
     try:
-        # Use stored procedure instead of raw SQL
-        result = call_procedure('test_database_connection')
+        # One procedure call returns connectivity, health and table result sets
+        with get_db_cursor() as cursor:
+            cursor.callproc('get_database_health_bundle')
+            result = cursor.fetchall()
+            cursor.nextset()
+            health_data = cursor.fetchall()
+            cursor.nextset()
+            tables_result = cursor.fetchall()
         
         if result:
             connection_data = result[0]
-            
-            # Get table count using stored procedure
-            health_data = call_procedure('get_database_health')
             health_info = health_data[0] if health_data else {}
-            
-            # Get existing tables using stored procedure
-            tables_result = call_procedure('check_required_tables')
             table_names = [table['TABLE_NAME'] for table in tables_result]
             
             return {
@@ -242,7 +539,7 @@ def test_database_connection() -> dict:
             }
             
     except Exception as e:
-        logger.error(f"Database connection test failed: {e}")
+        logger.error("Database connection test failed: %s", e)
         return {
             'status': 'failed',
             'error': str(e),
@@ -250,14 +547,48 @@ def test_database_connection() -> dict:
             'database': db_config.database
         }
 
-def check_required_tables() -> bool:
+def ping_database() -> bool:
+    """
+    Cheap connectivity probe for readiness checks (cached for 5 seconds).
+    
+    Returns:
+        bool: True if a pooled connection can run SELECT 1
+    """
+    with _HEALTH_CACHE_LOCK:
+        cached = _DB_PING_CACHE.get('ping')
+        if cached is not None:
+            return cached
+        
+        try:
+            with get_db_cursor() as cursor:
+                cursor.execute("SELECT 1")
+                cursor.fetchone()
+            ok = True
+        except Exception as e:
+            logger.error("Database ping failed: %s", e)
+            ok = False
+        
+        _DB_PING_CACHE['ping'] = ok
+        return ok
+
+def check_required_tables(force: bool = False) -> bool:
     """
     Check if all required tables exist in the database.
     Useful for validating database setup.
     
+    The schema does not change while the app is running, so a successful
+    check is cached and later calls skip the INFORMATION_SCHEMA query.
+    
+    Args:
+        force (bool): Bypass the cached result and query the database again
+    
     Returns:
         bool: True if all required tables exist
     """
+    global _TABLES_OK
+    if _TABLES_OK is not None and not force:
+        return _TABLES_OK
+    
     required_tables = ['User', 'Group', 'UserGroups', 'Fixture', 'Prediction', 'Leaderboard']
     
     try:
@@ -268,41 +599,85 @@ def check_required_tables() -> bool:
         missing_tables = set(required_tables) - existing_tables
         
         if missing_tables:
-            logger.warning(f"Missing required tables: {missing_tables}")
+            logger.warning("Missing required tables: %s", missing_tables)
             return False
             
         logger.info("All required tables found in database")
+        _TABLES_OK = True
         return True
         
     except Exception as e:
-        logger.error(f"Failed to check required tables: {e}")
+        logger.error("Failed to check required tables: %s", e)
         return False
 
 def get_database_stats() -> Optional[dict]:
     """
-    Get basic database statistics for monitoring.
+    Get basic database statistics for monitoring (cached for 10 seconds).
     
     Returns:
         dict: Database statistics or None if failed
     """
-    try:
-        # Use stored procedure instead of raw SQL
-        result = call_procedure('get_database_stats')
+    with _HEALTH_CACHE_LOCK:
+        cached = _DB_STATS_CACHE.get('stats')
+        if cached is not None:
+            return dict(cached)
         
-        if result:
-            stats = result[0]
-            return {
-                'users': stats.get('users', 0),
-                'groups': stats.get('groups', 0),
-                'fixtures': stats.get('fixtures', 0),
-                'predictions': stats.get('predictions', 0)
-            }
+        try:
+            # Use stored procedure instead of raw SQL
+            result = call_procedure('get_database_stats')
             
-        return None
+            if result:
+                stats = result[0]
+                db_stats = {
+                    'users': stats.get('users', 0),
+                    'groups': stats.get('groups', 0),
+                    'fixtures': stats.get('fixtures', 0),
+                    'predictions': stats.get('predictions', 0)
+                }
+                _DB_STATS_CACHE['stats'] = db_stats
+                return dict(db_stats)
+                
+            return None
+            
+        except Exception as e:
+            logger.error("Failed to get database stats: %s", e)
+            return None
+
+def warm_connection_pool(size: Optional[int] = None) -> int:
+    """
+    Open pooled connections up front so the first requests after boot don't
+    pay the TCP + MySQL handshake.
+    
+    All connections are checked out at once (so each one is new) and then
+    handed back, where the pool keeps up to DB_POOL_MAX_CACHED of them idle.
+    
+    Args:
+        size (int, optional): Connections to open; defaults to DB_POOL_WARM
         
-    except Exception as e:
-        logger.error(f"Failed to get database stats: {e}")
-        return None
+    Returns:
+        int: Number of connections that answered SELECT 1
+    """
+    if size is None:
+        size = db_config.pool_warm
+    size = max(0, min(size, db_config.pool_max_cached))
+    
+    connections = []
+    try:
+        for _ in range(size):
+            connection = get_database_connection()
+            connections.append(connection)
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+                cursor.fetchone()
+    except ConnectionError as e:
+        logger.warning("Connection pool warm-up stopped early: %s", e)
+    finally:
+        warmed = len(connections)
+        for connection in connections:
+            connection.close()
+    
+    logger.info("Warmed %s pooled database connections", warmed)
+    return warmed
 
 # Railway deployment helper
 def initialize_database_on_startup():
@@ -321,22 +696,31 @@ def initialize_database_on_startup():
     if connection_status['status'] != 'connected':
         raise RuntimeError(f"Database connection failed: {connection_status.get('error', 'Unknown error')}")
     
-    # Check required tables
-    if not check_required_tables():
+    # Check required tables (primes the cached result for later checks)
+    if not check_required_tables(force=True):
         raise RuntimeError("Database setup incomplete - missing required tables")
     
-    logger.info(f"Database initialized successfully - Found {connection_status['tables_count']} tables")
-    logger.info(f"Connected to MySQL {connection_status['mysql_version']} at {connection_status['host']}")
+    warm_connection_pool()
+    
+    logger.info("Database initialized successfully - Found %s tables", connection_status['tables_count'])
+    logger.info("Connected to MySQL %s at %s", connection_status['mysql_version'], connection_status['host'])
 
 # Export the commonly used functions
 __all__ = [
     'get_database_connection',
     'get_db_cursor', 
     'test_database_connection',
+    'ping_database',
     'execute_stored_procedure',
     'call_procedure',
+    'call_procedure_one',
+    'call_procedure_sets',
+    'iter_procedure',
+    'db_operation',
     'check_required_tables',
+    'warm_connection_pool',
     'get_database_stats',
     'initialize_database_on_startup',
-    'DatabaseError'
+    'DatabaseError',
+    'DatabaseBusyError'
 ]
\ No newline at end of file
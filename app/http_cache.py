@@ -0,0 +1,63 @@
+import hashlib
+from typing import Dict, Optional
+from fastapi import Request, Response, status
+
+# Default for authenticated polling endpoints: the browser may reuse a
+# response briefly, shared caches (CDN/proxies) must not store it
+PRIVATE_SHORT_CACHE = "private, max-age=30"
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Check whether the client's If-None-Match header covers the given ETag.
+
+    Args:
+        request: Incoming request
+        etag: Quoted ETag of the current representation
+
+    Returns:
+        bool: True if the client already holds this representation
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison (RFC 9110): ignore any W/ prefix
+    return any(
+        candidate.strip().removeprefix("W/") == etag
+        for candidate in if_none_match.split(",")
+    )
+
+
+def etag_json_response(
+    request: Request,
+    body: bytes,
+    cache_control: str = PRIVATE_SHORT_CACHE,
+    headers: Optional[Dict[str, str]] = None
+) -> Response:
+    """
+    Build a JSON response carrying an ETag, or 304 Not Modified if the client has it.
+
+    Args:
+        request: Incoming request (for If-None-Match)
+        body: Already-serialized JSON body
+        cache_control: Cache-Control header value
+        headers: Extra headers that are part of the representation; they
+                 are sent with 304s too and included in the ETag
+
+    Returns:
+        Response: 200 with the body, or an empty 304
+    """
+    headers = dict(headers or {})
+    digest = hashlib.blake2b(body, digest_size=16)
+    for name, value in sorted(headers.items()):
+        digest.update(f"\n{name}:{value}".encode())
+    etag = f'"{digest.hexdigest()}"'
+    headers["ETag"] = etag
+    headers["Cache-Control"] = cache_control
+
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -1,7 +1,6 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from datetime import datetime, date, time
 from typing import Optional
-from app.models.prediction import PredictionResponse
 
 class FixtureResponse(BaseModel):
     """Response model for a single fixture"""
@@ -15,10 +14,4 @@ class FixtureResponse(BaseModel):
     game_date: date
     game_time: time
     
-    class Config:
-        from_attributes = True
-        json_encoders = {
-            datetime: lambda v: v.isoformat(),
-            date: lambda v: v.isoformat(),
-            time: lambda v: v.isoformat()
-        }
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True, extra='ignore', frozen=True)
\ No newline at end of file
@@ -22,7 +22,7 @@ class GroupResponse(BaseModel):
     is_creator: Optional[bool] = None
     joined_date: Optional[datetime] = None
     
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, extra='ignore', frozen=True)
 
 class GroupMemberResponse(BaseModel):
     """Response model for group member details"""
@@ -34,14 +34,18 @@ class GroupMemberResponse(BaseModel):
     total_points: int = 0
     rank_position: Optional[int] = None
     
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, extra='ignore', frozen=True)
 
 class GroupLeaveResponse(BaseModel):
     """Response model for leaving a group"""
     message: str
     left_group: int
+    
+    model_config = ConfigDict(extra='ignore', frozen=True)
 
 class GroupDeleteResponse(BaseModel):
     """Response model for deleting a group"""
     message: str
-    deleted_count: int
\ No newline at end of file
+    deleted_count: int
+    
+    model_config = ConfigDict(extra='ignore', frozen=True)
\ No newline at end of file
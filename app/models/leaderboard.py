@@ -1,6 +1,7 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
+from app.models.prediction import PredictionResponse
 
 class FixtureComplete(BaseModel):
     """Request model for completing a fixture (admin only)"""
@@ -12,6 +13,10 @@ class FixtureScoreUpdate(BaseModel):
     home_score: int
     away_score: int
 
+class FixtureScoreBulkUpdate(FixtureScoreUpdate):
+    """Request model for one fixture in a bulk score update (admin only)"""
+    fixture_id: int = Field(..., gt=0, description="Fixture ID (match_num)")
+
 class LeaderboardEntry(BaseModel):
     """Response model for a single leaderboard entry"""
     user_id: int
@@ -25,7 +30,22 @@ class LeaderboardEntry(BaseModel):
     exact_predictions: int
     avg_points_per_prediction: Optional[float] = None
     
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, extra='ignore', frozen=True)
+
+class LeaderboardBatch(BaseModel):
+    """Column-oriented leaderboard response (one list per field, ordered by rank)"""
+    user_ids: List[int]
+    usernames: List[str]
+    emails: List[str]
+    total_points: List[int]
+    rank_positions: List[Optional[int]]
+    last_updated: List[datetime]
+    total_predictions: List[int]
+    scored_predictions: List[int]
+    exact_predictions: List[int]
+    avg_points_per_prediction: List[Optional[float]]
+    
+    model_config = ConfigDict(extra='ignore', frozen=True)
 
 class UserRankResponse(BaseModel):
     """Response model for user's rank in a group"""
@@ -40,7 +60,14 @@ class UserRankResponse(BaseModel):
     avg_points_per_prediction: Optional[float] = None
     total_players: int
     
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, extra='ignore', frozen=True)
+
+class UserGroupSnapshotResponse(BaseModel):
+    """Response model for a user's rank and predictions in a group"""
+    rank: UserRankResponse
+    predictions: List[PredictionResponse]
+    
+    model_config = ConfigDict(frozen=True)
 
 class FixtureCompleteResponse(BaseModel):
     """Response model after completing a fixture"""
@@ -54,10 +81,27 @@ class FixtureCompleteResponse(BaseModel):
     total_predictions: int
     predictions_scored: int
     
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, extra='ignore', frozen=True)
+
+class FixtureScoreBulkResponse(BaseModel):
+    """Response model after setting scores for several fixtures"""
+    updated_count: int
+    skipped_count: int
+    fixtures: List[FixtureCompleteResponse]
+    
+    model_config = ConfigDict(frozen=True)
 
 class LeaderboardRecalculateResponse(BaseModel):
     """Response model for leaderboard recalculation"""
     groups_updated: int
     users_updated: int
-    total_points_awarded: int
\ No newline at end of file
+    total_points_awarded: int
+    
+    model_config = ConfigDict(extra='ignore', frozen=True)
+
+class LeaderboardRecalculateQueuedResponse(BaseModel):
+    """Response model for a leaderboard recalculation queued in the background"""
+    status: str
+    message: str
+    
+    model_config = ConfigDict(extra='ignore', frozen=True)
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime, date, time
-from typing import Optional
+from typing import List, Optional
 
 class PredictionCreate(BaseModel):
     """Request model for creating a prediction"""
@@ -9,6 +9,10 @@ class PredictionCreate(BaseModel):
     pred_home_score: int = Field(..., ge=0, description="Predicted home team score")
     pred_away_score: int = Field(..., ge=0, description="Predicted away team score")
 
+class PredictionBatchCreate(BaseModel):
+    """Request model for creating predictions for several fixtures at once"""
+    predictions: List[PredictionCreate] = Field(..., min_length=1, max_length=100, description="Predictions to create")
+
 class PredictionUpdate(BaseModel):
     """Request model for updating a prediction"""
     group_id: int = Field(..., gt=0, description="Group ID")
@@ -42,7 +46,7 @@ class PredictionResponse(BaseModel):
     game_date: date
     game_time: time
     
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, extra='ignore', frozen=True, defer_build=True)
 
 class FixturePredictionResponse(BaseModel):
     """Response model for predictions on a specific fixture (for leaderboard view)"""
@@ -55,9 +59,19 @@ class FixturePredictionResponse(BaseModel):
     locked: bool
     points_earned: Optional[int] = None
     
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, extra='ignore', frozen=True, defer_build=True)
+
+class PredictionBatchResponse(BaseModel):
+    """Response model for a bulk prediction submission"""
+    created_count: int
+    skipped_count: int
+    predictions: List[PredictionResponse]
+    
+    model_config = ConfigDict(defer_build=True)
 
 class PredictionDeleteResponse(BaseModel):
     """Response model for deleting a prediction"""
     message: str
-    deleted_count: int
\ No newline at end of file
+    deleted_count: int
+    
+    model_config = ConfigDict(defer_build=True)
@@ -1,23 +1,38 @@
-from pydantic import BaseModel, EmailStr, Field, field_validator
-from typing import Optional
+import re
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, field_validator
+from typing import Literal, Optional
 from datetime import datetime
 
+# Precompiled validator patterns (Unicode-aware, matching str.isalnum/isalpha/isdigit)
+_USERNAME_RE = re.compile(r'[\w-]*[^\W_][\w-]*\Z')
+_HAS_LETTER = re.compile(r'[^\W\d_]')
+_HAS_DIGIT = re.compile(r'\d')
+
 class UserResponse(BaseModel):
     user_id: int
     username: str
     email: EmailStr
     created_at: Optional[datetime] = None  # Make it optional
     
+    model_config = ConfigDict(defer_build=True)
+    
 class LoginResponse(BaseModel):
     access_token: str
-    token_type: str = "bearer"
+    token_type: Literal["bearer"] = "bearer"
     expires_in: int
     user: UserResponse
+    
+    model_config = ConfigDict(defer_build=True)
 
 class UserBase(BaseModel):
     """Base user model with common fields"""
     username: str = Field(..., min_length=3, max_length=50, description="Username (3-50 characters)")
     email: EmailStr = Field(..., description="Valid email address")
+    
+    @field_validator('email', mode='before')
+    def normalize_email(cls, v):
+        """Normalize email to lowercase so lookups and stored values agree"""
+        return v.strip().lower() if isinstance(v, str) else v
 
 class UserCreate(UserBase):
     """User creation request model"""
@@ -26,7 +41,7 @@ class UserCreate(UserBase):
     @field_validator('username')
     def validate_username(cls, v):
         """Validate username format"""
-        if not v.replace('_', '').replace('-', '').isalnum():
+        if not _USERNAME_RE.match(v):
             raise ValueError('Username can only contain letters, numbers, underscores, and hyphens')
         return v.lower()  # Store usernames in lowercase
     
@@ -36,8 +51,8 @@ class UserCreate(UserBase):
         if len(v) < 8:
             raise ValueError('Password must be at least 8 characters long')
         
-        has_letter = any(c.isalpha() for c in v)
-        has_number = any(c.isdigit() for c in v)
+        has_letter = _HAS_LETTER.search(v) is not None
+        has_number = _HAS_DIGIT.search(v) is not None
         
         if not has_letter:
             raise ValueError('Password must contain at least one letter')
@@ -68,11 +83,16 @@ class UserUpdate(BaseModel):
     username: Optional[str] = Field(None, min_length=3, max_length=50)
     email: Optional[EmailStr] = Field(None)
     
+    @field_validator('email', mode='before')
+    def normalize_email(cls, v):
+        """Normalize email to lowercase if provided"""
+        return v.strip().lower() if isinstance(v, str) else v
+    
     @field_validator('username')
     def validate_username(cls, v):
         """Validate username format if provided"""
         if v is not None:
-            if not v.replace('_', '').replace('-', '').isalnum():
+            if not _USERNAME_RE.match(v):
                 raise ValueError('Username can only contain letters, numbers, underscores, and hyphens')
             return v.lower()
         return v
@@ -88,8 +108,8 @@ class PasswordChange(BaseModel):
         if len(v) < 8:
             raise ValueError('Password must be at least 8 characters long')
         
-        has_letter = any(c.isalpha() for c in v)
-        has_number = any(c.isdigit() for c in v)
+        has_letter = _HAS_LETTER.search(v) is not None
+        has_number = _HAS_DIGIT.search(v) is not None
         
         if not has_letter:
             raise ValueError('Password must contain at least one letter')
@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 
-class UserProfile(BaseModel):
+class UserStatsProfile(BaseModel):
     username: str
     bio: str | None = None
 
@@ -1,5 +1,6 @@
 from fastapi import APIRouter, HTTPException, status, Depends
 from typing import Dict, Any
+from cachetools import TTLCache
 import logging
 
 from app.models.user import (
@@ -7,8 +8,8 @@ from app.models.user import (
     UserProfile
 )
 from app.services.auth_services import AuthService
-from app.auth import create_login_response, get_current_user
-from app.database import DatabaseError
+from app.auth import create_login_response, get_current_user, PasswordManager, TokenManager
+from app.database import DatabaseBusyError, DatabaseError
 
 logger = logging.getLogger(__name__)
 
@@ -18,33 +19,33 @@ router = APIRouter(
     tags=["authentication"]
 )
 
+# Result of the auth self-test; re-run at most every 5 minutes so frequent
+# health probes don't each pay for a full bcrypt hash
+_HEALTH_CACHE = TTLCache(maxsize=1, ttl=300)
+
 @router.post("/register", 
              response_model=UserResponse,
              status_code=status.HTTP_201_CREATED)
 async def register_user(user_data: UserCreate):
     """Register a new user account."""
     try:
-        # Validate registration data
-        is_valid, error_message = AuthService.validate_registration_data(user_data)
-        if not is_valid:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=error_message
-            )
+        # create_user rejects duplicate usernames/emails itself, in the same
+        # round trip as the insert, so there is no separate pre-check
+        new_user = await AuthService.create_user(user_data)
         
-        # Create user
-        new_user = AuthService.create_user(user_data)
-        
-        logger.info(f"User registered successfully: {new_user.username}")
+        logger.info("User registered successfully: %s", new_user.username)
         return new_user
         
     except ValueError as e:
+        # Username or email already taken
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
+            status_code=status.HTTP_409_CONFLICT,
             detail=str(e)
         )
+    except DatabaseBusyError:
+        raise
     except DatabaseError as e:
-        logger.error(f"Registration failed for {user_data.username}: {e}")
+        logger.error("Registration failed for %s: %s", user_data.username, e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Registration failed due to system error"
@@ -67,7 +68,7 @@ async def login_user(login_data: LoginRequest) -> Dict[str, Any]:
     """
     try:
         # Authenticate user
-        user_data = AuthService.authenticate_user(login_data)
+        user_data = await AuthService.authenticate_user(login_data)
         
         # CHECK IF AUTHENTICATION FAILED - This is the fix!
         if user_data is None:
@@ -80,14 +81,14 @@ async def login_user(login_data: LoginRequest) -> Dict[str, Any]:
         # Re-raise ValueError for invalid credentials
         raise
     except DatabaseError:
-        # Re-raise DatabaseError
+        # Re-raise DatabaseError (including DatabaseBusyError)
         raise
     except Exception as e:
-        logger.error(f"Unexpected error during login: {e}")
+        logger.error("Unexpected error during login: %s", e)
         raise DatabaseError(f"Login failed: {str(e)}")
 
 @router.get("/me", response_model=UserProfile)
-async def get_current_user_profile(current_user: Dict[str, Any] = Depends(get_current_user)):
+def get_current_user_profile(current_user: Dict[str, Any] = Depends(get_current_user)):
     """Get current authenticated user's profile with statistics."""
     try:
         # Get user information
@@ -114,15 +115,17 @@ async def get_current_user_profile(current_user: Dict[str, Any] = Depends(get_cu
         
         return profile
         
+    except DatabaseBusyError:
+        raise
     except DatabaseError as e:
-        logger.error(f"Failed to get user profile for {current_user['user_id']}: {e}")
+        logger.error("Failed to get user profile for %s: %s", current_user['user_id'], e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to retrieve user profile"
         )
 
 @router.get("/verify-token", response_model=UserResponse)
-async def verify_token(current_user: Dict[str, Any] = Depends(get_current_user)):
+def verify_token(current_user: Dict[str, Any] = Depends(get_current_user)):
     """Verify JWT token validity and return user information."""
     try:
         user = AuthService.get_user_by_id(current_user['user_id'])
@@ -135,44 +138,60 @@ async def verify_token(current_user: Dict[str, Any] = Depends(get_current_user))
         
         return user
         
+    except DatabaseBusyError:
+        raise
     except DatabaseError as e:
-        logger.error(f"Token verification failed for user {current_user['user_id']}: {e}")
+        logger.error("Token verification failed for user %s: %s", current_user['user_id'], e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Token verification failed"
         )
 
+async def _run_auth_self_test() -> Dict[str, bool]:
+    """
+    Hash/verify a test password and sign/verify a test token.
+    
+    Returns:
+        dict: password_hashing and jwt_tokens check results
+    """
+    # Test password hashing
+    test_password = "test123456"
+    hashed = await PasswordManager.hash_password_async(test_password)
+    password_valid = await PasswordManager.verify_password_async(test_password, hashed)
+    
+    # Test JWT token creation
+    test_user = {
+        "user_id": 999,
+        "username": "health_check",
+        "email": "health@example.com"
+    }
+    
+    test_token = TokenManager.create_access_token(test_user)
+    token_data = TokenManager.verify_token(test_token)
+    token_valid = token_data['user_id'] == test_user['user_id']
+    
+    return {
+        "password_hashing": password_valid,
+        "jwt_tokens": token_valid
+    }
+
 @router.get("/health")
 async def auth_health_check():
-    """Health check for authentication system."""
+    """Health check for authentication system (self-test result cached for 5 minutes)."""
     try:
-        from app.auth import PasswordManager, TokenManager
-        
-        # Test password hashing
-        test_password = "test123456"
-        hashed = PasswordManager.hash_password(test_password)
-        password_valid = PasswordManager.verify_password(test_password, hashed)
-        
-        # Test JWT token creation
-        test_user = {
-            "user_id": 999,
-            "username": "health_check",
-            "email": "health@example.com"
-        }
-        
-        test_token = TokenManager.create_access_token(test_user)
-        token_data = TokenManager.verify_token(test_token)
-        token_valid = token_data['user_id'] == test_user['user_id']
+        checks = _HEALTH_CACHE.get("auth")
+        if checks is None:
+            checks = await _run_auth_self_test()
+            _HEALTH_CACHE["auth"] = checks
         
         return {
             "status": "healthy",
-            "password_hashing": password_valid,
-            "jwt_tokens": token_valid,
+            **checks,
             "message": "Authentication system is working properly"
         }
         
     except Exception as e:
-        logger.error(f"Authentication health check failed: {e}")
+        logger.error("Authentication health check failed: %s", e)
         return {
             "status": "unhealthy", 
             "error": str(e),
@@ -1,41 +1,68 @@
-from datetime import date, timedelta, time
-from fastapi import APIRouter, HTTPException, status, Query, Depends
-from typing import List
+from datetime import date
+import orjson
+from fastapi import APIRouter, HTTPException, status, Query, Depends, Request, Response
+from typing import Any, Dict, List
 from app.models.fixture import FixtureResponse
 from app.services.fixture_services import FixtureService
-from app.database import DatabaseError
-from app.services.prediction_services import PredictionService
+from app.database import DatabaseBusyError, DatabaseError
 from app.auth import get_current_user
+from app.http_cache import etag_json_response
 import logging
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/fixtures", tags=["fixtures"])
 
+# The next-fixtures list is the same for every caller and only changes when
+# fixtures are updated, so shared caches may hold it as long as the service does
+_NEXT_FIXTURES_CACHE_CONTROL = "public, max-age=30"
 
-@router.get("/next", response_model=List[FixtureResponse])
-async def get_next_fixtures():
+
+def _to_fixture_response(row: Dict[str, Any]) -> FixtureResponse:
+    """
+    Build a FixtureResponse from a trusted FixtureService row without re-validation.
+    
+    Args:
+        row: Fixture row with game_date/game_time already populated
+        
+    Returns:
+        FixtureResponse: Response model (extra columns are dropped)
+    """
+    # MySQL returns BOOLEAN columns as TINYINT
+    return FixtureResponse.model_construct(**{**row, "completed": bool(row["completed"])})
+
+
+@router.get("/next", response_model=None, responses={200: {"model": List[FixtureResponse]}})
+def get_next_fixtures(request: Request) -> Response:
     """
     Get all fixtures for the next available game date.
     
     Returns all games scheduled for the earliest date from today onwards.
     If today has games, returns today's games. Otherwise, returns the next date with games.
+    
+    The response carries an ETag; clients sending it back in If-None-Match
+    get 304 Not Modified while the fixtures are unchanged.
     """
     try:
         fixtures = FixtureService.get_next_fixtures()
-        return fixtures
+        # get_next_fixtures selects exactly the FixtureResponse columns, so the
+        # rows are encoded directly; only the TINYINT flag needs converting
+        body = orjson.dumps([{**f, "completed": bool(f["completed"])} for f in fixtures])
+        return etag_json_response(request, body, cache_control=_NEXT_FIXTURES_CACHE_CONTROL)
         
+    except DatabaseBusyError:
+        raise
     except DatabaseError as e:
-        logger.error(f"Failed to fetch next fixtures: {e}")
+        logger.error("Failed to fetch next fixtures: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to fetch fixtures"
         )
 
 
-@router.get("/upcoming", response_model=List[FixtureResponse])
-async def get_upcoming_fixtures(
+@router.get("/upcoming", response_model=None, responses={200: {"model": List[FixtureResponse]}})
+def get_upcoming_fixtures(
     days: int = Query(7, ge=1, le=30, description="Number of days ahead (1-30)")
-):
+) -> List[FixtureResponse]:
     """
     Get all fixtures for the next N days.
     
@@ -46,18 +73,20 @@ async def get_upcoming_fixtures(
     """
     try:
         fixtures = FixtureService.get_upcoming_fixtures(days)
-        return fixtures
+        return [_to_fixture_response(f) for f in fixtures]
         
+    except DatabaseBusyError:
+        raise
     except DatabaseError as e:
-        logger.error(f"Failed to fetch upcoming fixtures: {e}")
+        logger.error("Failed to fetch upcoming fixtures: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to fetch fixtures"
         )
 
 
-@router.get("/past", response_model=List[FixtureResponse])
-async def get_fixtures_up_to_today():
+@router.get("/past", response_model=None, responses={200: {"model": List[FixtureResponse]}})
+def get_fixtures_up_to_today() -> List[FixtureResponse]:
     """
     Get all fixtures up to and including today.
     Returns all fixtures scheduled on or before today's date.
@@ -65,20 +94,25 @@ async def get_fixtures_up_to_today():
     try:
         today = date.today()
         fixtures = FixtureService.get_fixtures_up_to_date(today)
-        return fixtures
+        return [_to_fixture_response(f) for f in fixtures]
+    except DatabaseBusyError:
+        raise
     except DatabaseError as e:
-        logger.error(f"Failed to fetch fixtures up to today: {e}")
+        logger.error("Failed to fetch fixtures up to today: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to fetch fixtures up to today"
         )
 
 
-@router.get("/lastupdatedfixture", response_model=FixtureResponse)
-async def get_last_updated_fixture():
+@router.get("/lastupdatedfixture", response_model=None, responses={200: {"model": FixtureResponse}})
+def get_last_updated_fixture() -> FixtureResponse:
     """
     Get the most recently updated fixture.
     Returns the fixture that was last modified in the database.
+    
+    Rows come straight from FixtureService, so the response model is built
+    with model_construct and FastAPI's response re-validation is skipped.
     """
     try:
         fixture = FixtureService.get_last_updated_fixture()
@@ -87,66 +121,42 @@ async def get_last_updated_fixture():
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="No fixtures found"
             )
-        # Add game_date and game_time fields for response validation
-        if 'start_time' in fixture and fixture['start_time']:
-            fixture['game_date'] = fixture['start_time'].date()
-            fixture['game_time'] = fixture['start_time'].time()
-        else:
-            fixture['game_date'] = None
-            fixture['game_time'] = None
-        return fixture
+        return _to_fixture_response(fixture)
     except HTTPException:
         raise
+    except DatabaseBusyError:
+        raise
     except DatabaseError as e:
-        logger.error(f"Failed to fetch last updated fixture: {e}")
+        logger.error("Failed to fetch last updated fixture: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to fetch last updated fixture"
         )
 
-@router.get("/next-fixtures-with-predictions", response_model=List[FixtureResponse])
-async def get_next_fixtures_merged_with_predictions(current_user: dict = Depends(get_current_user)):
+@router.get("/next-fixtures-with-predictions", response_model=None, responses={200: {"model": List[FixtureResponse]}})
+def get_next_fixtures_merged_with_predictions(current_user: dict = Depends(get_current_user)) -> List[FixtureResponse]:
     """
     Get all fixtures for the next available game date, merging user's predictions (if any) into the fixture data.
     For fixtures with a prediction, use user's predicted scores for home_score and away_score. Otherwise, use fixture scores.
+    
+    Rows come straight from FixtureService, so response models
+    are built with model_construct and FastAPI's response re-validation is skipped.
     """
     try:
-        user_id = current_user["user_id"]
-        fixtures = FixtureService.get_next_fixtures()
-        predicted = PredictionService.get_next_fixtures_with_user_predictions(user_id)
-        pred_map = {p["match_num"]: p for p in predicted}
-        response = []
-        for f in fixtures:
-            pred = pred_map.get(f["match_num"])
-            game_time = f.get("game_time")
-            if isinstance(game_time, timedelta):
-                total_seconds = int(game_time.total_seconds())
-                hours = total_seconds // 3600
-                minutes = (total_seconds % 3600) // 60
-                seconds = total_seconds % 60
-                game_time = time(hours, minutes, seconds)
-            response.append({
-                "match_num": f["match_num"],
-                "home_team": f["home_team"],
-                "away_team": f["away_team"],
-                "home_score": pred.get("pred_home_score") if pred else f.get("home_score"),
-                "away_score": pred.get("pred_away_score") if pred else f.get("away_score"),
-                "completed": f["completed"],
-                "start_time": f["start_time"],
-                "game_date": f["game_date"],
-                "game_time": game_time
-            })
-        return response
+        fixtures = FixtureService.get_next_fixtures_with_user_predictions(current_user["user_id"])
+        return [_to_fixture_response(f) for f in fixtures]
+    except DatabaseBusyError:
+        raise
     except Exception as e:
-        logger.error(f"Failed to fetch merged next fixtures with predictions: {e}")
+        logger.error("Failed to fetch merged next fixtures with predictions: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to fetch merged fixtures with predictions"
         )
 
 
-@router.get("/{match_num}", response_model=FixtureResponse)
-async def get_fixture(match_num: int):
+@router.get("/{match_num}", response_model=None, responses={200: {"model": FixtureResponse}})
+def get_fixture(match_num: int) -> FixtureResponse:
     """
     Get a specific fixture by match number.
     Parameters:
@@ -160,11 +170,13 @@ async def get_fixture(match_num: int):
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Fixture with match number {match_num} not found"
             )
-        return fixture
+        return _to_fixture_response(fixture)
     except HTTPException:
         raise
+    except DatabaseBusyError:
+        raise
     except DatabaseError as e:
-        logger.error(f"Failed to fetch fixture {match_num}: {e}")
+        logger.error("Failed to fetch fixture %s: %s", match_num, e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to fetch fixture"
@@ -1,4 +1,5 @@
-from fastapi import APIRouter, HTTPException, status, Depends
+import orjson
+from fastapi import APIRouter, HTTPException, status, Depends, Request, Response
 from typing import List
 from app.models.group import (
     GroupCreate, 
@@ -10,14 +11,33 @@ from app.models.group import (
 )
 from app.services.group_services import GroupService
 from app.auth import get_current_user
-from app.database import DatabaseError
+from app.database import DatabaseBusyError, DatabaseError
+from app.http_cache import PRIVATE_SHORT_CACHE, etag_json_response
 import logging
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/groups", tags=["groups"])
 
+# Stored procedure error codes (MYSQL_ERRNO) -> (HTTP status, client message)
+_JOIN_GROUP_ERRORS = {
+    4101: (status.HTTP_404_NOT_FOUND, "Group not found with that code"),
+    4102: (status.HTTP_400_BAD_REQUEST, "You are already a member of this group"),
+}
+_LEAVE_GROUP_ERRORS = {
+    4103: (status.HTTP_400_BAD_REQUEST, "Group creator cannot leave the group. Delete the group instead."),
+    4104: (status.HTTP_400_BAD_REQUEST, "You are not a member of this group"),
+}
+_DELETE_GROUP_ERRORS = {
+    4105: (status.HTTP_404_NOT_FOUND, "Group not found"),
+    4106: (status.HTTP_403_FORBIDDEN, "Only the group creator can delete the group"),
+}
+
+# The by-code lookup is public and identical for every caller, so shared
+# caches may hold it briefly too
+_GROUP_BY_CODE_CACHE_CONTROL = "public, max-age=30"
+
 @router.post("", response_model=GroupResponse, status_code=status.HTTP_201_CREATED)
-async def create_group(
+def create_group(
     group_data: GroupCreate,
     current_user: dict = Depends(get_current_user)
 ):
@@ -35,11 +55,13 @@ async def create_group(
             creator_id=current_user['user_id']
         )
         
-        logger.info(f"Group created: {group['group_name']} by user {current_user['username']}")
+        logger.info("Group created: %s by user %s", group['group_name'], current_user['username'])
         return group
         
+    except DatabaseBusyError:
+        raise
     except DatabaseError as e:
-        logger.error(f"Failed to create group: {e}")
+        logger.error("Failed to create group: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to create group"
@@ -47,7 +69,7 @@ async def create_group(
 
 
 @router.post("/join", response_model=GroupResponse)
-async def join_group(
+def join_group(
     join_data: GroupJoin,
     current_user: dict = Depends(get_current_user)
 ):
@@ -64,34 +86,26 @@ async def join_group(
             group_code=join_data.group_code
         )
         
-        logger.info(f"group returned: {group}")
-        logger.info(f"User {current_user['username']} joined group {group.get('group_name')}")
+        logger.info("User %s joined group %s", current_user['username'], group.get('group_name'))
         return group
         
+    except DatabaseBusyError:
+        raise
     except DatabaseError as e:
-        error_msg = str(e)
-        
         # Handle specific errors from stored procedure
-        if "Group not found" in error_msg:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Group not found with that code"
-            )
-        elif "already a member" in error_msg:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="You are already a member of this group"
-            )
-        else:
-            logger.error(f"Failed to join group: {e}")
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to join group"
-            )
+        mapped = _JOIN_GROUP_ERRORS.get(e.code)
+        if mapped:
+            raise HTTPException(status_code=mapped[0], detail=mapped[1])
+        
+        logger.error("Failed to join group: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to join group"
+        )
 
 
 @router.get("/me", response_model=List[GroupResponse])
-async def get_my_groups(current_user: dict = Depends(get_current_user)):
+def get_my_groups(current_user: dict = Depends(get_current_user)):
     """
     Get all groups that the current user is a member of.
     
@@ -101,25 +115,30 @@ async def get_my_groups(current_user: dict = Depends(get_current_user)):
         groups = GroupService.get_user_groups(current_user['user_id'])
         return groups
         
+    except DatabaseBusyError:
+        raise
     except DatabaseError as e:
-        logger.error(f"Failed to fetch user groups: {e}")
+        logger.error("Failed to fetch user groups: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to fetch your groups"
         )
 
 
-@router.get("/{group_id}", response_model=GroupResponse)
-async def get_group(
+@router.get("/{group_id}", response_model=None, responses={200: {"model": GroupResponse}})
+def get_group(
+    request: Request,
     group_id: int,
     current_user: dict = Depends(get_current_user)
-):
+) -> Response:
     """
     Get details of a specific group by ID.
     
     - **group_id**: The group's unique identifier
     
     Returns full group details including member count and creator info.
+    The response carries an ETag; clients sending it back in If-None-Match
+    get 304 Not Modified while the group is unchanged.
     """
     try:
         group = GroupService.get_group_by_id(group_id)
@@ -130,26 +149,30 @@ async def get_group(
                 detail=f"Group {group_id} not found"
             )
         
-        return group
+        body = orjson.dumps(GroupResponse.model_validate(group).model_dump())
+        return etag_json_response(request, body, cache_control=PRIVATE_SHORT_CACHE)
         
     except HTTPException:
         raise
+    except DatabaseBusyError:
+        raise
     except DatabaseError as e:
-        logger.error(f"Failed to fetch group {group_id}: {e}")
+        logger.error("Failed to fetch group %s: %s", group_id, e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to fetch group details"
         )
 
 
-@router.get("/code/{group_code}", response_model=GroupResponse)
-async def get_group_by_code(group_code: str):
+@router.get("/code/{group_code}", response_model=None, responses={200: {"model": GroupResponse}})
+def get_group_by_code(request: Request, group_code: str) -> Response:
     """
     Look up a group by its code (public endpoint for sharing).
     
     - **group_code**: 6-character group code (case-insensitive)
     
     Useful for sharing group links. Does not require authentication.
+    Supports If-None-Match like GET /groups/{group_id}.
     """
     try:
         group = GroupService.get_group_by_code(group_code)
@@ -160,12 +183,15 @@ async def get_group_by_code(group_code: str):
                 detail="Group not found with that code"
             )
         
-        return group
+        body = orjson.dumps(GroupResponse.model_validate(group).model_dump())
+        return etag_json_response(request, body, cache_control=_GROUP_BY_CODE_CACHE_CONTROL)
         
     except HTTPException:
         raise
+    except DatabaseBusyError:
+        raise
     except DatabaseError as e:
-        logger.error(f"Failed to fetch group by code: {e}")
+        logger.error("Failed to fetch group by code: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to fetch group"
@@ -173,7 +199,7 @@ async def get_group_by_code(group_code: str):
 
 
 @router.get("/{group_id}/members", response_model=List[GroupMemberResponse])
-async def get_group_members(
+def get_group_members(
     group_id: int,
     current_user: dict = Depends(get_current_user)
 ):
@@ -188,8 +214,10 @@ async def get_group_members(
         members = GroupService.get_group_members(group_id)
         return members
         
+    except DatabaseBusyError:
+        raise
     except DatabaseError as e:
-        logger.error(f"Failed to fetch group members: {e}")
+        logger.error("Failed to fetch group members: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to fetch group members"
@@ -197,7 +225,7 @@ async def get_group_members(
 
 
 @router.delete("/{group_id}/leave", response_model=GroupLeaveResponse)
-async def leave_group(
+def leave_group(
     group_id: int,
     current_user: dict = Depends(get_current_user)
 ):
@@ -214,36 +242,29 @@ async def leave_group(
             group_id=group_id
         )
         
-        logger.info(f"User {current_user['username']} left group {group_id}")
+        logger.info("User %s left group %s", current_user['username'], group_id)
         return {
             "message": "Successfully left the group",
             "left_group": left_count
         }
         
+    except DatabaseBusyError:
+        raise
     except DatabaseError as e:
-        error_msg = str(e)
-        
         # Handle specific errors from stored procedure
-        if "creator cannot leave" in error_msg:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Group creator cannot leave the group. Delete the group instead."
-            )
-        elif "not a member" in error_msg:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="You are not a member of this group"
-            )
-        else:
-            logger.error(f"Failed to leave group: {e}")
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to leave group"
-            )
+        mapped = _LEAVE_GROUP_ERRORS.get(e.code)
+        if mapped:
+            raise HTTPException(status_code=mapped[0], detail=mapped[1])
+        
+        logger.error("Failed to leave group: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to leave group"
+        )
 
 
 @router.delete("/{group_id}", response_model=GroupDeleteResponse)
-async def delete_group(
+def delete_group(
     group_id: int,
     current_user: dict = Depends(get_current_user)
 ):
@@ -261,29 +282,22 @@ async def delete_group(
             user_id=current_user['user_id']
         )
         
-        logger.info(f"Group {group_id} deleted by user {current_user['username']}")
+        logger.info("Group %s deleted by user %s", group_id, current_user['username'])
         return {
             "message": "Group successfully deleted",
             "deleted_count": deleted_count
         }
         
+    except DatabaseBusyError:
+        raise
     except DatabaseError as e:
-        error_msg = str(e)
-        
         # Handle specific errors from stored procedure
-        if "Group not found" in error_msg:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Group not found"
-            )
-        elif "Only the group creator" in error_msg:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Only the group creator can delete the group"
-            )
-        else:
-            logger.error(f"Failed to delete group: {e}")
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to delete group"
-            )
\ No newline at end of file
+        mapped = _DELETE_GROUP_ERRORS.get(e.code)
+        if mapped:
+            raise HTTPException(status_code=mapped[0], detail=mapped[1])
+        
+        logger.error("Failed to delete group: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to delete group"
+        )
\ No newline at end of file
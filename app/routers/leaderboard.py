@@ -1,45 +1,189 @@
-from fastapi import APIRouter, HTTPException, status, Depends, Path
-from typing import List
+import threading
+import orjson
+from fastapi import APIRouter, BackgroundTasks, HTTPException, status, Body, Depends, Path, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from typing import Any, Dict, Iterator, List
 from app.models.leaderboard import (
     LeaderboardEntry,
+    LeaderboardBatch,
     UserRankResponse,
+    UserGroupSnapshotResponse,
     FixtureScoreUpdate,
+    FixtureScoreBulkUpdate,
     FixtureCompleteResponse,
-    LeaderboardRecalculateResponse
+    FixtureScoreBulkResponse,
+    LeaderboardRecalculateResponse,
+    LeaderboardRecalculateQueuedResponse
 )
 from app.services.leaderboard_services import LeaderboardService
 from app.auth import get_current_user
-from app.database import DatabaseError
+from app.database import DatabaseBusyError, DatabaseError
+from app.http_cache import PRIVATE_SHORT_CACHE, etag_json_response
 import logging
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/leaderboard", tags=["leaderboard"])
 
+# Stored procedure error codes (MYSQL_ERRNO) -> (HTTP status, client message)
+_UPSERT_SCORES_ERRORS = {
+    4201: (status.HTTP_404_NOT_FOUND, "Fixture not found"),
+    4204: (status.HTTP_400_BAD_REQUEST, "New scores are the same as current scores"),
+}
 
-@router.get("/{group_id}", response_model=List[LeaderboardEntry])
-async def get_group_leaderboard(
+# Held while a background recalculation runs so repeated requests don't stack up
+# (process-local, like the caches; see the single-worker note in the README)
+_RECALCULATION_LOCK = threading.Lock()
+
+# Leaderboards only move when fixtures are scored, so polling clients may
+# reuse a response for as long as the service-side leaderboard cache lives
+_LEADERBOARD_CACHE_CONTROL = PRIVATE_SHORT_CACHE
+
+
+def _to_leaderboard_json(row: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert a trusted get_group_leaderboard row into orjson-serializable form.
+    
+    Args:
+        row: Leaderboard row as returned by LeaderboardService
+        
+    Returns:
+        Dict: LeaderboardEntry fields with MySQL DECIMAL aggregates as int/float
+    """
+    avg_points = row['avg_points_per_prediction']
+    return {
+        'user_id': row['user_id'],
+        'username': row['username'],
+        'email': row['email'],
+        'total_points': row['total_points'],
+        'rank_position': row['rank_position'],
+        'last_updated': row['last_updated'],
+        # SUM()/AVG() come back as Decimal, which orjson doesn't serialize
+        'total_predictions': int(row['total_predictions']),
+        'scored_predictions': int(row['scored_predictions'] or 0),
+        'exact_predictions': int(row['exact_predictions'] or 0),
+        'avg_points_per_prediction': float(avg_points) if avg_points is not None else None
+    }
+
+
+@router.get("/{group_id}", response_model=None, responses={200: {"model": List[LeaderboardEntry]}})
+def get_group_leaderboard(
+    request: Request,
     group_id: int = Path(..., gt=0, description="Group ID"),
+    limit: int = Query(50, gt=0, le=500, description="Maximum number of entries to return"),
+    offset: int = Query(0, ge=0, description="Number of top-ranked entries to skip"),
     current_user: dict = Depends(get_current_user)
-):
+) -> Response:
     """
-    Get leaderboard rankings for a group.
+    Get leaderboard rankings for a group, one page at a time.
     
     - **group_id**: The group's unique identifier
+    - **limit**: Page size (default 50, max 500)
+    - **offset**: Entries to skip (default 0, i.e. the top of the table)
     
-    Returns all users in the group sorted by rank (highest points first).
+    Returns users in the group sorted by rank (highest points first).
     Includes stats like total predictions, exact predictions, and average points.
+    The total number of entries is sent in the X-Total-Count header.
+    
+    Rows come straight from LeaderboardService, so they are serialized
+    directly with orjson and FastAPI's response validation is skipped.
+    The response carries an ETag; clients sending it back in If-None-Match
+    get 304 Not Modified while the leaderboard is unchanged.
     """
     try:
         leaderboard = LeaderboardService.get_group_leaderboard(group_id)
+        # The full table is cached per group, so paging is just a slice
+        page = leaderboard[offset:offset + limit]
+        
+        # Empty leaderboard is valid (group exists but no scores yet)
+        body = orjson.dumps([_to_leaderboard_json(row) for row in page])
+        # The total is part of the representation, so it goes into the ETag too
+        return etag_json_response(
+            request,
+            body,
+            cache_control=_LEADERBOARD_CACHE_CONTROL,
+            headers={"X-Total-Count": str(len(leaderboard))}
+        )
         
-        if not leaderboard:
-            # Empty leaderboard is valid (group exists but no scores yet)
-            return []
+    except DatabaseBusyError:
+        raise
+    except DatabaseError as e:
+        logger.error("Failed to fetch leaderboard for group %s: %s", group_id, e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to fetch leaderboard"
+        )
+
+
+@router.get("/{group_id}/stream", response_model=None, responses={200: {"model": List[LeaderboardEntry]}})
+def stream_group_leaderboard(
+    group_id: int = Path(..., gt=0, description="Group ID"),
+    current_user: dict = Depends(get_current_user)
+) -> StreamingResponse:
+    """
+    Get leaderboard rankings for a group, streamed row by row.
+    
+    - **group_id**: The group's unique identifier
+    
+    Same body as the regular leaderboard, but each row is encoded and
+    written out on its own instead of building one large JSON document.
+    The rows are read up front, so no database connection is held while
+    the client downloads the body. Not cached.
+    """
+    try:
+        rows = LeaderboardService.stream_group_leaderboard(group_id)
+        
+    except DatabaseBusyError:
+        raise
+    except DatabaseError as e:
+        logger.error("Failed to stream leaderboard for group %s: %s", group_id, e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to fetch leaderboard"
+        )
+    
+    def body() -> Iterator[bytes]:
+        yield b"["
+        for i, row in enumerate(rows):
+            yield (b"," if i else b"") + orjson.dumps(_to_leaderboard_json(row))
+        yield b"]"
+    
+    return StreamingResponse(body(), media_type="application/json")
+
+
+@router.get("/{group_id}/columns", response_model=LeaderboardBatch)
+def get_group_leaderboard_columns(
+    group_id: int = Path(..., gt=0, description="Group ID"),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Get leaderboard rankings for a group in column-oriented form.
+    
+    - **group_id**: The group's unique identifier
+    
+    Same data as the regular leaderboard, but returned as parallel lists
+    (one per field, in rank order) instead of one object per user.
+    Cheaper to build and serialize for large groups.
+    """
+    try:
+        rows = LeaderboardService.get_group_leaderboard(group_id)
         
-        return leaderboard
+        return LeaderboardBatch(
+            user_ids=[r['user_id'] for r in rows],
+            usernames=[r['username'] for r in rows],
+            emails=[r['email'] for r in rows],
+            total_points=[r['total_points'] for r in rows],
+            rank_positions=[r['rank_position'] for r in rows],
+            last_updated=[r['last_updated'] for r in rows],
+            total_predictions=[r['total_predictions'] for r in rows],
+            scored_predictions=[r['scored_predictions'] for r in rows],
+            exact_predictions=[r['exact_predictions'] for r in rows],
+            avg_points_per_prediction=[r['avg_points_per_prediction'] for r in rows]
+        )
         
+    except DatabaseBusyError:
+        raise
     except DatabaseError as e:
-        logger.error(f"Failed to fetch leaderboard for group {group_id}: {e}")
+        logger.error("Failed to fetch leaderboard columns for group %s: %s", group_id, e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to fetch leaderboard"
@@ -47,7 +191,8 @@ async def get_group_leaderboard(
 
 
 @router.get("/{group_id}/me", response_model=UserRankResponse)
-async def get_my_rank(
+def get_my_rank(
+    response: Response,
     group_id: int = Path(..., gt=0, description="Group ID"),
     current_user: dict = Depends(get_current_user)
 ):
@@ -70,25 +215,104 @@ async def get_my_rank(
                 detail=f"You are not a member of group {group_id}"
             )
         
+        response.headers["Cache-Control"] = _LEADERBOARD_CACHE_CONTROL
         return rank_info
         
     except HTTPException:
         raise
+    except DatabaseBusyError:
+        raise
     except DatabaseError as e:
-        logger.error(f"Failed to fetch user rank: {e}")
+        logger.error("Failed to fetch user rank: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to fetch your rank"
         )
 
 
+@router.get("/{group_id}/me/snapshot", response_model=UserGroupSnapshotResponse)
+def get_my_group_snapshot(
+    response: Response,
+    group_id: int = Path(..., gt=0, description="Group ID"),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Get your rank and your predictions in a group in one request.
+    
+    - **group_id**: The group's unique identifier
+    
+    Same data as /leaderboard/{group_id}/me plus your predictions in the group,
+    fetched from the database in a single round trip.
+    """
+    try:
+        snapshot = LeaderboardService.get_user_group_snapshot(
+            user_id=current_user['user_id'],
+            group_id=group_id
+        )
+        
+        if not snapshot:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"You are not a member of group {group_id}"
+            )
+        
+        response.headers["Cache-Control"] = _LEADERBOARD_CACHE_CONTROL
+        return snapshot
+        
+    except HTTPException:
+        raise
+    except DatabaseBusyError:
+        raise
+    except DatabaseError as e:
+        logger.error("Failed to fetch group snapshot: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to fetch your group snapshot"
+        )
+
+
 # ====================================================
 # ADMIN ENDPOINTS (Fixture Management)
 #=====================================================
 
 
+@router.put("/admin/fixtures/scores/bulk", response_model=FixtureScoreBulkResponse)
+def upsert_fixture_scores_bulk(
+    scores: List[FixtureScoreBulkUpdate] = Body(..., min_length=1, max_length=500),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Set the scores for several fixtures in one request (ADMIN ONLY).
+    
+    - **body**: Up to 500 entries, each with fixture_id, home_score and away_score
+    
+    Unknown fixtures, and completed fixtures whose scores are unchanged, are
+    skipped instead of failing the whole batch. Points and rankings are
+    recalculated for every fixture that was set.
+    """
+    try:
+        updated = LeaderboardService.upsert_fixture_scores_batch(
+            [s.model_dump() for s in scores]
+        )
+        logger.info("Admin %s set scores for %s fixtures", current_user['username'], len(updated))
+        return FixtureScoreBulkResponse(
+            updated_count=len(updated),
+            skipped_count=len({s.fixture_id for s in scores}) - len(updated),
+            fixtures=updated
+        )
+        
+    except DatabaseBusyError:
+        raise
+    except DatabaseError as e:
+        logger.error("Failed to set fixture scores in bulk: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to set fixture scores"
+        )
+
+
 @router.put("/admin/fixtures/{fixture_id}/scores", response_model=FixtureCompleteResponse)
-async def upsert_fixture_scores(
+def upsert_fixture_scores(
     fixture_id: int = Path(..., gt=0, description="Fixture ID"),
     scores: FixtureScoreUpdate = ...,
     current_user: dict = Depends(get_current_user)
@@ -102,53 +326,34 @@ async def upsert_fixture_scores(
     Automatically recalculates points and rankings as needed.
     """
     try:
-        # Try to complete the fixture (works for both new and already-completed)
-        try:
-            result = LeaderboardService.complete_fixture(
-                fixture_id=fixture_id,
-                home_score=scores.home_score,
-                away_score=scores.away_score
-            )
-            logger.info(
-                f"Admin {current_user['username']} set fixture {fixture_id} scores: "
-                f"{scores.home_score}-{scores.away_score}"
-            )
-            return result
-        except DatabaseError as e:
-            error_msg = str(e)
-            # If already completed, update the scores
-            if "already completed" in error_msg.lower():
-                result = LeaderboardService.update_fixture_scores(
-                    fixture_id=fixture_id,
-                    home_score=scores.home_score,
-                    away_score=scores.away_score
-                )
-                logger.info(
-                    f"Admin {current_user['username']} updated fixture {fixture_id} scores: "
-                    f"{scores.home_score}-{scores.away_score}"
-                )
-                return result
-            elif "not found" in error_msg.lower():
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="Fixture not found"
-                )
-            else:
-                logger.error(f"Failed to set/update fixture scores: {e}")
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail="Failed to set/update fixture scores"
-                )
-    except Exception as e:
-        logger.error(f"Unexpected error in upsert_fixture_scores: {e}")
+        # Completes the fixture, or corrects its scores if already completed
+        result = LeaderboardService.upsert_fixture_scores(
+            fixture_id=fixture_id,
+            home_score=scores.home_score,
+            away_score=scores.away_score
+        )
+        logger.info(
+            "Admin %s set fixture %s scores: %s-%s",
+            current_user['username'], fixture_id, scores.home_score, scores.away_score
+        )
+        return result
+        
+    except DatabaseBusyError:
+        raise
+    except DatabaseError as e:
+        mapped = _UPSERT_SCORES_ERRORS.get(e.code)
+        if mapped:
+            raise HTTPException(status_code=mapped[0], detail=mapped[1])
+        
+        logger.error("Failed to set/update fixture scores: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Unexpected error occurred"
+            detail="Failed to set/update fixture scores"
         )
 
 
 @router.post("/admin/recalculate", response_model=LeaderboardRecalculateResponse)
-async def recalculate_all_leaderboards(
+def recalculate_all_leaderboards(
     current_user: dict = Depends(get_current_user)
 ):
     """
@@ -169,14 +374,61 @@ async def recalculate_all_leaderboards(
         stats = LeaderboardService.recalculate_all_leaderboards()
         
         logger.info(
-            f"Admin {current_user['username']} triggered full leaderboard recalculation: "
-            f"{stats['groups_updated']} groups, {stats['users_updated']} users"
+            "Admin %s triggered full leaderboard recalculation: %s groups, %s users",
+            current_user['username'], stats['groups_updated'], stats['users_updated']
         )
         return stats
         
+    except DatabaseBusyError:
+        raise
     except DatabaseError as e:
-        logger.error(f"Failed to recalculate leaderboards: {e}")
+        logger.error("Failed to recalculate leaderboards: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to recalculate leaderboards"
-        )
\ No newline at end of file
+        )
+
+
+def _run_background_recalculation() -> None:
+    """Run a full leaderboard recalculation after the response has been sent."""
+    try:
+        stats = LeaderboardService.recalculate_all_leaderboards()
+        logger.info(
+            "Background leaderboard recalculation finished: %s groups, %s users",
+            stats['groups_updated'], stats['users_updated']
+        )
+    except DatabaseError as e:
+        logger.error("Background leaderboard recalculation failed: %s", e)
+    finally:
+        _RECALCULATION_LOCK.release()
+
+
+@router.post(
+    "/admin/recalculate/background",
+    response_model=LeaderboardRecalculateQueuedResponse,
+    status_code=status.HTTP_202_ACCEPTED
+)
+def recalculate_all_leaderboards_in_background(
+    background_tasks: BackgroundTasks,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Queue a full leaderboard recalculation (ADMIN ONLY - Utility/Maintenance).
+    
+    Same work as /admin/recalculate, but the request returns 202 immediately
+    and the recalculation runs after the response is sent. Only one
+    background recalculation runs at a time; further requests while it is
+    running are reported as already running.
+    """
+    if not _RECALCULATION_LOCK.acquire(blocking=False):
+        return {
+            "status": "running",
+            "message": "A leaderboard recalculation is already in progress"
+        }
+    
+    background_tasks.add_task(_run_background_recalculation)
+    logger.info("Admin %s queued a background leaderboard recalculation", current_user['username'])
+    return {
+        "status": "queued",
+        "message": "Leaderboard recalculation started"
+    }
@@ -1,25 +1,74 @@
 from fastapi import APIRouter, HTTPException, status, Depends, Query
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from app.models.prediction import (
     PredictionCreate,
+    PredictionBatchCreate,
     PredictionUpdate,
     PredictionResponse,
     FixturePredictionResponse,
+    PredictionBatchResponse,
     PredictionDeleteResponse
 )
 from app.services.prediction_services import PredictionService
-from app.auth import get_current_user
-from app.database import DatabaseError
+from app.auth import CurrentUser, get_current_user
+from app.database import DatabaseBusyError, DatabaseError
 import logging
 
 logger = logging.getLogger(__name__)
-router = APIRouter(prefix="/predictions", tags=["predictions"])
+# Every prediction route requires authentication; FastAPI caches the
+# dependency per request, so handlers taking CurrentUser reuse the result
+router = APIRouter(prefix="/predictions", tags=["predictions"], dependencies=[Depends(get_current_user)])
+
+# Stored procedure / trigger error codes (MYSQL_ERRNO) -> (HTTP status, client message)
+_CREATE_PREDICTION_ERRORS = {
+    4301: (status.HTTP_400_BAD_REQUEST, "Cannot predict - game has already started"),
+    4302: (status.HTTP_400_BAD_REQUEST, "You already have a prediction for this game in this group"),
+}
+_UPDATE_PREDICTION_ERRORS = {
+    4303: (status.HTTP_404_NOT_FOUND, "Prediction not found for this game in this group"),
+    4304: (status.HTTP_400_BAD_REQUEST, "Cannot update - prediction is locked or game has started"),
+    4305: (status.HTTP_400_BAD_REQUEST, "Cannot update - prediction is locked or game has started"),
+}
+_DELETE_PREDICTION_ERRORS = {
+    4303: (status.HTTP_404_NOT_FOUND, "Prediction not found for this game in this group"),
+    4304: (status.HTTP_400_BAD_REQUEST, "Cannot delete - prediction is locked or game has started"),
+    4305: (status.HTTP_400_BAD_REQUEST, "Cannot delete - prediction is locked or game has started"),
+}
+
+
+def _to_prediction_response(row: Dict[str, Any]) -> PredictionResponse:
+    """
+    Build a PredictionResponse from a trusted PredictionService row without re-validation.
+    
+    Args:
+        row: Prediction row joined with its fixture details
+        
+    Returns:
+        PredictionResponse: Response model (extra columns are dropped)
+    """
+    # MySQL returns BOOLEAN columns as TINYINT
+    return PredictionResponse.model_construct(
+        **{**row, "locked": bool(row["locked"]), "completed": bool(row["completed"])}
+    )
+
+
+def _to_fixture_prediction_response(row: Dict[str, Any]) -> FixturePredictionResponse:
+    """
+    Build a FixturePredictionResponse from a trusted PredictionService row without re-validation.
+    
+    Args:
+        row: Prediction row joined with the predicting user's username
+        
+    Returns:
+        FixturePredictionResponse: Response model (extra columns are dropped)
+    """
+    return FixturePredictionResponse.model_construct(**{**row, "locked": bool(row["locked"])})
 
 
 @router.post("", response_model=PredictionResponse, status_code=status.HTTP_201_CREATED)
-async def create_prediction(
+def create_prediction(
     prediction_data: PredictionCreate,
-    current_user: dict = Depends(get_current_user)
+    current_user: CurrentUser
 ):
     """
     Create a new prediction for a fixture in a group.
@@ -43,38 +92,70 @@ async def create_prediction(
             pred_away_score=prediction_data.pred_away_score
         )
         
-        logger.info(f"Prediction created by {current_user['username']} for fixture {prediction_data.fixture_id}")
+        logger.info("Prediction created by %s for fixture %s", current_user['username'], prediction_data.fixture_id)
         return prediction
         
+    except DatabaseBusyError:
+        raise
     except DatabaseError as e:
-        error_msg = str(e)
-        
         # Handle specific errors from stored procedure
-        if "game has already started" in error_msg:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Cannot predict - game has already started"
-            )
-        elif "already exists" in error_msg:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="You already have a prediction for this game in this group"
-            )
-        else:
-            logger.error(f"Failed to create prediction: {e}")
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to create prediction"
-            )
+        mapped = _CREATE_PREDICTION_ERRORS.get(e.code)
+        if mapped:
+            raise HTTPException(status_code=mapped[0], detail=mapped[1])
+        
+        logger.error("Failed to create prediction: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to create prediction"
+        )
 
 
 
-@router.get("/me", response_model=List[PredictionResponse])
-async def get_my_predictions(
+@router.post("/batch", response_model=None, status_code=status.HTTP_201_CREATED,
+             responses={201: {"model": PredictionBatchResponse}})
+def create_predictions_batch(
+    batch: PredictionBatchCreate,
+    current_user: CurrentUser
+) -> PredictionBatchResponse:
+    """
+    Create predictions for several fixtures in one request (e.g. a full slate of games).
+    
+    - **predictions**: Up to 100 predictions, each with group_id, fixture_id,
+      pred_home_score and pred_away_score
+    
+    Predictions for games that have already started, or that you already
+    made in that group, are skipped instead of failing the whole batch.
+    All predictions are made as the current user.
+    """
+    try:
+        created = PredictionService.create_predictions_batch(
+            user_id=current_user['user_id'],
+            predictions=[p.model_dump() for p in batch.predictions]
+        )
+        
+        logger.info("%s predictions created in batch by %s", len(created), current_user['username'])
+        return PredictionBatchResponse.model_construct(
+            created_count=len(created),
+            skipped_count=len(batch.predictions) - len(created),
+            predictions=[_to_prediction_response(p) for p in created]
+        )
+        
+    except DatabaseBusyError:
+        raise
+    except DatabaseError as e:
+        logger.error("Failed to create predictions batch: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to create predictions"
+        )
+
+
+@router.get("/me", response_model=None, responses={200: {"model": List[PredictionResponse]}})
+def get_my_predictions(
+    current_user: CurrentUser,
     min_match_num: Optional[int] = Query(None, description="Minimum match number (inclusive)"),
-    max_match_num: Optional[int] = Query(None, description="Maximum match number (inclusive)"),
-    current_user: dict = Depends(get_current_user)
-):
+    max_match_num: Optional[int] = Query(None, description="Maximum match number (inclusive)")
+) -> List[PredictionResponse]:
     """
     Get all predictions for the current user, optionally filtered by match number range.
     - **min_match_num**: Only include predictions for fixtures with match_num >= this value
@@ -86,21 +167,22 @@ async def get_my_predictions(
             min_match_num=min_match_num,
             max_match_num=max_match_num
         )
-        return predictions
+        return [_to_prediction_response(p) for p in predictions]
+    except DatabaseBusyError:
+        raise
     except DatabaseError as e:
-        logger.error(f"Failed to fetch user predictions: {e}")
+        logger.error("Failed to fetch user predictions: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to fetch your predictions"
         )
 
 
-@router.get("/fixture/{fixture_id}", response_model=List[FixturePredictionResponse])
-async def get_fixture_predictions(
+@router.get("/fixture/{fixture_id}", response_model=None, responses={200: {"model": List[FixturePredictionResponse]}})
+def get_fixture_predictions(
     fixture_id: int,
-    group_id: int = Query(..., description="Group ID"),
-    current_user: dict = Depends(get_current_user)
-):
+    group_id: int = Query(..., description="Group ID")
+) -> List[FixturePredictionResponse]:
     """
     Get all predictions for a specific fixture in a group.
     
@@ -116,10 +198,12 @@ async def get_fixture_predictions(
             group_id=group_id
         )
         
-        return predictions
+        return [_to_fixture_prediction_response(p) for p in predictions]
         
+    except DatabaseBusyError:
+        raise
     except DatabaseError as e:
-        logger.error(f"Failed to fetch fixture predictions: {e}")
+        logger.error("Failed to fetch fixture predictions: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to fetch fixture predictions"
@@ -127,10 +211,7 @@ async def get_fixture_predictions(
 
 
 @router.get("/{pid}", response_model=PredictionResponse)
-async def get_prediction(
-    pid: int,
-    current_user: dict = Depends(get_current_user)
-):
+def get_prediction(pid: int):
     """
     Get a specific prediction by ID.
     
@@ -151,8 +232,10 @@ async def get_prediction(
         
     except HTTPException:
         raise
+    except DatabaseBusyError:
+        raise
     except DatabaseError as e:
-        logger.error(f"Failed to fetch prediction {pid}: {e}")
+        logger.error("Failed to fetch prediction %s: %s", pid, e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to fetch prediction"
@@ -160,9 +243,9 @@ async def get_prediction(
 
 
 @router.put("", response_model=PredictionResponse)
-async def update_prediction(
+def update_prediction(
     prediction_data: PredictionUpdate,
-    current_user: dict = Depends(get_current_user)
+    current_user: CurrentUser
 ):
     """
     Update an existing prediction.
@@ -186,36 +269,29 @@ async def update_prediction(
             pred_away_score=prediction_data.pred_away_score
         )
         
-        logger.info(f"Prediction updated by {current_user['username']} for fixture {prediction_data.fixture_id}")
+        logger.info("Prediction updated by %s for fixture %s", current_user['username'], prediction_data.fixture_id)
         return prediction
         
+    except DatabaseBusyError:
+        raise
     except DatabaseError as e:
-        error_msg = str(e)
-        
         # Handle specific errors
-        if "not found" in error_msg:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Prediction not found for this game in this group"
-            )
-        elif "locked" in error_msg or "already started" in error_msg:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Cannot update - prediction is locked or game has started"
-            )
-        else:
-            logger.error(f"Failed to update prediction: {e}")
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to update prediction"
-            )
+        mapped = _UPDATE_PREDICTION_ERRORS.get(e.code)
+        if mapped:
+            raise HTTPException(status_code=mapped[0], detail=mapped[1])
+        
+        logger.error("Failed to update prediction: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to update prediction"
+        )
 
 
 @router.delete("", response_model=PredictionDeleteResponse)
-async def delete_prediction(
+def delete_prediction(
+    current_user: CurrentUser,
     group_id: int = Query(..., description="Group ID"),
-    fixture_id: int = Query(..., description="Fixture ID"),
-    current_user: dict = Depends(get_current_user)
+    fixture_id: int = Query(..., description="Fixture ID")
 ):
     """
     Delete a prediction.
@@ -235,29 +311,22 @@ async def delete_prediction(
             fixture_id=fixture_id
         )
         
-        logger.info(f"Prediction deleted by {current_user['username']} for fixture {fixture_id}")
+        logger.info("Prediction deleted by %s for fixture %s", current_user['username'], fixture_id)
         return {
             "message": "Prediction successfully deleted",
             "deleted_count": deleted_count
         }
         
+    except DatabaseBusyError:
+        raise
     except DatabaseError as e:
-        error_msg = str(e)
-        
         # Handle specific errors
-        if "not found" in error_msg:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Prediction not found for this game in this group"
-            )
-        elif "locked" in error_msg or "already started" in error_msg:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Cannot delete - prediction is locked or game has started"
-            )
-        else:
-            logger.error(f"Failed to delete prediction: {e}")
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to delete prediction"
-            )
\ No newline at end of file
+        mapped = _DELETE_PREDICTION_ERRORS.get(e.code)
+        if mapped:
+            raise HTTPException(status_code=mapped[0], detail=mapped[1])
+        
+        logger.error("Failed to delete prediction: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to delete prediction"
+        )
\ No newline at end of file
@@ -1,9 +1,11 @@
-from fastapi import APIRouter, HTTPException, status, Depends
+import orjson
+from fastapi import APIRouter, HTTPException, status, Depends, Request
 from app.services.user_services import UserService
 from app.auth import get_current_user
-from app.database import get_db_cursor
+from app.database import DatabaseBusyError
+from app.http_cache import PRIVATE_SHORT_CACHE, etag_json_response
 import logging
-from app.models.user_stats import BioUpdateRequest
+from app.models.user_stats import BioUpdateRequest, UserStats
 
 logger = logging.getLogger(__name__)
 
@@ -12,33 +14,37 @@ router = APIRouter(prefix="/user", tags=["user"])
 @router.get("/me/profile")
 def get_my_profile(current_user: dict = Depends(get_current_user)):
     try:
-        with get_db_cursor() as cursor:
-            profile = UserService.get_user_profile(cursor, current_user['user_id'])
-            return profile
+        profile = UserService.get_user_profile(current_user['user_id'])
+        return profile
     except HTTPException as e:
         raise e
+    except DatabaseBusyError:
+        raise
     except Exception as e:
-        logger.error(f"Failed to fetch profile: {e}")
+        logger.error("Failed to fetch profile: %s", e)
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to fetch profile")
 
 @router.put("/me/profile")
 def update_my_bio(request: BioUpdateRequest, current_user: dict = Depends(get_current_user)):
     try:
-        with get_db_cursor() as cursor:
-            UserService.update_user_bio(cursor, current_user['user_id'], request.bio)
+        UserService.update_user_bio(current_user['user_id'], request.bio)
         return {"message": "Bio updated successfully"}
+    except DatabaseBusyError:
+        raise
     except Exception as e:
-        logger.error(f"Failed to update bio: {e}")
+        logger.error("Failed to update bio: %s", e)
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to update bio")
 
-@router.get("/me/stats")
-def get_my_stats(current_user: dict = Depends(get_current_user)):
+@router.get("/me/stats", response_model=None, responses={200: {"model": UserStats}})
+def get_my_stats(request: Request, current_user: dict = Depends(get_current_user)):
     try:
-        with get_db_cursor() as cursor:
-            stats = UserService.get_user_stats(cursor, current_user['user_id'])
-            return stats
+        stats = UserService.get_user_stats(current_user['user_id'])
+        # Stats only change with predictions and scored fixtures; let clients revalidate with If-None-Match
+        return etag_json_response(request, orjson.dumps(stats.model_dump()), cache_control=PRIVATE_SHORT_CACHE)
     except HTTPException as e:
         raise e
+    except DatabaseBusyError:
+        raise
     except Exception as e:
-        logger.error(f"Failed to fetch stats: {e}")
+        logger.error("Failed to fetch stats: %s", e)
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to fetch stats")
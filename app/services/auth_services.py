@@ -1,16 +1,31 @@
+import re
+from types import MappingProxyType
 from typing import Optional, Dict, Any
 import logging
-from app.database import call_procedure, DatabaseError
+from starlette.concurrency import run_in_threadpool
+from app.database import call_procedure, DatabaseBusyError, DatabaseError
 from app.auth import PasswordManager, create_login_response
 from app.models.user import UserCreate, UserResponse, LoginRequest, LoginResponse, TokenData
 
 logger = logging.getLogger(__name__)
 
+# Unique index named in a 1062 error, e.g. "... for key 'User.email'"
+# (MySQL 8.0.19+) or "... for key 'email'" (older servers)
+_DUPLICATE_KEY_RE = re.compile(r"for key '(?:[^'.]*\.)?([^'.]*)'\s*$")
+
+# Shape of get_user_stats results; also returned when there is no data
+_DEFAULT_USER_STATS = MappingProxyType({
+    'total_predictions': 0,
+    'total_points': 0,
+    'groups_count': 0,
+    'accuracy_percentage': 0.0
+})
+
 class AuthService:
     """Authentication service with business logic for user management"""
     
     @staticmethod
-    def create_user(user_data: UserCreate) -> UserResponse:
+    async def create_user(user_data: UserCreate) -> UserResponse:
         """
         Create a new user account.
         
@@ -25,12 +40,12 @@ class AuthService:
             ValueError: If user already exists
         """
         try:
-            # Hash the password
-            hashed_password = PasswordManager.hash_password(user_data.password)
+            # Hash the password on the bcrypt pool so the event loop stays free
+            hashed_password = await PasswordManager.hash_password_async(user_data.password)
             
-            # Call stored procedure to create user
-            # We'll need to create this procedure in procedures.sql
-            result = call_procedure('create_user', [
+            # call_procedure blocks on MySQL, so run it on the threadpool
+            # (as FastAPI does for sync routes) instead of on the event loop
+            result = await run_in_threadpool(call_procedure, 'create_user', [
                 user_data.username,
                 user_data.email,
                 hashed_password
@@ -38,7 +53,7 @@ class AuthService:
             
             if result and len(result) > 0:
                 user = result[0]
-                logger.info(f"User created successfully: {user_data.username}")
+                logger.info("User created successfully: %s", user_data.username)
                 
                 return UserResponse(
                     user_id=user['user_id'],
@@ -49,18 +64,28 @@ class AuthService:
             else:
                 raise DatabaseError("User creation returned no data")
                 
+        except DatabaseBusyError:
+            raise
         except DatabaseError as e:
-            # Check if it's a duplicate user error (we'll define error codes in procedure)
-            if "[3001]" in str(e):  # Username already exists
+            # Duplicate user errors from the procedure checks; 1062 is the
+            # unique-key violation when a concurrent signup wins the race
+            if e.code == 3001:  # Username already exists
                 raise ValueError("Username already exists")
-            elif "[3002]" in str(e):  # Email already exists
+            elif e.code == 3002:  # Email already exists
                 raise ValueError("Email already exists")
+            elif e.code == 1062:
+                # Match the index name, not the message, which also quotes
+                # the duplicate value (a username like "emailfan")
+                key = _DUPLICATE_KEY_RE.search(str(e))
+                if key and key.group(1) == 'email':
+                    raise ValueError("Email already exists")
+                raise ValueError("Username already exists")
             else:
-                logger.error(f"User creation failed for {user_data.username}: {e}")
+                logger.error("User creation failed for %s: %s", user_data.username, e)
                 raise DatabaseError(f"Failed to create user: {e}")
     
     @staticmethod
-    def authenticate_user(login_data: LoginRequest) -> Optional[Dict[str, Any]]:
+    async def authenticate_user(login_data: LoginRequest) -> Optional[Dict[str, Any]]:
         """
         Authenticate user credentials and return user data.
         
@@ -71,22 +96,25 @@ class AuthService:
             Optional[Dict]: User data if authentication successful, None otherwise
         """
         try:
-            # Get user by username or email
-            # We'll need to create this procedure in procedures.sql
-            result = call_procedure('get_user_for_login', [login_data.username])
+            # Get user by username or email, off the event loop
+            result = await run_in_threadpool(call_procedure, 'get_user_for_login', [login_data.username])
             
             if not result or len(result) == 0:
-                logger.warning(f"Login attempt for non-existent user: {login_data.username}")
+                logger.warning("Login attempt for non-existent user: %s", login_data.username)
                 return None
             
             user = result[0]
 
             # Verify password
-            if not PasswordManager.verify_password(login_data.password, user['password']):
-                logger.warning(f"Invalid password for user: {login_data.username}")
+            if not await PasswordManager.verify_password_async(login_data.password, user['password']):
+                logger.warning("Invalid password for user: %s", login_data.username)
                 return None
             
-            logger.info(f"User authenticated successfully: {user['username']}")
+            logger.info("User authenticated successfully: %s", user['username'])
+            
+            # Move pre-pepper hashes onto the pepper while the plain password is at hand
+            if PasswordManager.needs_rehash(user['password']):
+                await AuthService._rehash_password(user['user_id'], login_data.password)
             
             # Return user data (without password)
             return {
@@ -96,12 +124,34 @@ class AuthService:
                 'created_at': user['created_at']
             }
             
+        except DatabaseBusyError:
+            raise
         except DatabaseError as e:
-            logger.error(f"Authentication failed for {login_data.username}: {e}")
+            logger.error("Authentication failed for %s: %s", login_data.username, e)
             return None
     
     @staticmethod
-    def login_user(login_data: LoginRequest) -> LoginResponse:
+    async def _rehash_password(user_id: int, plain_password: str) -> None:
+        """
+        Store a fresh (peppered) hash for a user after a successful login.
+        
+        Failures are logged and ignored; the old hash keeps working.
+        
+        Args:
+            user_id (int): User ID
+            plain_password (str): The password the user just logged in with
+        """
+        try:
+            hashed_password = await PasswordManager.hash_password_async(plain_password)
+            await run_in_threadpool(call_procedure, 'update_user_password', [user_id, hashed_password])
+            logger.info("Rehashed password for user %s with the configured pepper", user_id)
+        except DatabaseBusyError:
+            raise
+        except Exception as e:
+            logger.error("Failed to rehash password for user %s: %s", user_id, e)
+    
+    @staticmethod
+    async def login_user(login_data: LoginRequest) -> LoginResponse:
         """
         Complete login process with JWT token creation.
         
@@ -115,7 +165,7 @@ class AuthService:
             ValueError: If authentication fails
         """
         # Authenticate user
-        user_data = AuthService.authenticate_user(login_data)
+        user_data = await AuthService.authenticate_user(login_data)
         
         if not user_data:
             raise ValueError("Invalid credentials")
@@ -151,8 +201,10 @@ class AuthService:
                 created_at=user['created_at']
             )
             
+        except DatabaseBusyError:
+            raise
         except DatabaseError as e:
-            logger.error(f"Failed to get user by ID {user_id}: {e}")
+            logger.error("Failed to get user by ID %s: %s", user_id, e)
             return None
     
     @staticmethod
@@ -161,13 +213,13 @@ class AuthService:
         Get user information by username.
         
         Args:
-            username (str): Username
+            username (str): Username, already lowercased
             
         Returns:
             Optional[UserResponse]: User data or None if not found
         """
         try:
-            result = call_procedure('get_user_by_username', [username.lower()])
+            result = call_procedure('get_user_by_username', [username])
             
             if not result or len(result) == 0:
                 return None
@@ -181,82 +233,12 @@ class AuthService:
                 created_at=user['created_at']
             )
             
+        except DatabaseBusyError:
+            raise
         except DatabaseError as e:
-            logger.error(f"Failed to get user by username {username}: {e}")
+            logger.error("Failed to get user by username %s: %s", username, e)
             return None
     
-    @staticmethod
-    def check_username_exists(username: str) -> bool:
-        """
-        Check if a username already exists.
-        
-        Args:
-            username (str): Username to check
-            
-        Returns:
-            bool: True if username exists, False otherwise
-        """
-        try:
-            result = call_procedure('check_username_exists', [username.lower()])
-            
-            if result and len(result) > 0:
-                return result[0]['exists'] > 0
-            
-            return False
-            
-        except DatabaseError as e:
-            logger.error(f"Failed to check username existence {username}: {e}")
-            return False
-    
-    @staticmethod
-    def check_email_exists(email: str) -> bool:
-        """
-        Check if an email already exists.
-        
-        Args:
-            email (str): Email to check
-            
-        Returns:
-            bool: True if email exists, False otherwise
-        """
-        try:
-            result = call_procedure('check_email_exists', [email.lower()])
-            
-            if result and len(result) > 0:
-                return result[0]['exists'] > 0
-            
-            return False
-            
-        except DatabaseError as e:
-            logger.error(f"Failed to check email existence {email}: {e}")
-            return False
-    
-    @staticmethod
-    def validate_registration_data(user_data: UserCreate) -> tuple[bool, str]:
-        """
-        Validate user registration data against existing users.
-        
-        Args:
-            user_data (UserCreate): User registration data
-            
-        Returns:
-            tuple[bool, str]: (is_valid, error_message)
-        """
-        try:
-            # Check if username exists
-            if AuthService.check_username_exists(user_data.username):
-                return False, "Username already exists"
-            
-            # Check if email exists
-            if AuthService.check_email_exists(user_data.email):
-                return False, "Email already exists"
-            
-            return True, ""
-            
-        except Exception as e:
-            logger.error(f"Registration validation failed: {e}")
-            return False, "Validation failed due to system error"
-    
     @staticmethod
     def get_user_stats(user_id: int) -> Dict[str, Any]:
         """
@@ -271,31 +253,18 @@ class AuthService:
         try:
             result = call_procedure('get_user_stats', [user_id])
             
-            if result and len(result) > 0:
+            if result:
                 stats = result[0]
-                return {
-                    'total_predictions': stats.get('total_predictions', 0),
-                    'total_points': stats.get('total_points', 0),
-                    'groups_count': stats.get('groups_count', 0),
-                    'accuracy_percentage': stats.get('accuracy_percentage', 0.0)
-                }
+                return {**_DEFAULT_USER_STATS, **{k: stats[k] for k in _DEFAULT_USER_STATS if k in stats}}
             
             # Return default stats if no data
-            return {
-                'total_predictions': 0,
-                'total_points': 0,
-                'groups_count': 0,
-                'accuracy_percentage': 0.0
-            }
+            return dict(_DEFAULT_USER_STATS)
             
+        except DatabaseBusyError:
+            raise
         except DatabaseError as e:
-            logger.error(f"Failed to get user stats for user {user_id}: {e}")
-            return {
-                'total_predictions': 0,
-                'total_points': 0,
-                'groups_count': 0,
-                'accuracy_percentage': 0.0
-            }
+            logger.error("Failed to get user stats for user %s: %s", user_id, e)
+            return dict(_DEFAULT_USER_STATS)
 
 class AuthValidationService:
     """Validation utilities for authentication"""
@@ -316,18 +285,20 @@ class AuthValidationService:
             user = AuthService.get_user_by_id(token_data.user_id)
             
             if not user:
-                logger.warning(f"Token validation failed - user not found: {token_data.user_id}")
+                logger.warning("Token validation failed - user not found: %s", token_data.user_id)
                 return False
             
             # Verify token data matches current user data
             if user.username != token_data.username or user.email != token_data.email:
-                logger.warning(f"Token validation failed - user data mismatch: {token_data.user_id}")
+                logger.warning("Token validation failed - user data mismatch: %s", token_data.user_id)
                 return False
             
             return True
             
+        except DatabaseBusyError:
+            raise
         except Exception as e:
-            logger.error(f"Token validation error: {e}")
+            logger.error("Token validation error: %s", e)
             return False
 
 # Export service classes
@@ -1,45 +1,89 @@
-from typing import List, Dict, Any, Optional
-from datetime import time, timedelta
+import threading
+from collections import defaultdict
+from typing import Callable, List, Dict, Any, Optional
+from cachetools import TTLCache
 from app.database import call_procedure, DatabaseError
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Fixture listings change only when the update scripts run or an admin sets
+# scores, so results are shared across requests for a short window (handlers
+# run in the threadpool, hence the lock). Keys: 'next', ('upcoming', days).
+_FIXTURE_LIST_CACHE = TTLCache(maxsize=32, ttl=30)
+_FIXTURE_LIST_CACHE_LOCK = threading.Lock()
+# One refill lock per key (created and removed under the cache lock), so an
+# expired entry is reloaded by one request while concurrent requests for
+# that key wait for it, without holding up misses on other keys
+_FIXTURE_LIST_REFILL_LOCKS = defaultdict(threading.Lock)
+
 class FixtureService:
     """Service layer for fixture-related operations"""
     
     @staticmethod
-    def _convert_timedelta_to_time(data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _get_cached_fixture_list(key: Any, load: Callable[[], List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
         """
-        Convert timedelta objects to time objects for game_time field.
+        Return a cached fixture list, loading it at most once per expiry.
         
         Args:
-            data: List of fixture dictionaries
+            key: Cache key for this listing
+            load: Fetches the listing from the database on a miss
             
         Returns:
-            List of fixture dictionaries with converted game_time
+            List[Dict]: Cached or freshly loaded fixtures
         """
-        for fixture in data:
-            if 'game_time' in fixture and isinstance(fixture['game_time'], timedelta):
-                # Convert timedelta to time
-                total_seconds = int(fixture['game_time'].total_seconds())
-                hours = total_seconds // 3600
-                minutes = (total_seconds % 3600) // 60
-                seconds = total_seconds % 60
-                fixture['game_time'] = time(hours, minutes, seconds)
-        return data
+        with _FIXTURE_LIST_CACHE_LOCK:
+            cached = _FIXTURE_LIST_CACHE.get(key)
+            if cached is None:
+                refill_lock = _FIXTURE_LIST_REFILL_LOCKS[key]
+        if cached is not None:
+            return list(cached)
+        
+        with refill_lock:
+            # Another request may have refilled it while we waited
+            with _FIXTURE_LIST_CACHE_LOCK:
+                cached = _FIXTURE_LIST_CACHE.get(key)
+            if cached is not None:
+                return list(cached)
+            
+            try:
+                result = load()
+                with _FIXTURE_LIST_CACHE_LOCK:
+                    _FIXTURE_LIST_CACHE[key] = tuple(result)
+                return result
+            finally:
+                # Later misses for this key find the fresh entry, or start
+                # over with a new lock if the load failed
+                with _FIXTURE_LIST_CACHE_LOCK:
+                    if _FIXTURE_LIST_REFILL_LOCKS.get(key) is refill_lock:
+                        del _FIXTURE_LIST_REFILL_LOCKS[key]
+    
+    @staticmethod
+    def invalidate_fixture_cache() -> None:
+        """Drop all cached fixture listings (call after fixture scores change)."""
+        with _FIXTURE_LIST_CACHE_LOCK:
+            _FIXTURE_LIST_CACHE.clear()
     
     @staticmethod
     def get_next_fixtures() -> List[Dict[str, Any]]:
         """
         Get all fixtures for the next available game date.
         
+        Results are cached for 30 seconds; fixture updates come from the
+        external update scripts, so the TTL bounds how stale a score can be.
+        Scores set through the admin API clear the cache immediately.
+        
         Returns:
             List[Dict]: List of fixtures for the next game date
             
         Raises:
             DatabaseError: If database operation fails
         """
+        return FixtureService._get_cached_fixture_list('next', FixtureService._load_next_fixtures)
+    
+    @staticmethod
+    def _load_next_fixtures() -> List[Dict[str, Any]]:
+        """Fetch fixtures for the next game date from the database (uncached)."""
         try:
             result = call_procedure('get_next_fixtures', [])
             
@@ -47,25 +91,59 @@ class FixtureService:
                 logger.info("No fixtures found for next game date")
                 return []
             
-            # Convert timedelta to time
-            result = FixtureService._convert_timedelta_to_time(result)
-            
             game_date = result[0]['game_date'] if result else None
-            logger.info(f"Found {len(result)} fixtures for {game_date}")
+            logger.info("Found %s fixtures for %s", len(result), game_date)
             return result
             
         except DatabaseError as e:
-            logger.error(f"Failed to fetch next fixtures: {e}")
+            logger.error("Failed to fetch next fixtures: %s", e)
             raise
         except Exception as e:
-            logger.error(f"Unexpected error fetching next fixtures: {e}")
+            logger.error("Unexpected error fetching next fixtures: %s", e)
             raise DatabaseError(f"Failed to fetch next fixtures: {str(e)}")
     
+    @staticmethod
+    def get_next_fixtures_with_user_predictions(user_id: int) -> List[Dict[str, Any]]:
+        """
+        Get all fixtures for the next available game date with the user's
+        predicted scores merged in.
+        
+        The merge happens in a single LEFT JOIN: fixtures the user has
+        predicted carry the predicted home/away scores, the rest keep the
+        fixture scores.
+        
+        Args:
+            user_id (int): ID of the user whose predictions are merged
+            
+        Returns:
+            List[Dict]: List of merged fixtures for the next game date
+            
+        Raises:
+            DatabaseError: If database operation fails
+        """
+        try:
+            result = call_procedure('get_next_fixtures_merged_with_user_predictions', [user_id])
+            
+            if not result:
+                logger.info("No fixtures found for next game date")
+                return []
+            
+            return result
+            
+        except DatabaseError as e:
+            logger.error("Failed to fetch next fixtures with predictions for user %s: %s", user_id, e)
+            raise
+        except Exception as e:
+            logger.error("Unexpected error fetching next fixtures with predictions: %s", e)
+            raise DatabaseError(f"Failed to fetch next fixtures with predictions: {str(e)}")
+    
     @staticmethod
     def get_upcoming_fixtures(days: int = 7) -> List[Dict[str, Any]]:
         """
         Get all fixtures for the next N days.
         
+        Results are cached for 30 seconds per value of days.
+        
         Args:
             days: Number of days ahead to fetch fixtures for (default: 7)
             
@@ -75,24 +153,29 @@ class FixtureService:
         Raises:
             DatabaseError: If database operation fails
         """
+        return FixtureService._get_cached_fixture_list(
+            ('upcoming', days),
+            lambda: FixtureService._load_upcoming_fixtures(days)
+        )
+    
+    @staticmethod
+    def _load_upcoming_fixtures(days: int) -> List[Dict[str, Any]]:
+        """Fetch fixtures for the next N days from the database (uncached)."""
         try:
             result = call_procedure('get_upcoming_fixtures', [days])
             
             if not result:
-                logger.info(f"No fixtures found for next {days} days")
+                logger.info("No fixtures found for next %s days", days)
                 return []
             
-            # Convert timedelta to time
-            result = FixtureService._convert_timedelta_to_time(result)
-            
-            logger.info(f"Found {len(result)} fixtures for next {days} days")
+            logger.info("Found %s fixtures for next %s days", len(result), days)
             return result
             
         except DatabaseError as e:
-            logger.error(f"Failed to fetch upcoming fixtures: {e}")
+            logger.error("Failed to fetch upcoming fixtures: %s", e)
             raise
         except Exception as e:
-            logger.error(f"Unexpected error fetching upcoming fixtures: {e}")
+            logger.error("Unexpected error fetching upcoming fixtures: %s", e)
             raise DatabaseError(f"Failed to fetch upcoming fixtures: {str(e)}")
     
     @staticmethod
@@ -113,20 +196,17 @@ class FixtureService:
             result = call_procedure('get_fixture_by_id', [match_num])
             
             if not result:
-                logger.info(f"Fixture {match_num} not found")
+                logger.info("Fixture %s not found", match_num)
                 return None
             
-            # Convert timedelta to time
-            result = FixtureService._convert_timedelta_to_time(result)
-            
-            logger.info(f"Found fixture {match_num}")
+            logger.info("Found fixture %s", match_num)
             return result[0]
             
         except DatabaseError as e:
-            logger.error(f"Failed to fetch fixture {match_num}: {e}")
+            logger.error("Failed to fetch fixture %s: %s", match_num, e)
             raise
         except Exception as e:
-            logger.error(f"Unexpected error fetching fixture {match_num}: {e}")
+            logger.error("Unexpected error fetching fixture %s: %s", match_num, e)
             raise DatabaseError(f"Failed to fetch fixture {match_num}: {str(e)}")
     
     @staticmethod
@@ -143,24 +223,15 @@ class FixtureService:
         try:
             result = call_procedure('get_fixtures_up_to_date', [to_date])
             if not result:
-                logger.info(f"No fixtures found up to {to_date}")
+                logger.info("No fixtures found up to %s", to_date)
                 return []
-            # Add game_date and game_time fields from start_time for Pydantic compatibility
-            for fixture in result:
-                if 'start_time' in fixture and fixture['start_time']:
-                    fixture['game_date'] = fixture['start_time'].date()
-                    fixture['game_time'] = fixture['start_time'].time()
-                else:
-                    fixture['game_date'] = None
-                    fixture['game_time'] = None
-            result = FixtureService._convert_timedelta_to_time(result)
-            logger.info(f"Found {len(result)} fixtures up to {to_date}")
+            logger.info("Found %s fixtures up to %s", len(result), to_date)
             return result
         except DatabaseError as e:
-            logger.error(f"Failed to fetch fixtures up to {to_date}: {e}")
+            logger.error("Failed to fetch fixtures up to %s: %s", to_date, e)
             raise
         except Exception as e:
-            logger.error(f"Unexpected error fetching fixtures up to {to_date}: {e}")
+            logger.error("Unexpected error fetching fixtures up to %s: %s", to_date, e)
             raise DatabaseError(f"Failed to fetch fixtures up to {to_date}: {str(e)}")
     @staticmethod
     def get_last_updated_fixture() -> Optional[Dict[str, Any]]:
@@ -180,15 +251,12 @@ class FixtureService:
                 logger.info("No fixtures found")
                 return None
             
-            # Convert timedelta to time
-            result = FixtureService._convert_timedelta_to_time(result)
-            
             logger.info("Found last updated fixture")
             return result[0]
             
         except DatabaseError as e:
-            logger.error(f"Failed to fetch last updated fixture: {e}")
+            logger.error("Failed to fetch last updated fixture: %s", e)
             raise
         except Exception as e:
-            logger.error(f"Unexpected error fetching last updated fixture: {e}")
+            logger.error("Unexpected error fetching last updated fixture: %s", e)
             raise DatabaseError(f"Failed to fetch last updated fixture: {str(e)}")
\ No newline at end of file
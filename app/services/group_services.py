@@ -1,13 +1,44 @@
+import threading
 from typing import List, Dict, Any, Optional
-from app.database import call_procedure, DatabaseError
+from cachetools import TTLCache
+from app.database import call_procedure, call_procedure_one, db_operation, DatabaseError
+from app.services.leaderboard_services import LeaderboardService
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Group detail lookups (by ID and by shareable code) are read far more often
+# than groups change. Every API path that changes a group or its membership
+# invalidates these in the current process, so found groups can be kept for
+# five minutes; that relies on the single-worker deployment in the README,
+# since other processes would not see the invalidation. Handlers run in the
+# threadpool, hence the lock around the (non thread-safe) caches.
+_GROUP_BY_ID_CACHE = TTLCache(maxsize=512, ttl=300)
+_GROUP_BY_CODE_CACHE = TTLCache(maxsize=512, ttl=300)
+_GROUP_CACHE_LOCK = threading.Lock()
+
 class GroupService:
     """Service layer for group-related operations"""
     
     @staticmethod
+    def _invalidate_group_cache(group_id: Optional[int] = None) -> None:
+        """
+        Drop cached group details (and leaderboards) after a membership or group change.
+        
+        Args:
+            group_id: Group whose by-ID entry should be dropped. The by-code
+                      cache is cleared entirely since it is keyed by code.
+        """
+        with _GROUP_CACHE_LOCK:
+            if group_id is not None:
+                _GROUP_BY_ID_CACHE.pop(group_id, None)
+            _GROUP_BY_CODE_CACHE.clear()
+        
+        # Joining, leaving and deleting only reshape this group's leaderboard
+        LeaderboardService.invalidate_leaderboard_cache(group_id)
+    
+    @staticmethod
+    @db_operation("create group")
     def create_group(group_name: str, creator_id: int) -> Dict[str, Any]:
         """
         Create a new group.
@@ -22,23 +53,16 @@ class GroupService:
         Raises:
             DatabaseError: If database operation fails
         """
-        try:
-            result = call_procedure('create_group', [group_name, creator_id])
-            
-            if not result:
-                raise DatabaseError("Failed to create group")
-            
-            logger.info(f"Group '{group_name}' created by user {creator_id}")
-            return result[0]
-            
-        except DatabaseError as e:
-            logger.error(f"Failed to create group: {e}")
-            raise
-        except Exception as e:
-            logger.error(f"Unexpected error creating group: {e}")
-            raise DatabaseError(f"Failed to create group: {str(e)}")
+        row = call_procedure_one('create_group', [group_name, creator_id])
+        
+        if not row:
+            raise DatabaseError("Failed to create group")
+        
+        logger.info("Group '%s' created by user %s", group_name, creator_id)
+        return row
     
     @staticmethod
+    @db_operation("fetch group")
     def get_group_by_id(group_id: int) -> Optional[Dict[str, Any]]:
         """
         Get group details by ID.
@@ -49,23 +73,23 @@ class GroupService:
         Returns:
             Dict: Group data or None if not found
         """
-        try:
-            result = call_procedure('get_group_by_id', [group_id])
-            
-            if not result:
-                logger.info(f"Group {group_id} not found")
-                return None
-            
-            return result[0]
-            
-        except DatabaseError as e:
-            logger.error(f"Failed to fetch group {group_id}: {e}")
-            raise
-        except Exception as e:
-            logger.error(f"Unexpected error fetching group {group_id}: {e}")
-            raise DatabaseError(f"Failed to fetch group: {str(e)}")
+        with _GROUP_CACHE_LOCK:
+            cached = _GROUP_BY_ID_CACHE.get(group_id)
+        if cached is not None:
+            return dict(cached)
+        
+        row = call_procedure_one('get_group_by_id', [group_id])
+        
+        if not row:
+            logger.info("Group %s not found", group_id)
+            return None
+        
+        with _GROUP_CACHE_LOCK:
+            _GROUP_BY_ID_CACHE[group_id] = row
+        return dict(row)
     
     @staticmethod
+    @db_operation("fetch group")
     def get_group_by_code(group_code: str) -> Optional[Dict[str, Any]]:
         """
         Get group details by group code.
@@ -76,25 +100,25 @@ class GroupService:
         Returns:
             Dict: Group data or None if not found
         """
-        try:
-            # Make code uppercase for case-insensitive lookup
-            group_code = group_code.upper()
-            result = call_procedure('get_group_by_code', [group_code])
-            
-            if not result:
-                logger.info(f"Group with code {group_code} not found")
-                return None
-            
-            return result[0]
-            
-        except DatabaseError as e:
-            logger.error(f"Failed to fetch group by code {group_code}: {e}")
-            raise
-        except Exception as e:
-            logger.error(f"Unexpected error fetching group by code: {e}")
-            raise DatabaseError(f"Failed to fetch group: {str(e)}")
+        # Make code uppercase for case-insensitive lookup
+        group_code = group_code.upper()
+        with _GROUP_CACHE_LOCK:
+            cached = _GROUP_BY_CODE_CACHE.get(group_code)
+        if cached is not None:
+            return dict(cached)
+        
+        row = call_procedure_one('get_group_by_code', [group_code])
+        
+        if not row:
+            logger.info("Group with code %s not found", group_code)
+            return None
+        
+        with _GROUP_CACHE_LOCK:
+            _GROUP_BY_CODE_CACHE[group_code] = row
+        return dict(row)
     
     @staticmethod
+    @db_operation("fetch user groups")
     def get_user_groups(user_id: int) -> List[Dict[str, Any]]:
         """
         Get all groups for a user.
@@ -105,24 +129,17 @@ class GroupService:
         Returns:
             List[Dict]: List of groups the user is a member of
         """
-        try:
-            result = call_procedure('get_user_groups', [user_id])
-            
-            if not result:
-                logger.info(f"User {user_id} has no groups")
-                return []
-            
-            logger.info(f"Found {len(result)} groups for user {user_id}")
-            return result
-            
-        except DatabaseError as e:
-            logger.error(f"Failed to fetch groups for user {user_id}: {e}")
-            raise
-        except Exception as e:
-            logger.error(f"Unexpected error fetching user groups: {e}")
-            raise DatabaseError(f"Failed to fetch user groups: {str(e)}")
+        result = call_procedure('get_user_groups', [user_id])
+        
+        if not result:
+            logger.info("User %s has no groups", user_id)
+            return []
+        
+        logger.info("Found %s groups for user %s", len(result), user_id)
+        return result
     
     @staticmethod
+    @db_operation("join group")
     def join_group(user_id: int, group_code: str) -> Dict[str, Any]:
         """
         Join a group by group code.
@@ -137,25 +154,21 @@ class GroupService:
         Raises:
             DatabaseError: If operation fails
         """
-        try:
-            # Make code uppercase for case-insensitive lookup
-            group_code = group_code.upper()
-            result = call_procedure('join_group', [user_id, group_code])
-            
-            if not result:
-                raise DatabaseError("Failed to join group")
-            
-            logger.info(f"User {user_id} joined group with code {group_code}")
-            return result[0]
-            
-        except DatabaseError as e:
-            logger.error(f"Failed to join group: {e}")
-            raise
-        except Exception as e:
-            logger.error(f"Unexpected error joining group: {e}")
-            raise DatabaseError(f"Failed to join group: {str(e)}")
+        # Make code uppercase for case-insensitive lookup
+        group_code = group_code.upper()
+        row = call_procedure_one('join_group', [user_id, group_code])
+        
+        if not row:
+            raise DatabaseError("Failed to join group")
+        
+        # Member count changed
+        GroupService._invalidate_group_cache(row.get('group_id'))
+        
+        logger.info("User %s joined group with code %s", user_id, group_code)
+        return row
     
     @staticmethod
+    @db_operation("leave group")
     def leave_group(user_id: int, group_id: int) -> int:
         """
         Leave a group.
@@ -170,24 +183,18 @@ class GroupService:
         Raises:
             DatabaseError: If operation fails
         """
-        try:
-            result = call_procedure('leave_group', [user_id, group_id])
-            
-            if not result:
-                raise DatabaseError("Failed to leave group")
-            
-            left_count = result[0]['left_group']
-            logger.info(f"User {user_id} left group {group_id}")
-            return left_count
-            
-        except DatabaseError as e:
-            logger.error(f"Failed to leave group: {e}")
-            raise
-        except Exception as e:
-            logger.error(f"Unexpected error leaving group: {e}")
-            raise DatabaseError(f"Failed to leave group: {str(e)}")
+        row = call_procedure_one('leave_group', [user_id, group_id])
+        
+        if not row:
+            raise DatabaseError("Failed to leave group")
+        
+        left_count = row['left_group']
+        GroupService._invalidate_group_cache(group_id)
+        logger.info("User %s left group %s", user_id, group_id)
+        return left_count
     
     @staticmethod
+    @db_operation("fetch group members")
     def get_group_members(group_id: int) -> List[Dict[str, Any]]:
         """
         Get all members of a group.
@@ -198,24 +205,17 @@ class GroupService:
         Returns:
             List[Dict]: List of group members
         """
-        try:
-            result = call_procedure('get_group_members', [group_id])
-            
-            if not result:
-                logger.info(f"Group {group_id} has no members")
-                return []
-            
-            logger.info(f"Found {len(result)} members in group {group_id}")
-            return result
-            
-        except DatabaseError as e:
-            logger.error(f"Failed to fetch members for group {group_id}: {e}")
-            raise
-        except Exception as e:
-            logger.error(f"Unexpected error fetching group members: {e}")
-            raise DatabaseError(f"Failed to fetch group members: {str(e)}")
+        result = call_procedure('get_group_members', [group_id])
+        
+        if not result:
+            logger.info("Group %s has no members", group_id)
+            return []
+        
+        logger.info("Found %s members in group %s", len(result), group_id)
+        return result
     
     @staticmethod
+    @db_operation("delete group")
     def delete_group(group_id: int, user_id: int) -> int:
         """
         Delete a group (only by creator).
@@ -230,19 +230,12 @@ class GroupService:
         Raises:
             DatabaseError: If operation fails
         """
-        try:
-            result = call_procedure('delete_group', [group_id, user_id])
-            
-            if not result:
-                raise DatabaseError("Failed to delete group")
-            
-            deleted_count = result[0]['deleted_count']
-            logger.info(f"Group {group_id} deleted by user {user_id}")
-            return deleted_count
-            
-        except DatabaseError as e:
-            logger.error(f"Failed to delete group: {e}")
-            raise
-        except Exception as e:
-            logger.error(f"Unexpected error deleting group: {e}")
-            raise DatabaseError(f"Failed to delete group: {str(e)}")
\ No newline at end of file
+        row = call_procedure_one('delete_group', [group_id, user_id])
+        
+        if not row:
+            raise DatabaseError("Failed to delete group")
+        
+        deleted_count = row['deleted_count']
+        GroupService._invalidate_group_cache(group_id)
+        logger.info("Group %s deleted by user %s", group_id, user_id)
+        return deleted_count
\ No newline at end of file
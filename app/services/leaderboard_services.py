@@ -1,17 +1,45 @@
-from typing import List, Dict, Any, Optional
-from app.database import call_procedure
+import json
+import threading
+from typing import Iterator, List, Dict, Any, Optional
+from cachetools import TTLCache
+from app.database import call_procedure, call_procedure_one, call_procedure_sets, db_operation
 from app.database import DatabaseError
+from app.services.fixture_services import FixtureService
+from app.services.user_services import UserService
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Group leaderboards only change when scores are set, leaderboards are
+# recalculated or membership changes. Writes made through the API clear the
+# cache; the TTL bounds staleness for writes from the fixture update scripts.
+_LEADERBOARD_CACHE = TTLCache(maxsize=256, ttl=30)
+_LEADERBOARD_CACHE_LOCK = threading.Lock()
+
 class LeaderboardService:
     """Service layer for leaderboard and scoring operations"""
     
     @staticmethod
+    def invalidate_leaderboard_cache(group_id: Optional[int] = None) -> None:
+        """
+        Drop cached group leaderboards.
+        
+        Args:
+            group_id: Only drop this group's leaderboard. When omitted the
+                      whole cache is cleared, since scoring changes touch every
+                      group that predicted the fixture.
+        """
+        with _LEADERBOARD_CACHE_LOCK:
+            if group_id is None:
+                _LEADERBOARD_CACHE.clear()
+            else:
+                _LEADERBOARD_CACHE.pop(group_id, None)
+    
+    @staticmethod
+    @db_operation("fetch group leaderboard")
     def get_group_leaderboard(group_id: int) -> List[Dict[str, Any]]:
         """
-        Get leaderboard rankings for a group.
+        Get leaderboard rankings for a group (cached for up to 30 seconds).
         
         Args:
             group_id: The group ID
@@ -19,24 +47,42 @@ class LeaderboardService:
         Returns:
             List[Dict]: Leaderboard entries sorted by rank
         """
-        try:
-            result = call_procedure('get_group_leaderboard', [group_id])
-            
-            if not result:
-                logger.info(f"No leaderboard entries found for group {group_id}")
-                return []
-            
-            logger.info(f"Retrieved leaderboard for group {group_id}: {len(result)} entries")
-            return result
+        with _LEADERBOARD_CACHE_LOCK:
+            cached = _LEADERBOARD_CACHE.get(group_id)
+        if cached is not None:
+            return list(cached)
+        
+        result = call_procedure('get_group_leaderboard', [group_id])
+        
+        if not result:
+            logger.info("No leaderboard entries found for group %s", group_id)
+            return []
+        
+        logger.info("Retrieved leaderboard for group %s: %s entries", group_id, len(result))
+        with _LEADERBOARD_CACHE_LOCK:
+            _LEADERBOARD_CACHE[group_id] = tuple(result)
+        return result
+    
+    @staticmethod
+    @db_operation("fetch leaderboard for streaming")
+    def stream_group_leaderboard(group_id: int) -> List[Dict[str, Any]]:
+        """
+        Read leaderboard rankings for a group for the streaming endpoint (uncached).
+        
+        The rows are read into memory and the pooled connection is released
+        before this returns, so a slow client streaming the response never
+        holds a connection or pool slot.
+        
+        Args:
+            group_id: The group ID
             
-        except DatabaseError as e:
-            logger.error(f"Failed to fetch group leaderboard: {e}")
-            raise
-        except Exception as e:
-            logger.error(f"Unexpected error fetching group leaderboard: {e}")
-            raise DatabaseError(f"Failed to fetch group leaderboard: {str(e)}")
+        Returns:
+            List[Dict]: Leaderboard entries sorted by rank
+        """
+        return call_procedure('get_group_leaderboard', [group_id]) or []
     
     @staticmethod
+    @db_operation("fetch user rank")
     def get_user_rank_in_group(user_id: int, group_id: int) -> Optional[Dict[str, Any]]:
         """
         Get user's rank and stats in a specific group.
@@ -48,24 +94,40 @@ class LeaderboardService:
         Returns:
             Dict: User's rank info or None if not found
         """
-        try:
-            result = call_procedure('get_user_rank_in_group', [user_id, group_id])
-            
-            if not result:
-                logger.info(f"User {user_id} not found in group {group_id}")
-                return None
-            
-            logger.info(f"Retrieved rank for user {user_id} in group {group_id}")
-            return result[0]
+        row = call_procedure_one('get_user_rank_in_group', [user_id, group_id])
+        
+        if not row:
+            logger.info("User %s not found in group %s", user_id, group_id)
+            return None
+        
+        logger.info("Retrieved rank for user %s in group %s", user_id, group_id)
+        return row
+    
+    @staticmethod
+    @db_operation("fetch user group snapshot")
+    def get_user_group_snapshot(user_id: int, group_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Get user's rank and predictions in a group in a single procedure call.
+        
+        Args:
+            user_id: The user ID
+            group_id: The group ID
             
-        except DatabaseError as e:
-            logger.error(f"Failed to fetch user rank: {e}")
-            raise
-        except Exception as e:
-            logger.error(f"Unexpected error fetching user rank: {e}")
-            raise DatabaseError(f"Failed to fetch user rank: {str(e)}")
+        Returns:
+            Dict: {'rank': rank row, 'predictions': prediction rows}, or None
+                  if the user is not in the group
+        """
+        rank_rows, predictions = call_procedure_sets('get_user_group_snapshot', [user_id, group_id])
+        
+        if not rank_rows:
+            logger.info("User %s not found in group %s", user_id, group_id)
+            return None
+        
+        logger.info("Retrieved snapshot for user %s in group %s: %s predictions", user_id, group_id, len(predictions))
+        return {'rank': rank_rows[0], 'predictions': predictions}
     
     @staticmethod
+    @db_operation("complete fixture")
     def complete_fixture(fixture_id: int, home_score: int, away_score: int) -> Dict[str, Any]:
         """
         Complete a fixture and trigger automatic scoring (admin only).
@@ -81,23 +143,19 @@ class LeaderboardService:
         Raises:
             DatabaseError: If operation fails
         """
-        try:
-            result = call_procedure('complete_fixture', [fixture_id, home_score, away_score])
-            
-            if not result:
-                raise DatabaseError("Failed to complete fixture")
-            
-            logger.info(f"Fixture {fixture_id} completed: {home_score}-{away_score}")
-            return result[0]
-            
-        except DatabaseError as e:
-            logger.error(f"Failed to complete fixture: {e}")
-            raise
-        except Exception as e:
-            logger.error(f"Unexpected error completing fixture: {e}")
-            raise DatabaseError(f"Failed to complete fixture: {str(e)}")
+        row = call_procedure_one('complete_fixture', [fixture_id, home_score, away_score])
+        
+        if not row:
+            raise DatabaseError("Failed to complete fixture")
+        
+        LeaderboardService.invalidate_leaderboard_cache()
+        FixtureService.invalidate_fixture_cache()
+        UserService.invalidate_user_stats_cache()
+        logger.info("Fixture %s completed: %s-%s", fixture_id, home_score, away_score)
+        return row
     
     @staticmethod
+    @db_operation("update fixture scores")
     def update_fixture_scores(fixture_id: int, home_score: int, away_score: int) -> Dict[str, Any]:
         """
         Update scores for an already-completed fixture (admin only).
@@ -113,23 +171,77 @@ class LeaderboardService:
         Raises:
             DatabaseError: If operation fails
         """
-        try:
-            result = call_procedure('update_fixture_scores', [fixture_id, home_score, away_score])
+        row = call_procedure_one('update_fixture_scores', [fixture_id, home_score, away_score])
+        
+        if not row:
+            raise DatabaseError("Failed to update fixture scores")
+        
+        LeaderboardService.invalidate_leaderboard_cache()
+        FixtureService.invalidate_fixture_cache()
+        UserService.invalidate_user_stats_cache()
+        logger.info("Fixture %s scores updated: %s-%s", fixture_id, home_score, away_score)
+        return row
+    
+    @staticmethod
+    @db_operation("set fixture scores")
+    def upsert_fixture_scores(fixture_id: int, home_score: int, away_score: int) -> Dict[str, Any]:
+        """
+        Set scores for a fixture, completing it or correcting it as needed (admin only).
+        
+        Args:
+            fixture_id: The fixture ID
+            home_score: Final home team score
+            away_score: Final away team score
             
-            if not result:
-                raise DatabaseError("Failed to update fixture scores")
+        Returns:
+            Dict: Completed fixture data
+            
+        Raises:
+            DatabaseError: If operation fails
+        """
+        row = call_procedure_one('upsert_fixture_scores', [fixture_id, home_score, away_score])
+        
+        if not row:
+            raise DatabaseError("Failed to set fixture scores")
+        
+        LeaderboardService.invalidate_leaderboard_cache()
+        FixtureService.invalidate_fixture_cache()
+        UserService.invalidate_user_stats_cache()
+        logger.info("Fixture %s scores set: %s-%s", fixture_id, home_score, away_score)
+        return row
+    
+    @staticmethod
+    @db_operation("set fixture scores")
+    def upsert_fixture_scores_batch(scores: List[Dict[str, int]]) -> List[Dict[str, Any]]:
+        """
+        Set scores for several fixtures in a single procedure call (admin only).
+        
+        Unknown fixtures, and completed fixtures whose scores are unchanged,
+        are skipped rather than failing the batch.
+        
+        Args:
+            scores: Dicts with fixture_id, home_score and away_score; if a
+                    fixture_id repeats, the last one wins
             
-            logger.info(f"Fixture {fixture_id} scores updated: {home_score}-{away_score}")
-            return result[0]
+        Returns:
+            List[Dict]: The fixtures whose scores were set
             
-        except DatabaseError as e:
-            logger.error(f"Failed to update fixture scores: {e}")
-            raise
-        except Exception as e:
-            logger.error(f"Unexpected error updating fixture scores: {e}")
-            raise DatabaseError(f"Failed to update fixture scores: {str(e)}")
+        Raises:
+            DatabaseError: If operation fails
+        """
+        unique = {s['fixture_id']: s for s in scores}
+        
+        result = call_procedure('upsert_fixture_scores_batch', [json.dumps(list(unique.values()))])
+        
+        if result:
+            LeaderboardService.invalidate_leaderboard_cache()
+            FixtureService.invalidate_fixture_cache()
+            UserService.invalidate_user_stats_cache()
+        logger.info("Fixture scores set in batch: updated=%s, requested=%s", len(result), len(unique))
+        return result
     
     @staticmethod
+    @db_operation("recalculate leaderboards")
     def recalculate_all_leaderboards() -> Dict[str, Any]:
         """
         Recalculate all leaderboards (utility function for maintenance).
@@ -140,18 +252,11 @@ class LeaderboardService:
         Raises:
             DatabaseError: If operation fails
         """
-        try:
-            result = call_procedure('recalculate_all_leaderboards', [])
-            
-            if not result:
-                raise DatabaseError("Failed to recalculate leaderboards")
-            
-            logger.info(f"All leaderboards recalculated: {result[0]}")
-            return result[0]
-            
-        except DatabaseError as e:
-            logger.error(f"Failed to recalculate leaderboards: {e}")
-            raise
-        except Exception as e:
-            logger.error(f"Unexpected error recalculating leaderboards: {e}")
-            raise DatabaseError(f"Failed to recalculate leaderboards: {str(e)}")
\ No newline at end of file
+        row = call_procedure_one('recalculate_all_leaderboards', [])
+        
+        if not row:
+            raise DatabaseError("Failed to recalculate leaderboards")
+        
+        LeaderboardService.invalidate_leaderboard_cache()
+        logger.info("All leaderboards recalculated: %s", row)
+        return row
\ No newline at end of file
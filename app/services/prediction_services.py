@@ -1,7 +1,9 @@
+import json
 from typing import List, Dict, Any, Optional
-from datetime import time, timedelta
-from app.database import call_procedure
-from app.database import DatabaseError
+from app.database import call_procedure, call_procedure_one, db_operation
+from app.database import DatabaseBusyError, DatabaseError
+from app.services.leaderboard_services import LeaderboardService
+from app.services.user_services import UserService
 import logging
 
 logger = logging.getLogger(__name__)
@@ -10,26 +12,7 @@ class PredictionService:
     """Service layer for prediction-related operations"""
     
     @staticmethod
-    def _convert_timedelta_to_time(data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """
-        Convert timedelta objects to time objects for game_time field.
-        
-        Args:
-            data: List of prediction dictionaries
-            
-        Returns:
-            List of prediction dictionaries with converted game_time
-        """
-        for prediction in data:
-            if 'game_time' in prediction and isinstance(prediction['game_time'], timedelta):
-                total_seconds = int(prediction['game_time'].total_seconds())
-                hours = total_seconds // 3600
-                minutes = (total_seconds % 3600) // 60
-                seconds = total_seconds % 60
-                prediction['game_time'] = time(hours, minutes, seconds)
-        return data
-    
-    @staticmethod
+    @db_operation("create prediction")
     def create_prediction(
         user_id: int,
         group_id: int,
@@ -53,112 +36,93 @@ class PredictionService:
         Raises:
             DatabaseError: If database operation fails
         """
-        try:
-            result = call_procedure('create_prediction', [
-                user_id, group_id, fixture_id, pred_home_score, pred_away_score
-            ])
-            
-            if not result:
-                raise DatabaseError("Failed to create prediction")
-            
-            # Convert timedelta to time
-            result = PredictionService._convert_timedelta_to_time(result)
+        row = call_procedure_one('create_prediction', [
+            user_id, group_id, fixture_id, pred_home_score, pred_away_score
+        ])
+        
+        if not row:
+            raise DatabaseError("Failed to create prediction")
+        
+        # Prediction counts are part of the group leaderboard and user stats
+        LeaderboardService.invalidate_leaderboard_cache(group_id)
+        UserService.invalidate_user_stats_cache(user_id)
+        logger.info("Prediction created: user=%s, group=%s, fixture=%s", user_id, group_id, fixture_id)
+        return row
+    
+    @staticmethod
+    @db_operation("create predictions batch")
+    def create_predictions_batch(user_id: int, predictions: List[Dict[str, int]]) -> List[Dict[str, Any]]:
+        """
+        Create several predictions for a user in a single procedure call.
+        
+        Predictions for games that have already started, or that the user
+        already made in that group, are skipped rather than failing the batch.
+        
+        Args:
+            user_id: User making the predictions
+            predictions: Dicts with group_id, fixture_id, pred_home_score
+                         and pred_away_score; if a (group_id, fixture_id)
+                         pair repeats, the last one wins
             
-            logger.info(f"Prediction created: user={user_id}, group={group_id}, fixture={fixture_id}")
-            return result[0]
+        Returns:
+            List[Dict]: The predictions that were created
             
-        except DatabaseError as e:
-            logger.error(f"Failed to create prediction: {e}")
-            raise
-        except Exception as e:
-            logger.error(f"Unexpected error creating prediction: {e}")
-            raise DatabaseError(f"Failed to create prediction: {str(e)}")
+        Raises:
+            DatabaseError: If database operation fails
+        """
+        # The Prediction unique key would reject repeats within one INSERT
+        unique = {(p['group_id'], p['fixture_id']): p for p in predictions}
+        
+        result = call_procedure('create_predictions_batch', [
+            user_id, json.dumps(list(unique.values()))
+        ])
+        
+        for group_id in {p['group_id'] for p in result}:
+            LeaderboardService.invalidate_leaderboard_cache(group_id)
+        if result:
+            UserService.invalidate_user_stats_cache(user_id)
+        logger.info("Predictions created in batch: user=%s, created=%s, requested=%s", user_id, len(result), len(unique))
+        return result
     
     @staticmethod
-    def get_user_predictions(user_id: int, group_id: int) -> List[Dict[str, Any]]:
+    @db_operation("fetch user predictions")
+    def get_user_predictions(user_id: int, group_id: Optional[int] = None) -> List[Dict[str, Any]]:
         """
-        Get all predictions for a user in a specific group.
+        Get all predictions for a user, in a specific group or across all groups.
         
         Args:
             user_id: The user ID
-            group_id: The group ID
+            group_id: The group ID, or None for predictions in every group
         
         Returns:
-            List[Dict]: List of user's predictions in the group
+            List[Dict]: List of user's predictions, latest fixtures first
         """
-        try:
-            result = call_procedure('get_user_predictions', [user_id, group_id])
-            if not result:
-                logger.info(f"No predictions found for user {user_id} in group {group_id}")
-                return []
-            result = PredictionService._convert_timedelta_to_time(result)
-            logger.info(f"Found {len(result)} predictions for user {user_id} in group {group_id}")
-            return result
-        except DatabaseError as e:
-            logger.error(f"Failed to fetch user predictions: {e}")
-            raise
-        except Exception as e:
-            logger.error(f"Unexpected error fetching user predictions: {e}")
-            raise DatabaseError(f"Failed to fetch user predictions: {str(e)}")
+        # The procedure skips the group filter when group_id is NULL
+        result = call_procedure('get_user_predictions', [user_id, group_id])
+        if not result:
+            logger.info("No predictions found for user %s in group %s", user_id, group_id)
+            return []
+        logger.info("Found %s predictions for user %s in group %s", len(result), user_id, group_id)
+        return result
 
     @staticmethod
+    @db_operation("fetch user predictions by match range")
     def get_user_predictions_by_match_range(user_id: int, min_match_num: Optional[int] = None, max_match_num: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Get only the latest prediction per fixture for a user within a specific match number range.
-        """
-        try:
-            result = call_procedure('get_user_predictions_by_match_range', [user_id, min_match_num, max_match_num])
-            if not result:
-                logger.info(f"No predictions found for user {user_id} in match range {min_match_num}-{max_match_num}")
-                return []
-            result = PredictionService._convert_timedelta_to_time(result)
-            # Group by fixture_id and keep only the latest prediction (by prediction_time)
-            latest_preds = {}
-            for pred in result:
-                fid = pred['fixture_id']
-                if fid not in latest_preds or pred['prediction_time'] > latest_preds[fid]['prediction_time']:
-                    latest_preds[fid] = pred
-            logger.info(f"Filtered to {len(latest_preds)} latest predictions for user {user_id} in match range {min_match_num}-{max_match_num}")
-            return list(latest_preds.values())
-        except DatabaseError as e:
-            logger.error(f"Failed to fetch user predictions by match range: {e}")
-            raise
-        except Exception as e:
-            logger.error(f"Unexpected error fetching user predictions by match range: {e}")
-            raise DatabaseError(f"Failed to fetch user predictions by match range: {str(e)}")
-    
-    @staticmethod
-    def get_all_user_predictions(user_id: int) -> List[Dict[str, Any]]:
-        """
-        Get all predictions for a user across all groups.
         
-        Args:
-            user_id: The user ID
-            
-        Returns:
-            List[Dict]: List of all user's predictions
+        The procedure keeps one row per fixture (latest prediction_time), so
+        no deduplication happens here. A None bound leaves that side open.
         """
-        try:
-            result = call_procedure('get_all_user_predictions', [user_id])
-            
-            if not result:
-                logger.info(f"No predictions found for user {user_id}")
-                return []
-            
-            # Convert timedelta to time
-            result = PredictionService._convert_timedelta_to_time(result)
-            
-            logger.info(f"Found {len(result)} total predictions for user {user_id}")
-            return result
-            
-        except DatabaseError as e:
-            logger.error(f"Failed to fetch all user predictions: {e}")
-            raise
-        except Exception as e:
-            logger.error(f"Unexpected error fetching all user predictions: {e}")
-            raise DatabaseError(f"Failed to fetch all user predictions: {str(e)}")
+        result = call_procedure('get_user_predictions_by_match_range', [user_id, min_match_num, max_match_num])
+        if not result:
+            logger.info("No predictions found for user %s in match range %s-%s", user_id, min_match_num, max_match_num)
+            return []
+        logger.info("Found %s latest predictions for user %s in match range %s-%s", len(result), user_id, min_match_num, max_match_num)
+        return result
     
     @staticmethod
+    @db_operation("fetch fixture predictions")
     def get_fixture_predictions(fixture_id: int, group_id: int) -> List[Dict[str, Any]]:
         """
         Get all predictions for a specific fixture in a group.
@@ -170,24 +134,17 @@ class PredictionService:
         Returns:
             List[Dict]: List of predictions for the fixture
         """
-        try:
-            result = call_procedure('get_fixture_predictions', [fixture_id, group_id])
-            
-            if not result:
-                logger.info(f"No predictions found for fixture {fixture_id} in group {group_id}")
-                return []
-            
-            logger.info(f"Found {len(result)} predictions for fixture {fixture_id} in group {group_id}")
-            return result
-            
-        except DatabaseError as e:
-            logger.error(f"Failed to fetch fixture predictions: {e}")
-            raise
-        except Exception as e:
-            logger.error(f"Unexpected error fetching fixture predictions: {e}")
-            raise DatabaseError(f"Failed to fetch fixture predictions: {str(e)}")
+        result = call_procedure('get_fixture_predictions', [fixture_id, group_id])
+        
+        if not result:
+            logger.info("No predictions found for fixture %s in group %s", fixture_id, group_id)
+            return []
+        
+        logger.info("Found %s predictions for fixture %s in group %s", len(result), fixture_id, group_id)
+        return result
     
     @staticmethod
+    @db_operation("fetch prediction")
     def get_prediction_by_id(pid: int) -> Optional[Dict[str, Any]]:
         """
         Get a specific prediction by ID.
@@ -198,26 +155,16 @@ class PredictionService:
         Returns:
             Dict: Prediction data or None if not found
         """
-        try:
-            result = call_procedure('get_prediction_by_id', [pid])
-            
-            if not result:
-                logger.info(f"Prediction {pid} not found")
-                return None
-            
-            # Convert timedelta to time
-            result = PredictionService._convert_timedelta_to_time(result)
-            
-            return result[0]
-            
-        except DatabaseError as e:
-            logger.error(f"Failed to fetch prediction {pid}: {e}")
-            raise
-        except Exception as e:
-            logger.error(f"Unexpected error fetching prediction {pid}: {e}")
-            raise DatabaseError(f"Failed to fetch prediction: {str(e)}")
+        row = call_procedure_one('get_prediction_by_id', [pid])
+        
+        if not row:
+            logger.info("Prediction %s not found", pid)
+            return None
+        
+        return row
     
     @staticmethod
+    @db_operation("update prediction")
     def update_prediction(
         user_id: int,
         group_id: int,
@@ -241,28 +188,18 @@ class PredictionService:
         Raises:
             DatabaseError: If database operation fails
         """
-        try:
-            result = call_procedure('update_prediction', [
-                user_id, group_id, fixture_id, pred_home_score, pred_away_score
-            ])
-            
-            if not result:
-                raise DatabaseError("Failed to update prediction")
-            
-            # Convert timedelta to time
-            result = PredictionService._convert_timedelta_to_time(result)
-            
-            logger.info(f"Prediction updated: user={user_id}, group={group_id}, fixture={fixture_id}")
-            return result[0]
-            
-        except DatabaseError as e:
-            logger.error(f"Failed to update prediction: {e}")
-            raise
-        except Exception as e:
-            logger.error(f"Unexpected error updating prediction: {e}")
-            raise DatabaseError(f"Failed to update prediction: {str(e)}")
+        row = call_procedure_one('update_prediction', [
+            user_id, group_id, fixture_id, pred_home_score, pred_away_score
+        ])
+        
+        if not row:
+            raise DatabaseError("Failed to update prediction")
+        
+        logger.info("Prediction updated: user=%s, group=%s, fixture=%s", user_id, group_id, fixture_id)
+        return row
     
     @staticmethod
+    @db_operation("delete prediction")
     def delete_prediction(user_id: int, group_id: int, fixture_id: int) -> int:
         """
         Delete a prediction.
@@ -278,22 +215,17 @@ class PredictionService:
         Raises:
             DatabaseError: If database operation fails
         """
-        try:
-            result = call_procedure('delete_prediction', [user_id, group_id, fixture_id])
-            
-            if not result:
-                raise DatabaseError("Failed to delete prediction")
-            
-            deleted_count = result[0]['deleted_count']
-            logger.info(f"Prediction deleted: user={user_id}, group={group_id}, fixture={fixture_id}")
-            return deleted_count
-            
-        except DatabaseError as e:
-            logger.error(f"Failed to delete prediction: {e}")
-            raise
-        except Exception as e:
-            logger.error(f"Unexpected error deleting prediction: {e}")
-            raise DatabaseError(f"Failed to delete prediction: {str(e)}")
+        row = call_procedure_one('delete_prediction', [user_id, group_id, fixture_id])
+        
+        if not row:
+            raise DatabaseError("Failed to delete prediction")
+        
+        deleted_count = row['deleted_count']
+        # Prediction counts are part of the group leaderboard and user stats
+        LeaderboardService.invalidate_leaderboard_cache(group_id)
+        UserService.invalidate_user_stats_cache(user_id)
+        logger.info("Prediction deleted: user=%s, group=%s, fixture=%s", user_id, group_id, fixture_id)
+        return deleted_count
     
     @staticmethod
     def get_next_fixtures_with_user_predictions(user_id: int) -> List[Dict[str, Any]]:
@@ -303,9 +235,10 @@ class PredictionService:
         """
         try:
             result = call_procedure('get_next_fixtures_with_user_predictions', [user_id])
-            # Optionally convert timedelta fields, if needed
-            # Optionally post-process to match response model
+            # game_time already arrives as datetime.time (see _CONVERSIONS in app/database.py)
             return result if result else []
+        except DatabaseBusyError:
+            raise
         except Exception as e:
-            logger.error(f"Failed to fetch next fixtures with user predictions: {e}")
+            logger.error("Failed to fetch next fixtures with user predictions: %s", e)
             return []
@@ -1,40 +1,90 @@
+import threading
+from cachetools import TTLCache
 from fastapi import HTTPException
-from app.models.user_stats import UserProfile, UserStats
+from app.models.user_stats import UserStatsProfile, UserStats
 from typing import List, Dict, Any, Optional
-from datetime import time, timedelta
-from app.database import call_procedure
+from app.database import call_procedure, get_db_cursor
 from app.database import DatabaseError
 import logging
 
+# Profiles only change through update_user_bio, which clears the entry (in
+# this process; see the single-worker note in the README), so they can be
+# kept a while. Stats move with every prediction and scored
+# fixture; API writes clear them and the shorter TTL bounds staleness for
+# fixtures scored by the update scripts.
+_USER_PROFILE_CACHE = TTLCache(maxsize=1024, ttl=300)
+_USER_STATS_CACHE = TTLCache(maxsize=1024, ttl=60)
+_USER_CACHE_LOCK = threading.Lock()
+
 class UserService:
     """Service layer for user profile related operations"""
 
     @staticmethod
-    def get_user_profile(cursor, user_id):
-        cursor.execute("""
-            SELECT u.username, p.bio
-            FROM User u
-            LEFT JOIN Profile p ON u.user_id = p.user_id
-            WHERE u.user_id = %s
-        """, (user_id,))
-        result = cursor.fetchone()
+    def invalidate_user_stats_cache(user_id: Optional[int] = None) -> None:
+        """
+        Drop cached user stats.
+
+        Args:
+            user_id: Only drop this user's stats. When omitted the whole cache
+                     is cleared, since scoring a fixture touches every user
+                     who predicted it.
+        """
+        with _USER_CACHE_LOCK:
+            if user_id is None:
+                _USER_STATS_CACHE.clear()
+            else:
+                _USER_STATS_CACHE.pop(user_id, None)
+
+    @staticmethod
+    def get_user_profile(user_id) -> UserStatsProfile:
+        with _USER_CACHE_LOCK:
+            cached = _USER_PROFILE_CACHE.get(user_id)
+        if cached is not None:
+            return cached
+
+        with get_db_cursor() as cursor:
+            cursor.execute("""
+                SELECT u.username, p.bio
+                FROM User u
+                LEFT JOIN Profile p ON u.user_id = p.user_id
+                WHERE u.user_id = %s
+            """, (user_id,))
+            result = cursor.fetchone()
         if not result:
             raise HTTPException(status_code=404, detail="User not found")
-        return UserProfile(**result)
+
+        profile = UserStatsProfile(**result)
+        with _USER_CACHE_LOCK:
+            _USER_PROFILE_CACHE[user_id] = profile
+        return profile
 
     @staticmethod
-    def get_user_stats(cursor, user_id) -> UserStats:
-        cursor.callproc("get_user_stats", [user_id])
-        stats = cursor.fetchone()
+    def get_user_stats(user_id) -> UserStats:
+        with _USER_CACHE_LOCK:
+            cached = _USER_STATS_CACHE.get(user_id)
+        if cached is not None:
+            return cached
+
+        with get_db_cursor() as cursor:
+            cursor.callproc("get_user_stats", [user_id])
+            stats = cursor.fetchone()
         if not stats:
             raise HTTPException(status_code=404, detail="Stats not found")
-        return UserStats(**stats)
+
+        user_stats = UserStats(**stats)
+        with _USER_CACHE_LOCK:
+            _USER_STATS_CACHE[user_id] = user_stats
+        return user_stats
 
     @staticmethod
-    def update_user_bio(cursor, user_id, bio: str):
+    def update_user_bio(user_id, bio: str):
         # Upsert bio for user
-        cursor.execute("""
-            INSERT INTO Profile (user_id, bio)
-            VALUES (%s, %s)
-            ON DUPLICATE KEY UPDATE bio = VALUES(bio)
-        """, (user_id, bio))
+        with get_db_cursor() as cursor:
+            cursor.execute("""
+                INSERT INTO Profile (user_id, bio)
+                VALUES (%s, %s)
+                ON DUPLICATE KEY UPDATE bio = VALUES(bio)
+            """, (user_id, bio))
+        # Drop the cached profile only once the upsert has committed
+        with _USER_CACHE_LOCK:
+            _USER_PROFILE_CACHE.pop(user_id, None)
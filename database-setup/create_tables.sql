@@ -20,7 +20,6 @@ CREATE TABLE IF NOT EXISTS `Group` (
     creator_id INT NOT NULL,
     creation_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (creator_id) REFERENCES User(user_id) ON DELETE CASCADE,
-    INDEX idx_group_code (group_code),
     INDEX idx_creator (creator_id)
 );
 
@@ -33,7 +32,6 @@ CREATE TABLE IF NOT EXISTS UserGroups (
     FOREIGN KEY (user_id) REFERENCES User(user_id) ON DELETE CASCADE,
     FOREIGN KEY (group_id) REFERENCES `Group`(group_id) ON DELETE CASCADE,
     UNIQUE KEY unique_user_group (user_id, group_id),
-    INDEX idx_user (user_id),
     INDEX idx_group (group_id)
 );
 
@@ -71,9 +69,14 @@ CREATE TABLE IF NOT EXISTS Prediction (
     FOREIGN KEY (user_id) REFERENCES User(user_id) ON DELETE CASCADE,
     FOREIGN KEY (group_id) REFERENCES `Group`(group_id) ON DELETE CASCADE,
     FOREIGN KEY (fixture_id) REFERENCES Fixture(match_num) ON DELETE CASCADE,
+    -- Also serves (user_id) and (user_id, group_id) lookups via its prefix
     UNIQUE KEY unique_user_group_fixture (user_id, group_id, fixture_id),
-    INDEX idx_user_group (user_id, group_id),
-    INDEX idx_fixture (fixture_id),
+    -- Leads with fixture_id so it also backs the FK; per-fixture user lookups stay in the index
+    INDEX idx_fixture_user (fixture_id, user_id),
+    -- get_fixture_predictions: one fixture in one group, oldest first
+    INDEX idx_fixture_group_time (fixture_id, group_id, prediction_time),
+    -- get_user_predictions_by_match_range: fixture range per user, latest first
+    INDEX idx_user_fixture_time (user_id, fixture_id, prediction_time DESC),
     INDEX idx_prediction_time (prediction_time)
 );
 
@@ -10,6 +10,7 @@ DROP PROCEDURE IF EXISTS get_fixture_by_id;
 DROP PROCEDURE IF EXISTS get_fixtures_up_to_date;
 DROP PROCEDURE IF EXISTS get_last_updated_fixture;
 DROP PROCEDURE IF EXISTS get_next_fixtures_with_user_predictions;
+DROP PROCEDURE IF EXISTS get_next_fixtures_merged_with_user_predictions;
 DROP PROCEDURE IF EXISTS get_teams;
 
 -- Procedure to insert or update fixtures
@@ -172,6 +173,12 @@ DELIMITER $$
 
 CREATE PROCEDURE get_next_fixtures()
 BEGIN
+    -- Find the next date with games (plain start_time ranges so idx_start_time is used)
+    DECLARE next_game_date DATE;
+    SELECT DATE(MIN(start_time)) INTO next_game_date
+    FROM Fixture
+    WHERE start_time >= CURDATE();
+
     SELECT 
         match_num,
         home_team,
@@ -183,12 +190,8 @@ BEGIN
         DATE(start_time) AS game_date,
         TIME(start_time) AS game_time
     FROM Fixture
-    WHERE DATE(start_time) = (
-        -- Find the next date with games
-        SELECT MIN(DATE(start_time))
-        FROM Fixture
-        WHERE DATE(start_time) >= CURDATE()
-    )
+    WHERE start_time >= next_game_date
+      AND start_time < next_game_date + INTERVAL 1 DAY
     ORDER BY start_time ASC;
 END$$
 
@@ -246,7 +249,16 @@ DELIMITER $$
 
 CREATE PROCEDURE get_fixtures_up_to_date(IN in_to_date DATE)
 BEGIN
-    SELECT *
+    SELECT 
+        match_num,
+        home_team,
+        away_team,
+        home_score,
+        away_score,
+        completed,
+        start_time,
+        DATE(start_time) AS game_date,
+        TIME(start_time) AS game_time
     FROM Fixture
     WHERE DATE(start_time) <= in_to_date
     ORDER BY DATE(start_time) ASC, TIME(start_time) ASC;
@@ -258,7 +270,16 @@ DELIMITER ;
 DELIMITER $$
 CREATE PROCEDURE get_last_updated_fixture()
 BEGIN
-    SELECT *
+    SELECT 
+        match_num,
+        home_team,
+        away_team,
+        home_score,
+        away_score,
+        completed,
+        start_time,
+        DATE(start_time) AS game_date,
+        TIME(start_time) AS game_time
     FROM Fixture
     WHERE completed = 1
     ORDER BY start_time DESC
@@ -275,9 +296,9 @@ CREATE PROCEDURE get_next_fixtures_with_user_predictions(
 BEGIN
     -- Find the next date with games
     DECLARE next_game_date DATE;
-    SELECT MIN(DATE(start_time)) INTO next_game_date
+    SELECT DATE(MIN(start_time)) INTO next_game_date
     FROM Fixture
-    WHERE DATE(start_time) >= CURDATE();
+    WHERE start_time >= CURDATE();
 
     -- Return only fixtures for that date with a prediction by the user, showing user's predicted scores
     SELECT 
@@ -297,11 +318,48 @@ BEGIN
         p.locked,
         p.points_earned
     FROM Fixture f
-    INNER JOIN (
-        SELECT * FROM Prediction
-        WHERE user_id = p_user_id
-    ) p ON f.match_num = p.fixture_id
-    WHERE DATE(f.start_time) = next_game_date
+    INNER JOIN Prediction p
+        ON p.fixture_id = f.match_num
+        AND p.user_id = p_user_id
+    WHERE f.start_time >= next_game_date
+      AND f.start_time < next_game_date + INTERVAL 1 DAY
+    ORDER BY f.start_time ASC;
+END$$
+DELIMITER ;
+
+-- Procedure to get all fixtures at next immediate game date, with the user's
+-- predicted scores replacing fixture scores where a prediction exists
+DELIMITER $$
+CREATE PROCEDURE get_next_fixtures_merged_with_user_predictions(
+    IN p_user_id INT
+)
+BEGIN
+    -- Find the next date with games
+    DECLARE next_game_date DATE;
+    SELECT DATE(MIN(start_time)) INTO next_game_date
+    FROM Fixture
+    WHERE start_time >= CURDATE();
+
+    -- A user may predict the same fixture in several groups; use the latest one
+    SELECT 
+        f.match_num,
+        f.home_team,
+        f.away_team,
+        COALESCE(p.pred_home_score, f.home_score) AS home_score,
+        COALESCE(p.pred_away_score, f.away_score) AS away_score,
+        f.completed,
+        f.start_time,
+        DATE(f.start_time) AS game_date,
+        TIME(f.start_time) AS game_time
+    FROM Fixture f
+    LEFT JOIN Prediction p ON p.pid = (
+        SELECT MAX(p2.pid)
+        FROM Prediction p2
+        WHERE p2.user_id = p_user_id
+          AND p2.fixture_id = f.match_num
+    )
+    WHERE f.start_time >= next_game_date
+      AND f.start_time < next_game_date + INTERVAL 1 DAY
     ORDER BY f.start_time ASC;
 END$$
 DELIMITER ;
@@ -95,10 +95,18 @@ BEGIN
         ug.joined_date,
         u.username AS creator_username,
         (g.creator_id = p_user_id) AS is_creator,
-        (SELECT COUNT(*) FROM UserGroups WHERE group_id = g.group_id) AS member_count
+        mc.member_count
     FROM `Group` g
     INNER JOIN UserGroups ug ON g.group_id = ug.group_id
     INNER JOIN User u ON g.creator_id = u.user_id
+    -- Member counts for all of the user's groups in one aggregate pass
+    INNER JOIN (
+        SELECT m.group_id, COUNT(*) AS member_count
+        FROM UserGroups m
+        INNER JOIN UserGroups mine ON mine.group_id = m.group_id
+        WHERE mine.user_id = p_user_id
+        GROUP BY m.group_id
+    ) mc ON mc.group_id = g.group_id
     WHERE ug.user_id = p_user_id
     ORDER BY ug.joined_date DESC;
 END$$
@@ -124,7 +132,8 @@ BEGIN
     -- Check if group exists
     IF v_group_id IS NULL THEN
         SIGNAL SQLSTATE '45000'
-        SET MESSAGE_TEXT = 'Group not found with that code';
+        SET MESSAGE_TEXT = 'Group not found with that code',
+            MYSQL_ERRNO = 4101;
     END IF;
 
     -- Check if user is already in the group
@@ -133,17 +142,39 @@ BEGIN
         WHERE user_id = p_user_id AND group_id = v_group_id
     ) THEN
         SIGNAL SQLSTATE '45000'
-        SET MESSAGE_TEXT = 'User is already a member of this group';
+        SET MESSAGE_TEXT = 'User is already a member of this group',
+            MYSQL_ERRNO = 4102;
     END IF;
 
     -- Add user to group (trigger will create leaderboard entry)
     INSERT INTO UserGroups (user_id, group_id)
     VALUES (p_user_id, v_group_id);
 
-    -- Recalculate all leaderboards to update points and ranks
-    CALL recalculate_all_leaderboards();
-
-    -- Return the group info as the LAST statement
+    -- Only this group's standings change. Bring the member's points up to
+    -- date (predictions survive leaving and rejoining), then re-rank the group
+    UPDATE Leaderboard
+    SET total_points = (
+            SELECT COALESCE(SUM(p.points_earned), 0)
+            FROM Prediction p
+            WHERE p.user_id = p_user_id
+            AND p.group_id = v_group_id
+            AND p.points_earned IS NOT NULL
+        ),
+        last_updated = NOW()
+    WHERE user_id = p_user_id AND group_id = v_group_id;
+
+    UPDATE Leaderboard l
+    INNER JOIN (
+        SELECT 
+            user_id,
+            DENSE_RANK() OVER (ORDER BY total_points DESC) as new_rank
+        FROM Leaderboard
+        WHERE group_id = v_group_id
+    ) ranked ON l.user_id = ranked.user_id
+    SET l.rank_position = ranked.new_rank
+    WHERE l.group_id = v_group_id;
+
+    -- Return the group info
     SELECT 
         g.group_id,
         g.group_code,
@@ -175,7 +206,8 @@ BEGIN
     
     IF v_creator_id = p_user_id THEN
         SIGNAL SQLSTATE '45000'
-        SET MESSAGE_TEXT = 'Group creator cannot leave the group. Delete the group instead.';
+        SET MESSAGE_TEXT = 'Group creator cannot leave the group. Delete the group instead.',
+            MYSQL_ERRNO = 4103;
     END IF;
     
     -- Check if user is in the group
@@ -184,7 +216,8 @@ BEGIN
         WHERE user_id = p_user_id AND group_id = p_group_id
     ) THEN
         SIGNAL SQLSTATE '45000'
-        SET MESSAGE_TEXT = 'User is not a member of this group';
+        SET MESSAGE_TEXT = 'User is not a member of this group',
+            MYSQL_ERRNO = 4104;
     END IF;
     
     -- Remove user from group (CASCADE will delete leaderboard entry)
@@ -238,12 +271,14 @@ BEGIN
     
     IF v_creator_id IS NULL THEN
         SIGNAL SQLSTATE '45000'
-        SET MESSAGE_TEXT = 'Group not found';
+        SET MESSAGE_TEXT = 'Group not found',
+            MYSQL_ERRNO = 4105;
     END IF;
     
     IF v_creator_id != p_user_id THEN
         SIGNAL SQLSTATE '45000'
-        SET MESSAGE_TEXT = 'Only the group creator can delete the group';
+        SET MESSAGE_TEXT = 'Only the group creator can delete the group',
+            MYSQL_ERRNO = 4106;
     END IF;
     
     -- Delete group (CASCADE will delete UserGroups and Leaderboard entries)
@@ -3,8 +3,11 @@
 -- Drop existing procedures if they exist
 DROP PROCEDURE IF EXISTS get_group_leaderboard;
 DROP PROCEDURE IF EXISTS get_user_rank_in_group;
+DROP PROCEDURE IF EXISTS get_user_group_snapshot;
 DROP PROCEDURE IF EXISTS complete_fixture;
 DROP PROCEDURE IF EXISTS update_fixture_scores;
+DROP PROCEDURE IF EXISTS upsert_fixture_scores;
+DROP PROCEDURE IF EXISTS upsert_fixture_scores_batch;
 DROP PROCEDURE IF EXISTS recalculate_all_leaderboards;
 
 -- Get Group Leaderboard
@@ -64,6 +67,22 @@ END$$
 
 DELIMITER ;
 
+-- Get User's Rank and Predictions in a Group (two result sets, one round trip)
+DELIMITER $$
+
+CREATE PROCEDURE get_user_group_snapshot(
+    IN p_user_id INT,
+    IN p_group_id INT
+)
+BEGIN
+    -- 1: rank row (empty if the user is not in the group)
+    CALL get_user_rank_in_group(p_user_id, p_group_id);
+    -- 2: the user's predictions in the group
+    CALL get_user_predictions(p_user_id, p_group_id);
+END$$
+
+DELIMITER ;
+
 -- Complete Fixture (Admin Only - First Time)
 DELIMITER $$
 
@@ -82,12 +101,14 @@ BEGIN
     
     IF v_already_completed IS NULL THEN
         SIGNAL SQLSTATE '45000'
-        SET MESSAGE_TEXT = 'Fixture not found';
+        SET MESSAGE_TEXT = 'Fixture not found',
+            MYSQL_ERRNO = 4201;
     END IF;
     
     IF v_already_completed = 1 THEN
         SIGNAL SQLSTATE '45000'
-        SET MESSAGE_TEXT = 'Fixture is already completed. Use update_fixture_scores to correct scores.';
+        SET MESSAGE_TEXT = 'Fixture is already completed. Use update_fixture_scores to correct scores.',
+            MYSQL_ERRNO = 4202;
     END IF;
     
     -- Update fixture with final scores and mark as completed
@@ -137,18 +158,21 @@ BEGIN
     
     IF v_completed IS NULL THEN
         SIGNAL SQLSTATE '45000'
-        SET MESSAGE_TEXT = 'Fixture not found';
+        SET MESSAGE_TEXT = 'Fixture not found',
+            MYSQL_ERRNO = 4201;
     END IF;
     
     IF v_completed = 0 THEN
         SIGNAL SQLSTATE '45000'
-        SET MESSAGE_TEXT = 'Fixture is not completed yet. Use complete_fixture instead.';
+        SET MESSAGE_TEXT = 'Fixture is not completed yet. Use complete_fixture instead.',
+            MYSQL_ERRNO = 4203;
     END IF;
     
     -- Check if scores are actually different
     IF v_old_home_score = p_home_score AND v_old_away_score = p_away_score THEN
         SIGNAL SQLSTATE '45000'
-        SET MESSAGE_TEXT = 'New scores are the same as current scores. No update needed.';
+        SET MESSAGE_TEXT = 'New scores are the same as current scores. No update needed.',
+            MYSQL_ERRNO = 4204;
     END IF;
     
     -- Reset points for this fixture (will be recalculated by trigger)
@@ -183,6 +207,147 @@ END$$
 
 DELIMITER ;
 
+-- Upsert Fixture Scores (Admin Only - Complete or Correct in One Call)
+DELIMITER $$
+
+CREATE PROCEDURE upsert_fixture_scores(
+    IN p_fixture_id INT,
+    IN p_home_score INT,
+    IN p_away_score INT
+)
+BEGIN
+    DECLARE v_completed BOOLEAN;
+    DECLARE v_old_home_score INT;
+    DECLARE v_old_away_score INT;
+    
+    -- Check if fixture exists and get current state
+    SELECT completed, home_score, away_score 
+    INTO v_completed, v_old_home_score, v_old_away_score
+    FROM Fixture
+    WHERE match_num = p_fixture_id;
+    
+    IF v_completed IS NULL THEN
+        SIGNAL SQLSTATE '45000'
+        SET MESSAGE_TEXT = 'Fixture not found',
+            MYSQL_ERRNO = 4201;
+    END IF;
+    
+    IF v_completed = 1 THEN
+        -- Correction: same rules as update_fixture_scores
+        IF v_old_home_score = p_home_score AND v_old_away_score = p_away_score THEN
+            SIGNAL SQLSTATE '45000'
+            SET MESSAGE_TEXT = 'New scores are the same as current scores. No update needed.',
+                MYSQL_ERRNO = 4204;
+        END IF;
+        
+        -- Reset points for this fixture (will be recalculated by trigger)
+        UPDATE Prediction
+        SET points_earned = NULL
+        WHERE fixture_id = p_fixture_id;
+    END IF;
+    
+    -- Set scores and mark as completed
+    -- This will trigger after_fixture_complete which handles scoring and leaderboard updates
+    UPDATE Fixture
+    SET 
+        home_score = p_home_score,
+        away_score = p_away_score,
+        completed = 1
+    WHERE match_num = p_fixture_id;
+    
+    -- Return the updated fixture
+    SELECT 
+        match_num,
+        home_team,
+        away_team,
+        home_score,
+        away_score,
+        completed,
+        start_time,
+        (SELECT COUNT(*) FROM Prediction WHERE fixture_id = p_fixture_id) as total_predictions,
+        (SELECT COUNT(*) FROM Prediction WHERE fixture_id = p_fixture_id AND points_earned IS NOT NULL) as predictions_scored
+    FROM Fixture
+    WHERE match_num = p_fixture_id;
+END$$
+
+DELIMITER ;
+
+-- Upsert Fixture Scores for Many Fixtures (Admin Only - One Call per Slate)
+-- p_scores: JSON array of {"fixture_id", "home_score", "away_score"}.
+-- Unknown fixtures and completed fixtures whose scores are unchanged are
+-- skipped; only the fixtures that were actually set are returned.
+DELIMITER $$
+
+CREATE PROCEDURE upsert_fixture_scores_batch(
+    IN p_scores JSON
+)
+BEGIN
+    -- Pooled connections are reused, so start from a clean table
+    DROP TEMPORARY TABLE IF EXISTS tmp_fixture_scores;
+    CREATE TEMPORARY TABLE tmp_fixture_scores (
+        fixture_id INT PRIMARY KEY,
+        home_score INT NOT NULL,
+        away_score INT NOT NULL,
+        was_completed BOOLEAN NOT NULL
+    );
+    
+    INSERT INTO tmp_fixture_scores (fixture_id, home_score, away_score, was_completed)
+    SELECT 
+        j.fixture_id,
+        j.home_score,
+        j.away_score,
+        f.completed
+    FROM JSON_TABLE(
+        p_scores, '$[*]' COLUMNS (
+            fixture_id INT PATH '$.fixture_id',
+            home_score INT PATH '$.home_score',
+            away_score INT PATH '$.away_score'
+        )
+    ) j
+    INNER JOIN Fixture f ON f.match_num = j.fixture_id
+    WHERE NOT (
+        f.completed = 1
+        AND f.home_score <=> j.home_score
+        AND f.away_score <=> j.away_score
+    );
+    
+    -- Corrections: reset points so the trigger rescores them
+    UPDATE Prediction p
+    INNER JOIN tmp_fixture_scores t ON p.fixture_id = t.fixture_id
+    SET p.points_earned = NULL
+    WHERE t.was_completed = 1;
+    
+    -- after_fixture_complete fires for each updated row and handles
+    -- scoring and leaderboard updates
+    UPDATE Fixture f
+    INNER JOIN tmp_fixture_scores t ON f.match_num = t.fixture_id
+    SET 
+        f.home_score = t.home_score,
+        f.away_score = t.away_score,
+        f.completed = 1;
+    
+    -- Return the updated fixtures
+    SELECT 
+        f.match_num,
+        f.home_team,
+        f.away_team,
+        f.home_score,
+        f.away_score,
+        f.completed,
+        f.start_time,
+        COUNT(p.pid) as total_predictions,
+        COUNT(p.points_earned) as predictions_scored
+    FROM tmp_fixture_scores t
+    INNER JOIN Fixture f ON f.match_num = t.fixture_id
+    LEFT JOIN Prediction p ON p.fixture_id = f.match_num
+    GROUP BY f.match_num, f.home_team, f.away_team, f.home_score, f.away_score, f.completed, f.start_time
+    ORDER BY f.match_num;
+    
+    DROP TEMPORARY TABLE tmp_fixture_scores;
+END$$
+
+DELIMITER ;
+
 -- Recalculate All Leaderboards (Utility function for maintenance)
 DELIMITER $$
 
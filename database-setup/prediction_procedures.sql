@@ -2,7 +2,9 @@
 
 -- Drop existing procedures if they exist
 DROP PROCEDURE IF EXISTS create_prediction;
+DROP PROCEDURE IF EXISTS create_predictions_batch;
 DROP PROCEDURE IF EXISTS get_user_predictions;
+-- Replaced by get_user_predictions with a NULL group; dropped on re-run
 DROP PROCEDURE IF EXISTS get_all_user_predictions;
 DROP PROCEDURE IF EXISTS get_fixture_predictions;
 DROP PROCEDURE IF EXISTS get_prediction_by_id;
@@ -32,7 +34,8 @@ BEGIN
     
     IF game_started THEN
         SIGNAL SQLSTATE '45000'
-        SET MESSAGE_TEXT = 'Cannot predict - game has already started';
+        SET MESSAGE_TEXT = 'Cannot predict - game has already started',
+            MYSQL_ERRNO = 4301;
     END IF;
     
     -- Check if prediction already exists for this user, group, and fixture
@@ -43,7 +46,8 @@ BEGIN
         AND fixture_id = p_fixture_id
     ) THEN
         SIGNAL SQLSTATE '45000'
-        SET MESSAGE_TEXT = 'Prediction already exists for this game in this group';
+        SET MESSAGE_TEXT = 'Prediction already exists for this game in this group',
+            MYSQL_ERRNO = 4302;
     END IF;
     
     -- Insert prediction
@@ -94,14 +98,76 @@ END$$
 
 DELIMITER ;
 
--- Get User's Predictions in a Specific Group
+-- Create Predictions in Bulk (one call for a whole slate of games)
+-- p_predictions is a JSON array of
+-- {"group_id", "fixture_id", "pred_home_score", "pred_away_score"} objects.
+-- Games that have already started and existing predictions are skipped.
 DELIMITER $$
 
-CREATE PROCEDURE get_user_predictions(
+CREATE PROCEDURE create_predictions_batch(
     IN p_user_id INT,
-    IN p_group_id INT
+    IN p_predictions JSON
 )
 BEGIN
+    DECLARE v_batch_time TIMESTAMP DEFAULT NOW();
+    
+    -- The predictions this call will write; the result set is read back
+    -- through this table so earlier predictions are never returned
+    -- (pooled connections are reused, so start from a clean table)
+    DROP TEMPORARY TABLE IF EXISTS tmp_new_predictions;
+    CREATE TEMPORARY TABLE tmp_new_predictions (
+        group_id INT NOT NULL,
+        fixture_id INT NOT NULL,
+        pred_home_score INT NOT NULL,
+        pred_away_score INT NOT NULL,
+        PRIMARY KEY (group_id, fixture_id)
+    );
+    
+    INSERT INTO tmp_new_predictions (group_id, fixture_id, pred_home_score, pred_away_score)
+    SELECT 
+        j.group_id,
+        j.fixture_id,
+        j.pred_home_score,
+        j.pred_away_score
+    FROM JSON_TABLE(
+        p_predictions, '$[*]' COLUMNS (
+            group_id INT PATH '$.group_id',
+            fixture_id INT PATH '$.fixture_id',
+            pred_home_score INT PATH '$.pred_home_score',
+            pred_away_score INT PATH '$.pred_away_score'
+        )
+    ) j
+    INNER JOIN Fixture f ON f.match_num = j.fixture_id
+    WHERE f.start_time >= NOW()
+    AND NOT EXISTS (
+        SELECT 1 FROM Prediction p 
+        WHERE p.user_id = p_user_id 
+        AND p.group_id = j.group_id 
+        AND p.fixture_id = j.fixture_id
+    );
+    
+    INSERT INTO Prediction (
+        user_id, 
+        group_id,
+        fixture_id, 
+        pred_home_score, 
+        pred_away_score,
+        prediction_time,
+        locked,
+        points_earned
+    )
+    SELECT 
+        p_user_id,
+        t.group_id,
+        t.fixture_id,
+        t.pred_home_score,
+        t.pred_away_score,
+        v_batch_time,
+        0,
+        NULL
+    FROM tmp_new_predictions t;
+    
+    -- Return the created predictions with fixture details
     SELECT 
         p.pid,
         p.user_id,
@@ -120,20 +186,25 @@ BEGIN
         f.away_score AS actual_away_score,
         DATE(f.start_time) AS game_date,
         TIME(f.start_time) AS game_time
-    FROM Prediction p
+    FROM tmp_new_predictions t
+    INNER JOIN Prediction p 
+        ON p.user_id = p_user_id 
+        AND p.group_id = t.group_id 
+        AND p.fixture_id = t.fixture_id
     INNER JOIN Fixture f ON p.fixture_id = f.match_num
-    WHERE p.user_id = p_user_id
-    AND p.group_id = p_group_id
-    ORDER BY f.start_time DESC;
+    ORDER BY f.start_time ASC;
+    
+    DROP TEMPORARY TABLE tmp_new_predictions;
 END$$
 
 DELIMITER ;
 
--- Get All User's Predictions (Across All Groups)
+-- Get User's Predictions in a Specific Group (NULL group = across all groups)
 DELIMITER $$
 
-CREATE PROCEDURE get_all_user_predictions(
-    IN p_user_id INT
+CREATE PROCEDURE get_user_predictions(
+    IN p_user_id INT,
+    IN p_group_id INT
 )
 BEGIN
     SELECT 
@@ -157,6 +228,7 @@ BEGIN
     FROM Prediction p
     INNER JOIN Fixture f ON p.fixture_id = f.match_num
     WHERE p.user_id = p_user_id
+    AND (p_group_id IS NULL OR p.group_id = p_group_id)
     ORDER BY f.start_time DESC;
 END$$
 
@@ -240,7 +312,8 @@ BEGIN
     -- Check if prediction exists
     IF v_pid IS NULL THEN
         SIGNAL SQLSTATE '45000'
-        SET MESSAGE_TEXT = 'Prediction not found for this user, group, and fixture';
+        SET MESSAGE_TEXT = 'Prediction not found for this user, group, and fixture',
+            MYSQL_ERRNO = 4303;
     END IF;
     
     -- Update prediction (trigger will check if locked/game started)
@@ -299,7 +372,8 @@ BEGIN
     -- Check if prediction exists
     IF v_pid IS NULL THEN
         SIGNAL SQLSTATE '45000'
-        SET MESSAGE_TEXT = 'Prediction not found for this user, group, and fixture';
+        SET MESSAGE_TEXT = 'Prediction not found for this user, group, and fixture',
+            MYSQL_ERRNO = 4303;
     END IF;
     
     -- Delete prediction (trigger will check if locked/game started)
@@ -311,7 +385,8 @@ END$$
 
 DELIMITER ;
 
--- Get User's Predictions by Match Number Range (for pagination)
+-- Get User's Latest Prediction per Fixture by Match Number Range (for pagination)
+-- NULL bounds leave that side of the range open
 DELIMITER $$
 CREATE PROCEDURE get_user_predictions_by_match_range(
     IN p_user_id INT,
@@ -337,18 +412,22 @@ BEGIN
         f.away_score AS actual_away_score,
         DATE(f.start_time) AS game_date,
         TIME(f.start_time) AS game_time
-    FROM Prediction p
+    FROM (
+        -- Latest prediction per fixture (across the user's groups); pid breaks
+        -- prediction_time ties so exactly one row per fixture comes back
+        SELECT 
+            pr.*,
+            ROW_NUMBER() OVER (
+                PARTITION BY pr.fixture_id
+                ORDER BY pr.prediction_time DESC, pr.pid DESC
+            ) AS rn
+        FROM Prediction pr
+        WHERE pr.user_id = p_user_id
+          AND (p_min_match_num IS NULL OR pr.fixture_id >= p_min_match_num)
+          AND (p_max_match_num IS NULL OR pr.fixture_id <= p_max_match_num)
+    ) p
     INNER JOIN Fixture f ON p.fixture_id = f.match_num
-    INNER JOIN (
-        SELECT fixture_id, MAX(prediction_time) AS max_time
-        FROM Prediction
-        WHERE user_id = p_user_id
-          AND fixture_id BETWEEN p_min_match_num AND p_max_match_num
-        GROUP BY fixture_id
-    ) latest ON p.fixture_id = latest.fixture_id AND p.prediction_time = latest.max_time
-    WHERE p.user_id = p_user_id
-      AND f.match_num >= p_min_match_num
-      AND f.match_num <= p_max_match_num
+    WHERE p.rn = 1
     ORDER BY f.match_num DESC;
 END$$
 DELIMITER ;
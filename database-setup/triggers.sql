@@ -70,7 +70,8 @@ BEGIN
         -- Only block if user is trying to change predicted scores
         IF NEW.pred_home_score != OLD.pred_home_score OR NEW.pred_away_score != OLD.pred_away_score THEN
             SIGNAL SQLSTATE '45000'
-            SET MESSAGE_TEXT = 'Cannot update - prediction is locked';
+            SET MESSAGE_TEXT = 'Cannot update - prediction is locked',
+                MYSQL_ERRNO = 4304;
         END IF;
     END IF;
     
@@ -85,7 +86,8 @@ BEGIN
             -- Auto-lock the prediction
             SET NEW.locked = 1;
             SIGNAL SQLSTATE '45000'
-            SET MESSAGE_TEXT = 'Cannot update - game has already started';
+            SET MESSAGE_TEXT = 'Cannot update - game has already started',
+                MYSQL_ERRNO = 4305;
         END IF;
     END IF;
 END$$
@@ -102,7 +104,8 @@ BEGIN
     -- Check if prediction is locked
     IF OLD.locked = 1 THEN
         SIGNAL SQLSTATE '45000'
-        SET MESSAGE_TEXT = 'Cannot delete - prediction is locked';
+        SET MESSAGE_TEXT = 'Cannot delete - prediction is locked',
+            MYSQL_ERRNO = 4304;
     END IF;
     
     -- Check if game has started
@@ -112,7 +115,8 @@ BEGIN
     
     IF game_started THEN
         SIGNAL SQLSTATE '45000'
-        SET MESSAGE_TEXT = 'Cannot delete - game has already started';
+        SET MESSAGE_TEXT = 'Cannot delete - game has already started',
+            MYSQL_ERRNO = 4305;
     END IF;
 END$$
 DELIMITER ;
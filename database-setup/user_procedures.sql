@@ -5,12 +5,16 @@ DROP PROCEDURE IF EXISTS test_database_connection;
 DROP PROCEDURE IF EXISTS get_database_stats;
 DROP PROCEDURE IF EXISTS get_database_health;
 DROP PROCEDURE IF EXISTS check_required_tables;
+DROP PROCEDURE IF EXISTS get_database_health_bundle;
 DROP PROCEDURE IF EXISTS create_user;
 DROP PROCEDURE IF EXISTS get_user_for_login;
+DROP PROCEDURE IF EXISTS update_user_password;
 DROP PROCEDURE IF EXISTS get_user_by_id;
 DROP PROCEDURE IF EXISTS get_user_by_username;
+-- No longer used (duplicates are caught by create_user); dropped on re-run
 DROP PROCEDURE IF EXISTS check_username_exists;
 DROP PROCEDURE IF EXISTS check_email_exists;
+DROP PROCEDURE IF EXISTS check_user_conflicts;
 DROP PROCEDURE IF EXISTS get_user_stats;
 
 -- Procedure to test database connectivity
@@ -99,6 +103,42 @@ BEGIN
 END$$
 DELIMITER ;
 
+-- Procedure to run all health checks in one call (returns three result sets:
+-- connectivity, health summary, required tables)
+DELIMITER $$
+CREATE PROCEDURE get_database_health_bundle()
+BEGIN
+    DECLARE EXIT HANDLER FOR SQLEXCEPTION
+    BEGIN
+        SIGNAL SQLSTATE '45000' 
+        SET MESSAGE_TEXT = 'Failed to retrieve database health bundle', 
+            MYSQL_ERRNO = 1004;
+    END;
+    
+    -- 1. Connectivity
+    SELECT 
+        1 as test,
+        VERSION() as version,
+        DATABASE() as current_db;
+    
+    -- 2. Health summary
+    SELECT 
+        'connected' as status,
+        VERSION() as mysql_version,
+        DATABASE() as current_db,
+        (SELECT COUNT(*) FROM INFORMATION_SCHEMA.TABLES 
+         WHERE TABLE_SCHEMA = DATABASE() 
+         AND TABLE_NAME IN ('User', 'Group', 'UserGroups', 'Fixture', 'Prediction', 'Leaderboard')
+        ) as tables_count;
+    
+    -- 3. Required tables
+    SELECT TABLE_NAME 
+    FROM INFORMATION_SCHEMA.TABLES 
+    WHERE TABLE_SCHEMA = DATABASE() 
+    AND TABLE_NAME IN ('User', 'Group', 'UserGroups', 'Fixture', 'Prediction', 'Leaderboard');
+END$$
+DELIMITER ;
+
 -- Procedure to create a new user
 DELIMITER $$
 CREATE PROCEDURE create_user(
@@ -190,6 +230,28 @@ BEGIN
 END$$
 DELIMITER ;
 
+-- Procedure to replace a user's password hash (e.g. rehash on login)
+DELIMITER $$
+CREATE PROCEDURE update_user_password(
+    IN p_user_id INT,
+    IN p_password VARCHAR(255)
+)
+BEGIN
+    DECLARE EXIT HANDLER FOR SQLEXCEPTION
+    BEGIN
+        SIGNAL SQLSTATE '45000' 
+        SET MESSAGE_TEXT = 'Failed to update password', 
+            MYSQL_ERRNO = 3011;
+    END;
+    
+    UPDATE User 
+    SET password = p_password 
+    WHERE user_id = p_user_id;
+    
+    SELECT ROW_COUNT() as updated_count;
+END$$
+DELIMITER ;
+
 -- Procedure to get user by ID (without password)
 DELIMITER $$
 CREATE PROCEDURE get_user_by_id(
@@ -248,44 +310,6 @@ BEGIN
 END$$
 DELIMITER ;
 
--- Procedure to check if username exists
-DELIMITER $$
-CREATE PROCEDURE check_username_exists(
-    IN p_username VARCHAR(50)
-)
-BEGIN
-    DECLARE EXIT HANDLER FOR SQLEXCEPTION
-    BEGIN
-        SIGNAL SQLSTATE '45000' 
-        SET MESSAGE_TEXT = 'Failed to check username existence', 
-            MYSQL_ERRNO = 3007;
-    END;
-    
-    SELECT COUNT(*) as `exists`  -- FIXED: escaped reserved word
-    FROM User 
-    WHERE username = p_username;
-END$$
-DELIMITER ;
-
--- Procedure to check if email exists
-DELIMITER $$
-CREATE PROCEDURE check_email_exists(
-    IN p_email VARCHAR(100)
-)
-BEGIN
-    DECLARE EXIT HANDLER FOR SQLEXCEPTION
-    BEGIN
-        SIGNAL SQLSTATE '45000' 
-        SET MESSAGE_TEXT = 'Failed to check email existence', 
-            MYSQL_ERRNO = 3008;
-    END;
-    
-    SELECT COUNT(*) as `exists`  -- FIXED: escaped reserved word
-    FROM User 
-    WHERE email = p_email;
-END$$
-DELIMITER ;
-
 -- Procedure to get user statistics
 DELIMITER $$
 CREATE PROCEDURE get_user_stats(
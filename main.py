@@ -1,14 +1,19 @@
-from fastapi import FastAPI
+import orjson
+from fastapi import FastAPI, Request, Response
 from fastapi.exceptions import ResponseValidationError
 from fastapi.middleware.cors import CORSMiddleware
+import atexit
 import logging
+import logging.handlers
+import os
+import queue
+import sys
 from contextlib import asynccontextmanager
-from fastapi.responses import JSONResponse
-import uvicorn
+from fastapi.responses import ORJSONResponse
 from dotenv import load_dotenv
 
 # Import modules
-from app.database import initialize_database_on_startup, test_database_connection, get_database_stats
+from app.database import initialize_database_on_startup, ping_database, get_database_stats, db_config, DatabaseBusyError
 from app.auth import initialize_auth_on_startup, get_token_info, auth_config
 from app.routers import auth, fixtures, groups, predictions, leaderboard, user
 
@@ -22,6 +27,22 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Service layer logs every successful lookup at INFO; set SERVICES_LOG_LEVEL=WARNING
+# in production to skip those records before they are formatted
+logging.getLogger("app.services").setLevel(os.getenv("SERVICES_LOG_LEVEL", "INFO").upper())
+
+# Request handlers only enqueue log records; a background listener thread
+# does the actual (possibly slow) handler I/O so it never adds to response time
+_root_logger = logging.getLogger()
+_log_listener = logging.handlers.QueueListener(
+    queue.SimpleQueue(), *_root_logger.handlers, respect_handler_level=True
+)
+_root_logger.handlers = [logging.handlers.QueueHandler(_log_listener.queue)]
+# Start the listener as soon as records can be queued, and flush it at
+# interpreter exit so nothing is lost if startup fails or shutdown is unclean
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan events"""
@@ -35,10 +56,13 @@ async def lifespan(app: FastAPI):
         # Initialize authentication system
         initialize_auth_on_startup()
         
+        # Token settings are fixed for the life of the process
+        app.state.auth_info = get_token_info()
+        
         logger.info("Application startup completed successfully!")
         
     except Exception as e:
-        logger.error(f"Application startup failed: {e}")
+        logger.error("Application startup failed: %s", e)
         raise RuntimeError(f"Failed to start application: {e}")
     
     yield
@@ -53,6 +77,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -66,6 +91,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Total-Count", "ETag"],
 )
 
 # Include routers
@@ -76,61 +102,52 @@ app.include_router(predictions.router)
 app.include_router(leaderboard.router)
 app.include_router(user.router)
 
+# Bodies of the constant endpoints, encoded once instead of per request
+_ROOT_BODY = orjson.dumps({
+    "message": "Welcome to NBA Basketball Prediction API",
+    "version": "1.0.0",
+    "docs": "/docs",
+    "health": "/health"
+})
+_LIVENESS_BODY = orjson.dumps({"status": "ok", "version": "1.0.0"})
+
 @app.get("/")
 async def root():
     """API welcome message"""
-    return {
-        "message": "Welcome to NBA Basketball Prediction API",
-        "version": "1.0.0",
-        "docs": "/docs",
-        "health": "/health"
-    }
+    return Response(content=_ROOT_BODY, media_type="application/json")
 
 @app.get("/health")
 async def health_check():
-    """Complete system health check"""
-    try:
-        # Check database health
-        db_status = test_database_connection()
-        db_stats = get_database_stats()
-        
-        # Check authentication system
-        auth_info = get_token_info()
-        
-        # Overall health status
-        is_healthy = (
-            db_status.get('status') == 'connected' and
-            auth_info.get('secret_configured', False)
-        )
-        
-        return {
-            "status": "healthy" if is_healthy else "degraded",
-            "database": {
-                "status": db_status.get('status', 'unknown'),
-                "host": db_status.get('host', 'unknown'),
-                "database": db_status.get('database', 'unknown'),
-                "mysql_version": db_status.get('mysql_version', 'unknown'),
-                "tables_count": db_status.get('tables_count', 0),
-                "statistics": db_stats
-            },
-            "authentication": {
-                "jwt_configured": auth_info.get('secret_configured', False),
-                "algorithm": auth_info.get('algorithm', 'unknown'),
-                "token_expire_hours": auth_info.get('expire_hours', 0)
-            },
-            "version": "1.0.0"
-        }
-        
-    except Exception as e:
-        logger.error(f"Health check failed: {e}")
-        return {
-            "status": "unhealthy",
-            "error": str(e),
-            "message": "System health check failed"
-        }
+    """Liveness check; never touches the database"""
+    return Response(content=_LIVENESS_BODY, media_type="application/json")
+
+@app.get("/health/ready")
+def readiness_check(request: Request):
+    """Readiness check: database connectivity and authentication configuration"""
+    database_ok = ping_database()
+    # Set by lifespan; fall back when the app runs without it (e.g. bare TestClient)
+    auth_info = getattr(request.app.state, "auth_info", None) or get_token_info()
+    jwt_configured = auth_info.get('secret_configured', False)
+    
+    body = {
+        "status": "ready" if database_ok and jwt_configured else "not ready",
+        "database": {
+            "status": "connected" if database_ok else "failed",
+            "host": db_config.host,
+            "database": db_config.database
+        },
+        "authentication": {
+            "jwt_configured": jwt_configured
+        },
+        "version": "1.0.0"
+    }
+    
+    if not (database_ok and jwt_configured):
+        return ORJSONResponse(status_code=503, content=body)
+    return body
 
 @app.get("/info")
-async def api_info():
+def api_info():
     """Get detailed API information"""
     try:
         db_stats = get_database_stats()
@@ -152,12 +169,13 @@ async def api_info():
             "endpoints": {
                 "authentication": "/auth/*",
                 "health": "/health",
+                "readiness": "/health/ready",
                 "docs": "/docs"
             }
         }
         
     except Exception as e:
-        logger.error(f"API info failed: {e}")
+        logger.error("API info failed: %s", e)
         return {
             "error": "Failed to retrieve API information",
             "message": str(e)
@@ -167,7 +185,7 @@ async def api_info():
 @app.exception_handler(404)
 async def not_found_handler(request, exc):
     """Handle 404 errors"""
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=404,
         content={
             "error": "Not Found",
@@ -176,11 +194,24 @@ async def not_found_handler(request, exc):
         }
     )
 
+@app.exception_handler(DatabaseBusyError)
+async def database_busy_handler(request, exc):
+    """Handle connection pool exhaustion: the request can be retried shortly"""
+    logger.warning("Database busy, returning 503 for %s", request.url.path)
+    return ORJSONResponse(
+        status_code=503,
+        content={
+            "error": "Service Unavailable",
+            "message": "The server is busy, please retry shortly"
+        },
+        headers={"Retry-After": "1"}
+    )
+
 @app.exception_handler(ResponseValidationError)
 async def response_validation_error_handler(request, exc):
     """Handle response validation errors (our code returned wrong format)"""
-    logger.error(f"Response validation error: {exc}")
-    return JSONResponse(
+    logger.error("Response validation error: %s", exc)
+    return ORJSONResponse(
         status_code=500,
         content={"detail": "Internal server error"}
     )
@@ -188,28 +219,34 @@ async def response_validation_error_handler(request, exc):
 @app.exception_handler(Exception)
 async def general_exception_handler(request, exc):
     """Handle all other exceptions"""
-    logger.error(f"Internal server error: {exc}")
+    logger.error("Internal server error: %s", exc)
     
     # Check if it has status_code and detail attributes
     if hasattr(exc, 'status_code') and hasattr(exc, 'detail'):
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=exc.status_code,
             content={"detail": exc.detail}
         )
     
     # Otherwise return generic 500
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={"detail": "Internal server error"}
     )
 
 
 if __name__ == "__main__":
+    # Only needed when run directly; uvicorn imports this module itself otherwise
+    import uvicorn
+    
     # Run the application
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
         port=8000,
         reload=True,
-        log_level="info"
+        log_level="info",
+        # uvloop isn't installed on Windows; "auto" falls back to asyncio there
+        loop="auto" if sys.platform == "win32" else "uvloop",
+        http="httptools"
     )
\ No newline at end of file
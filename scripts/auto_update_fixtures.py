@@ -1,6 +1,9 @@
 import requests
+import base64
+import json
 import os
 import random
+import time
 
 
 BACKEND_BASE_URL = "http://localhost:8000/leaderboard/admin/fixtures"
@@ -8,19 +11,72 @@ BACKEND_LOGIN_URL = "http://localhost:8000/auth/login"
 ADMIN_ID = os.getenv("DB_ADMIN_ID")
 ADMIN_PASSWORD = os.getenv("DB_ADMIN_PASS")
 
-def get_admin_token():
+# Random final scores are drawn from 80-130 inclusive
+SCORE_RANGE = range(80, 131)
+
+# Most fixtures the bulk endpoint accepts per request
+BULK_UPDATE_LIMIT = 500
+
+# Admin token reused across runs until shortly before it expires
+TOKEN_CACHE_FILE = os.path.expanduser("~/.cache/nba_admin_token.json")
+TOKEN_EXPIRY_MARGIN = 60  # seconds
+
+# One keep-alive connection for every call; get_admin_token adds the auth header
+SESSION = requests.Session()
+
+def _token_expiry(token):
+    """
+    Returns the exp claim of a JWT. The signature is not checked; the
+    backend does that when the token is used.
+    """
+    payload = token.split(".")[1]
+    payload += "=" * (-len(payload) % 4)
+    return json.loads(base64.urlsafe_b64decode(payload))["exp"]
+
+def load_cached_token():
+    """
+    Returns the cached admin token if it belongs to ADMIN_ID and is not about to expire.
+    """
+    try:
+        with open(TOKEN_CACHE_FILE) as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if cached.get("username") != ADMIN_ID or cached.get("expires", 0) <= time.time() + TOKEN_EXPIRY_MARGIN:
+        return None
+    return cached.get("token")
+
+def save_cached_token(token):
+    """
+    Writes the admin token to TOKEN_CACHE_FILE, readable only by the current user.
+    """
+    try:
+        os.makedirs(os.path.dirname(TOKEN_CACHE_FILE), exist_ok=True)
+        fd = os.open(TOKEN_CACHE_FILE, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            json.dump({"username": ADMIN_ID, "token": token, "expires": _token_expiry(token)}, f)
+    except (OSError, ValueError, KeyError, IndexError) as e:
+        print(f"Could not cache admin token: {e}")
+
+def get_admin_token(use_cache=True):
     """
     Logs in as admin and retrieves JWT token using credentials from environment variables.
+    A still-valid token cached by an earlier run is reused instead of logging in again.
+    The token is also set as the Authorization header for later SESSION calls.
     """
     if not ADMIN_ID or not ADMIN_PASSWORD:
         raise ValueError("DB_ADMIN_ID and DB_ADMIN_PASS must be set in environment variables.")
-    data = {"username": ADMIN_ID, "password": ADMIN_PASSWORD}
-    response = requests.post(BACKEND_LOGIN_URL, json=data)
-    if response.status_code != 200:
-        raise Exception(f"Failed to log in as admin: {response.status_code} {response.text}")
-    token = response.json().get("access_token")
+    token = load_cached_token() if use_cache else None
     if not token:
-        raise Exception("No access_token found in login response.")
+        data = {"username": ADMIN_ID, "password": ADMIN_PASSWORD}
+        response = SESSION.post(BACKEND_LOGIN_URL, json=data)
+        if response.status_code != 200:
+            raise Exception(f"Failed to log in as admin: {response.status_code} {response.text}")
+        token = response.json().get("access_token")
+        if not token:
+            raise Exception("No access_token found in login response.")
+        save_cached_token(token)
+    SESSION.headers["Authorization"] = f"Bearer {token}"
     return token
 
 def generate_random_fixture_scores(fixture_ids):
@@ -28,56 +84,53 @@ def generate_random_fixture_scores(fixture_ids):
     Generates random home and away scores for a list of fixture IDs.
     Returns a list of dicts: [{"fixture_id": int, "home_score": int, "away_score": int}, ...]
     """
-    fixtures = []
-    for fid in fixture_ids:
-        home_score = random.randint(80, 130)
-        away_score = random.randint(80, 130)
-        fixtures.append({
-            "fixture_id": fid,
-            "home_score": home_score,
-            "away_score": away_score
-        })
-    return fixtures
+    # Draw every score in one call: home scores first, then away scores
+    n = len(fixture_ids)
+    scores = random.choices(SCORE_RANGE, k=2 * n)
+    return [
+        {"fixture_id": fid, "home_score": home_score, "away_score": away_score}
+        for fid, home_score, away_score in zip(fixture_ids, scores[:n], scores[n:])
+    ]
 
-def update_fixture_score(fixture, admin_token):
+def update_fixture_scores(fixtures):
     """
-    Calls the backend's upsert fixture scores endpoint:
-    PUT /leaderboard/admin/fixtures/{fixture_id}/scores
-    Body: {"home_score": int, "away_score": int}
-    Headers: Authorization: Bearer <ADMIN_TOKEN>
+    Calls the backend's bulk upsert fixture scores endpoint for a batch of fixtures:
+    PUT /leaderboard/admin/fixtures/scores/bulk
+    Body: [{"fixture_id": int, "home_score": int, "away_score": int}, ...]
+    Headers: Authorization: Bearer <ADMIN_TOKEN> (set on SESSION at login)
     """
-    url = f"{BACKEND_BASE_URL}/{fixture['fixture_id']}/scores"
-    headers = {
-        "Authorization": f"Bearer {admin_token}",
-        "Content-Type": "application/json"
-    }
-    data = {
-        "home_score": fixture["home_score"],
-        "away_score": fixture["away_score"]
-    }
-    response = requests.put(url, json=data, headers=headers)
+    url = f"{BACKEND_BASE_URL}/scores/bulk"
+    response = SESSION.put(url, json=fixtures)
     if response.status_code == 200:
-        print(f"Updated fixture {fixture['fixture_id']}: {fixture['home_score']}-{fixture['away_score']}")
+        result = response.json()
+        for fixture in result["fixtures"]:
+            print(f"Updated fixture {fixture['match_num']}: {fixture['home_score']}-{fixture['away_score']}")
+        print(f"Updated {result['updated_count']} fixtures, skipped {result['skipped_count']}")
     else:
-        print(f"Failed to update fixture {fixture['fixture_id']}: {response.status_code} {response.text}")
+        print(f"Failed to update fixtures: {response.status_code} {response.text}")
 
-def fetch_fixture_ids_till_today(admin_token):
+def fetch_fixture_ids_till_today():
     """
     Fetches all fixture IDs from the backend up to today using /fixtures/past.
+    If the cached token has been rejected, logs in again and retries once.
     """
     url = "http://localhost:8000/fixtures/past"
-    headers = {"Authorization": f"Bearer {admin_token}"}
-    response = requests.get(url, headers=headers)
+    response = SESSION.get(url)
+    if response.status_code == 401:
+        get_admin_token(use_cache=False)
+        response = SESSION.get(url)
     response.raise_for_status()
     fixtures = response.json()
     return [f["match_num"] for f in fixtures]
 
 def main():
-    admin_token = get_admin_token()
-    fixture_ids = fetch_fixture_ids_till_today(admin_token)
+    get_admin_token()
+    fixture_ids = fetch_fixture_ids_till_today()
     fixtures = generate_random_fixture_scores(fixture_ids)
-    for fixture in fixtures:
-        update_fixture_score(fixture, admin_token)
+    # Batches go one after another: each one rescores leaderboards for every
+    # group, so concurrent requests would just contend on the same rows
+    for start in range(0, len(fixtures), BULK_UPDATE_LIMIT):
+        update_fixture_scores(fixtures[start:start + BULK_UPDATE_LIMIT])
 
 if __name__ == "__main__":
     main()
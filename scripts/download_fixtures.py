@@ -1,6 +1,17 @@
+import re
 import requests
-import json
-from datetime import datetime
+import orjson
+
+# gameDateTimeEst values start with an ISO 8601 date
+_DATE_PREFIX = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+
+def _team(team):
+    return {
+        "city": team["teamCity"],
+        "name": team["teamName"],
+        "tricode": team["teamTricode"]
+    }
 
 def download_nba_fixtures(output_file="nba_fixtures_2025_26.json"):
     url = "https://cdn.nba.com/static/json/staticData/scheduleLeagueV2_1.json"
@@ -9,54 +20,41 @@ def download_nba_fixtures(output_file="nba_fixtures_2025_26.json"):
         "Accept": "application/json",
     }
 
-    resp = requests.get(url, headers=headers)
+    # requests already negotiates gzip/deflate; parse the raw bytes with orjson
+    # rather than resp.json(), which decodes to text and uses stdlib json
+    resp = requests.get(url, headers=headers, timeout=30)
     resp.raise_for_status()
-    data = resp.json()
-
-    fixtures = []
-    fix_count = 1
-
-    # Filter: games on or after 21 October 2025 (excluding preseason games)
-    season_start_date = datetime(2025, 10, 21)
-
-    for day in data["leagueSchedule"]["gameDates"]:
-        for game in day.get("games", []):
-            time_est = game.get("gameDateTimeEst")
-            if not time_est:
-                continue
-
-            # Parse start_time as datetime
-            try:
-                game_datetime = datetime.strptime(time_est[:19], "%Y-%m-%dT%H:%M:%S")
-            except Exception:
-                continue
-
-            # Skip games before season start
-            if game_datetime < season_start_date:
-                continue
-
-            fixtures.append({
-                "fixture_number": fix_count,
-                "home_team": {
-                    "city": game["homeTeam"]["teamCity"],
-                    "name": game["homeTeam"]["teamName"],
-                    "tricode": game["homeTeam"]["teamTricode"]
-                },
-                "away_team": {
-                    "city": game["awayTeam"]["teamCity"],
-                    "name": game["awayTeam"]["teamName"],
-                    "tricode": game["awayTeam"]["teamTricode"]
-                },
-                "start_time": time_est,
-                "home_score": None,
-                "away_score": None,
-                "completed": False
-            })
-            fix_count += 1
+    data = orjson.loads(resp.content)
+
+    # Filter: games on or after 21 October 2025 (excluding preseason games).
+    # Rows with a malformed date are dropped; valid ISO dates compare correctly
+    # as strings, so no datetime objects are built for the skipped rows
+    season_start_date = "2025-10-21"
+
+    games = [
+        game
+        for day in data["leagueSchedule"]["gameDates"]
+        for game in day.get("games", [])
+        if _DATE_PREFIX.match(game.get("gameDateTimeEst") or "")
+        and game["gameDateTimeEst"][:10] >= season_start_date
+    ]
+
+    fixtures = [
+        {
+            "fixture_number": fix_count,
+            "home_team": _team(game["homeTeam"]),
+            "away_team": _team(game["awayTeam"]),
+            "start_time": game["gameDateTimeEst"],
+            "home_score": None,
+            "away_score": None,
+            "completed": False
+        }
+        for fix_count, game in enumerate(games, start=1)
+    ]
 
     # write to json file
-    with open(output_file, "w") as f:
-        json.dump(fixtures, f, indent=2)
+    with open(output_file, "wb") as f:
+        f.write(orjson.dumps(fixtures, option=orjson.OPT_INDENT_2))
 
     print(f"Saved {len(fixtures)} fixtures starting from 21 Oct to {output_file}")
 
@@ -1,10 +1,27 @@
-import json
-import pymysql
+import orjson
 from datetime import datetime
 import sys
 import os
 
 class NBAFixtureImporter:
+    # Rows per multi-row INSERT, well under the default max_allowed_packet
+    INSERT_BATCH_SIZE = 500
+    
+    UPSERT_FIXTURE_SQL = """
+        INSERT INTO Fixture (
+            home_team, away_team, start_time, home_score, away_score,
+            completed, api_game_id, season
+        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE
+            home_team = VALUES(home_team),
+            away_team = VALUES(away_team),
+            start_time = VALUES(start_time),
+            home_score = VALUES(home_score),
+            away_score = VALUES(away_score),
+            completed = VALUES(completed),
+            season = VALUES(season)
+    """
+    
     def __init__(self, db_config):
         """Initialize with database configuration"""
         self.db_config = db_config
@@ -12,6 +29,9 @@ class NBAFixtureImporter:
     
     def connect_db(self):
         """Connect to MySQL database"""
+        # Deferred so the usage/--help paths don't pay for the driver import
+        import pymysql
+        
         try:
             self.connection = pymysql.connect(
                 host=self.db_config['host'],
@@ -37,14 +57,14 @@ class NBAFixtureImporter:
     def load_json_file(self, file_path):
         """Load JSON data from file"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                data = json.load(file)
+            with open(file_path, 'rb') as file:
+                data = orjson.loads(file.read())
             print(f"Loaded {len(data)} fixtures from {file_path}")
             return data
         except FileNotFoundError:
             print(f"File not found: {file_path}")
             return None
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             print(f"Invalid JSON format: {e}")
             return None
         except Exception as e:
@@ -54,7 +74,7 @@ class NBAFixtureImporter:
     def format_team_name(self, team_data):
         """Format team name from JSON data"""
         # Using City + Name format (most descriptive)
-        return f"{team_data['city']} {team_data['name']}"
+        return f"{team_data['city'] or ''} {team_data['name'] or ''}".strip()
     
     def convert_datetime(self, iso_datetime):
         """Convert ISO datetime string to MySQL datetime format"""
@@ -84,8 +104,8 @@ class NBAFixtureImporter:
             print(f"Error clearing fixtures: {e}")
             return False
     
-    def insert_fixtures(self, fixtures_data, clear_existing=False):
-        """Insert fixtures using stored procedure"""
+    def insert_fixtures(self, fixtures_data, clear_existing=False, season='2025-26'):
+        """Insert fixtures with batched multi-row INSERTs and a single commit"""
         if not self.connection:
             print("No database connection!")
             return False
@@ -95,85 +115,81 @@ class NBAFixtureImporter:
             if not self.clear_existing_fixtures():
                 return False
         
-        successful_inserts = 0
+        # Format the data, skipping rows the insert_fixture procedure would reject
+        rows = []
         failed_inserts = 0
+        for i, fixture in enumerate(fixtures_data, 1):
+            try:
+                home_team = self.format_team_name(fixture['home_team'])
+                away_team = self.format_team_name(fixture['away_team'])
+                start_time = self.convert_datetime(fixture['start_time'])
+                row = (
+                    home_team,
+                    away_team,
+                    start_time,
+                    fixture['home_score'],
+                    fixture['away_score'],
+                    fixture['completed'],
+                    fixture['fixture_number'],
+                    season
+                )
+            except (KeyError, TypeError) as e:
+                print(f"Skipping fixture {i}: Malformed fixture data ({type(e).__name__}: {e})")
+                failed_inserts += 1
+                continue
+            
+            if not home_team or not away_team:
+                print(f"Skipping fixture {i}: Empty team name")
+            elif start_time is None:
+                print(f"Skipping fixture {i}: Invalid datetime")
+            elif row[6] is None:
+                print(f"Skipping fixture {i}: Missing fixture number")
+            else:
+                rows.append(row)
+                continue
+            failed_inserts += 1
         
         try:
-            for i, fixture in enumerate(fixtures_data, 1):
-                try:
-                    # Format the data
-                    home_team = self.format_team_name(fixture['home_team'])
-                    away_team = self.format_team_name(fixture['away_team'])
-                    start_time = self.convert_datetime(fixture['start_time'])
-                    home_score = fixture['home_score']
-                    away_score = fixture['away_score']
-                    completed = fixture['completed']
-                    api_game_id = fixture['fixture_number']
-                    season = '2025-26'
-                    
-                    # Skip if datetime conversion failed
-                    if start_time is None:
-                        print(f"Skipping fixture {i}: Invalid datetime")
-                        failed_inserts += 1
-                        continue
-                    
-                    # Call stored procedure to insert fixture
-                    cursor = self.connection.cursor()
-                    cursor.callproc('insert_fixture', [
-                        home_team,
-                        away_team,
-                        start_time,
-                        home_score,
-                        away_score,
-                        completed,
-                        api_game_id,
-                        season
-                    ])
-                    cursor.close()
-                    
-                    successful_inserts += 1
-                    
-                    # Progress indicator
-                    if i % 100 == 0:
-                        print(f"Processed {i}/{len(fixtures_data)} fixtures...")
-                        
-                except Exception as e:
-                    print(f"Error inserting fixture {i}: {e}")
-                    failed_inserts += 1
-                    continue
-            
-            print(f"\nImport Summary:")
-            print(f"Successfully inserted: {successful_inserts} fixtures")
-            print(f"Failed insertions: {failed_inserts}")
-            print(f"Total processed: {len(fixtures_data)}")
-            
-            return successful_inserts > 0
+            with self.connection.cursor() as cursor:
+                # Same upsert as the insert_fixture procedure; executemany
+                # sends each batch as one multi-row INSERT
+                for start in range(0, len(rows), self.INSERT_BATCH_SIZE):
+                    cursor.executemany(self.UPSERT_FIXTURE_SQL, rows[start:start + self.INSERT_BATCH_SIZE])
+                    print(f"Processed {min(start + self.INSERT_BATCH_SIZE, len(rows))}/{len(rows)} fixtures...")
+            self.connection.commit()
             
         except Exception as e:
+            self.connection.rollback()
             print(f"Database error during bulk insert: {e}")
             return False
+        
+        print(f"\nImport Summary:")
+        print(f"Successfully inserted: {len(rows)} fixtures")
+        print(f"Failed insertions: {failed_inserts}")
+        print(f"Total processed: {len(fixtures_data)}")
+        
+        return len(rows) > 0
     
     def verify_import(self, season='2025-26'):
         """Verify the import using stored procedure"""
         try:
-            cursor = self.connection.cursor()
-            
-            # Use stored procedure to get season statistics
-            cursor.callproc('get_season_stats', [season])
-            stats = cursor.fetchone()
-            cursor.close()
-            
-            # Get sample fixtures
-            cursor = self.connection.cursor()
-            cursor.execute("""
-                SELECT home_team, away_team, start_time, completed 
-                FROM Fixture 
-                WHERE season = %s 
-                ORDER BY start_time 
-                LIMIT 5
-            """, [season])
-            sample_fixtures = cursor.fetchall()
-            cursor.close()
+            with self.connection.cursor() as cursor:
+                # Use stored procedure to get season statistics
+                cursor.callproc('get_season_stats', [season])
+                stats = cursor.fetchone()
+                # Drain the procedure's status result before reusing the cursor
+                while cursor.nextset():
+                    pass
+                
+                # Get sample fixtures
+                cursor.execute("""
+                    SELECT home_team, away_team, start_time, completed 
+                    FROM Fixture 
+                    WHERE season = %s 
+                    ORDER BY start_time 
+                    LIMIT 5
+                """, [season])
+                sample_fixtures = cursor.fetchall()
             
             print(f"\nImport Verification for {season} season:")
             print(f"Total fixtures in database: {stats['total_fixtures']}")
@@ -1,18 +1,31 @@
 
-import pymysql
 import random
 import os
-from dotenv import load_dotenv
 
-# Load environment variables from .env at project root
-load_dotenv(os.path.join(os.path.dirname(__file__), '../../.env'))
+def get_db_config():
+    # Imported here so loading this module stays cheap
+    from dotenv import load_dotenv
+    
+    # Load environment variables from .env at project root
+    load_dotenv(os.path.join(os.path.dirname(__file__), '../../.env'))
+    
+    return {
+        'host': os.getenv('DB_HOST', 'localhost'),
+        'user': os.getenv('DB_USER', 'root'),
+        'password': os.getenv('DB_PASSWORD', ''),
+        'database': os.getenv('DB_NAME', 'nba_db'),
+    }
 
-DB_CONFIG = {
-    'host': os.getenv('DB_HOST', 'localhost'),
-    'user': os.getenv('DB_USER', 'root'),
-    'password': os.getenv('DB_PASSWORD', ''),
-    'database': os.getenv('DB_NAME', 'nba_db'),
-}
+# Random predicted scores are drawn from 80-130 inclusive
+SCORE_RANGE = range(80, 131)
+
+# Rows per executemany call (one multi-row INSERT each)
+INSERT_BATCH_SIZE = 1000
+
+INSERT_PREDICTION_SQL = """
+    INSERT INTO Prediction (user_id, group_id, fixture_id, pred_home_score, pred_away_score)
+    VALUES (%s, %s, %s, %s, %s)
+"""
 
 def get_all_users(cursor):
     cursor.execute("SELECT user_id FROM User")
@@ -26,44 +39,75 @@ def get_completed_fixtures(cursor):
     cursor.execute("SELECT match_num FROM Fixture WHERE completed = 1")
     return [row[0] for row in cursor.fetchall()]
 
-def set_fixture_completed(cursor, fixture_id, completed):
-    cursor.execute("UPDATE Fixture SET completed = %s WHERE match_num = %s", (completed, fixture_id))
+def set_fixtures_completed(cursor, fixture_ids, completed):
+    if not fixture_ids:
+        return
+    placeholders = ", ".join(["%s"] * len(fixture_ids))
+    cursor.execute(
+        f"UPDATE Fixture SET completed = %s WHERE match_num IN ({placeholders})",
+        (completed, *fixture_ids)
+    )
+
+def get_existing_prediction_keys(cursor, fixture_ids):
+    if not fixture_ids:
+        return set()
+    placeholders = ", ".join(["%s"] * len(fixture_ids))
+    cursor.execute(
+        f"SELECT user_id, group_id, fixture_id FROM Prediction WHERE fixture_id IN ({placeholders})",
+        tuple(fixture_ids)
+    )
+    return set(cursor.fetchall())
 
-def insert_prediction(cursor, user_id, group_id, fixture_id):
-    pred_home = random.randint(80, 130)
-    pred_away = random.randint(80, 130)
-    try:
-        cursor.execute(
-            """
-            INSERT INTO Prediction (user_id, group_id, fixture_id, pred_home_score, pred_away_score)
-            VALUES (%s, %s, %s, %s, %s)
-            ON DUPLICATE KEY UPDATE pred_home_score=VALUES(pred_home_score), pred_away_score=VALUES(pred_away_score)
-            """,
-            (user_id, group_id, fixture_id, pred_home, pred_away)
-        )
-    except Exception as e:
-        print(f"Failed to insert prediction for user {user_id}, group {group_id}, fixture {fixture_id}: {e}")
+def insert_predictions(cursor, users, groups, fixtures):
+    # Existing predictions are left alone: updating one on a started game
+    # trips the lock trigger, which would abort the whole multi-row INSERT
+    existing = get_existing_prediction_keys(cursor, fixtures)
+    keys = [
+        (user_id, group_id, fixture_id)
+        for user_id in users
+        for group_id in groups
+        for fixture_id in fixtures
+        if (user_id, group_id, fixture_id) not in existing
+    ]
+    print(f"Skipping {len(existing)} existing predictions, inserting {len(keys)}")
+    # Draw every score in one call: home scores first, then away scores
+    n = len(keys)
+    scores = random.choices(SCORE_RANGE, k=2 * n)
+    rows = [
+        (*key, pred_home, pred_away)
+        for key, pred_home, pred_away in zip(keys, scores[:n], scores[n:])
+    ]
+    for start in range(0, len(rows), INSERT_BATCH_SIZE):
+        batch = rows[start:start + INSERT_BATCH_SIZE]
+        try:
+            cursor.executemany(INSERT_PREDICTION_SQL, batch)
+        except Exception as e:
+            # A failed multi-row INSERT writes nothing; retry its rows one
+            # by one so only the offending rows are lost
+            print(f"Batch {start + 1}-{start + len(batch)} failed ({e}); retrying row by row")
+            for row in batch:
+                try:
+                    cursor.execute(INSERT_PREDICTION_SQL, row)
+                except Exception as e:
+                    print(f"Failed to insert prediction for user {row[0]}, group {row[1]}, fixture {row[2]}: {e}")
 
 def main():
-    conn = pymysql.connect(**DB_CONFIG)
+    import pymysql
+    
+    conn = pymysql.connect(**get_db_config())
     cursor = conn.cursor()
     users = get_all_users(cursor)
     groups = get_all_groups(cursor)
     fixtures = get_completed_fixtures(cursor)
     print(f"Users: {users}\nGroups: {groups}\nFixtures: {fixtures}")
     # Set all completed fixtures to not completed
-    for fixture_id in fixtures:
-        set_fixture_completed(cursor, fixture_id, 0)
+    set_fixtures_completed(cursor, fixtures, 0)
     conn.commit()
     # Insert predictions
-    for user_id in users:
-        for group_id in groups:
-            for fixture_id in fixtures:
-                insert_prediction(cursor, user_id, group_id, fixture_id)
+    insert_predictions(cursor, users, groups, fixtures)
     conn.commit()
     # Set all fixtures back to completed
-    for fixture_id in fixtures:
-        set_fixture_completed(cursor, fixture_id, 1)
+    set_fixtures_completed(cursor, fixtures, 1)
     conn.commit()
     cursor.close()
     conn.close()